@@ -0,0 +1,9 @@
+'''
+pycheckers
+    Headless checkers rules; importing this package never touches pygame
+    The pygame front end lives in pycheckers.gui and runs with `python -m pycheckers`
+'''
+from .bitboard import Bitboard
+from .rules import (Checker, GameState, PieceRegistry, Tile, UndoRecord, create_board, set_checkers,
+                    update_mandatory_capture)
+from .variants import BRAZILIAN, ENGLISH, INTERNATIONAL, VARIANTS, Variant
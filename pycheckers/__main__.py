@@ -0,0 +1,36 @@
+import argparse
+
+from .gui import main
+from .trace import LEVELS, parse_sample, tracer
+from .variants import VARIANTS
+
+parser = argparse.ArgumentParser(prog='python -m pycheckers', description='Play checkers.')
+parser.add_argument('--computer', action='append', default=[], choices=['red', 'white'],
+                    help="let the computer play this colour (as drawn); repeat for computer vs computer")
+parser.add_argument('--think-time', type=float, default=1.0,
+                    help="seconds the computer may spend on each move (default 1.0)")
+parser.add_argument('--tablebase', metavar='DIR',
+                    help="endgame tables for the computer to probe (build them with python -m pycheckers.tablebase)")
+parser.add_argument('--book', metavar='FILE',
+                    help="opening book for the computer (build one with python -m pycheckers.book)")
+parser.add_argument('--record', metavar='FILE',
+                    help="append every finished game to this PDN file (see python -m pycheckers.pdn)")
+parser.add_argument('--profile', metavar='FILE',
+                    help="time every frame from the start and write the timings to FILE (.csv or .json) on exit")
+parser.add_argument('--variant', choices=VARIANTS, default='english',
+                    help="rules to play (default english); the computer and --record only play english")
+parser.add_argument('--trace', choices=LEVELS, default='off',
+                    help="record game events at this level and above in memory (default off)")
+parser.add_argument('--trace-file', metavar='FILE', help="also append the records to FILE as JSON lines")
+parser.add_argument('--trace-sample', action='append', default=[], metavar='EVENT=N',
+                    help="keep only every N-th record of EVENT, e.g. frame=60 (repeatable)")
+parser.add_argument('--trace-echo', action='store_true', help="print records to the terminal as well")
+args = parser.parse_args()
+if args.variant != 'english' and (args.computer or args.record):
+    parser.error(f"--computer and --record only play english draughts, not {args.variant}")
+
+tracer.configure(level=args.trace, sample=parse_sample(args.trace_sample), echo=args.trace_echo,
+                 path=args.trace_file)
+
+main(computer=args.computer, think_time=args.think_time, tablebase=args.tablebase, book=args.book, record=args.record,
+     profile=args.profile, variant=args.variant)
@@ -0,0 +1,199 @@
+'''
+Batch Evaluation
+    Many independent positions held as NumPy arrays and processed together
+    Uses the same 32-square dark-square layout as bitboard.py (square = row * 4 + col // 2),
+    so each board is three uint32 masks and every rule below is a handful of array operations
+    Results match the scalar GameState/engine code exactly; NumPy is only needed here and in pycheckers.dataset
+'''
+import numpy as np
+
+from . import bitboard as bb
+from .engine import (KING_CENTER, KING_CENTER_BONUS, KING_VALUE, MAN_CENTER, MAN_CENTER_BONUS, MAN_VALUE,
+                     RED_MAN_TERMS, WHITE_MAN_TERMS)
+
+U32 = np.uint32
+
+# check_game_over() results as small integers; STATUS_NAMES turns them back into its strings
+ONGOING, WHITE_WINS, RED_WINS, DRAW = 0, 1, 2, 3
+STATUS_NAMES = (None, 'white', 'red', 'draw')
+
+_EVEN_ROWS = U32(bb.EVEN_ROWS)
+_ODD_ROWS = U32(bb.ODD_ROWS)
+_NOT_LEFT = U32(bb.FULL ^ bb.LEFT_EDGE)
+_NOT_RIGHT = U32(bb.FULL ^ bb.RIGHT_EDGE)
+
+
+# ----- Directional Shifts ----- #
+'''
+    Shift Functions:
+        Vectorised copies of the bitboard.py shifts, on uint32 arrays
+        Shifting a uint32 drops the bits that leave the top or bottom of the board, so no FULL mask is needed
+'''
+def shift_nw(b):
+    return ((b & _EVEN_ROWS) >> U32(4)) | ((b & _ODD_ROWS & _NOT_LEFT) >> U32(5))
+
+def shift_ne(b):
+    return ((b & _EVEN_ROWS & _NOT_RIGHT) >> U32(3)) | ((b & _ODD_ROWS) >> U32(4))
+
+def shift_sw(b):
+    return ((b & _EVEN_ROWS) << U32(4)) | ((b & _ODD_ROWS & _NOT_LEFT) << U32(3))
+
+def shift_se(b):
+    return ((b & _EVEN_ROWS & _NOT_RIGHT) << U32(5)) | ((b & _ODD_ROWS) << U32(4))
+
+# Indexed by bitboard.NW/NE/SW/SE; BACKWARD[d] undoes SHIFTS[d]
+SHIFTS = (shift_nw, shift_ne, shift_sw, shift_se)
+BACKWARD = (shift_se, shift_sw, shift_ne, shift_nw)
+NORTH = (bb.NW, bb.NE)
+
+# Landing square bit for a step / jump from each square in each direction (0 off the board)
+_STEP_BITS = np.array([[1 << bb.NEIGHBOURS[sq][d] if bb.NEIGHBOURS[sq][d] >= 0 else 0 for sq in range(32)]
+                       for d in range(4)], dtype=U32)
+_JUMP_BITS = np.array([[1 << bb.NEIGHBOURS[bb.NEIGHBOURS[sq][d]][d]
+                        if bb.NEIGHBOURS[sq][d] >= 0 and bb.NEIGHBOURS[bb.NEIGHBOURS[sq][d]][d] >= 0 else 0
+                        for sq in range(32)] for d in range(4)], dtype=U32)
+_SQUARES = np.arange(32, dtype=U32)
+
+
+'''
+    PositionBatch Class:
+        N positions as parallel arrays: white, red, kings (uint32 masks), white_to_move (bool)
+        and quiet (moves since the last capture, for the 40-move draw)
+        White is GameState's 'white' side, i.e. Checker.is_white pieces
+'''
+class PositionBatch:
+    def __init__(self, white, red, kings, white_to_move, quiet=None):
+        self.white = np.asarray(white, dtype=U32)
+        self.red = np.asarray(red, dtype=U32)
+        self.kings = np.asarray(kings, dtype=U32)
+        self.white_to_move = np.asarray(white_to_move, dtype=bool)
+        self.quiet = np.zeros(len(self.white), dtype=np.int32) if quiet is None else np.asarray(quiet, dtype=np.int32)
+
+    """Snapshot a list of GameStates"""
+    @classmethod
+    def from_game_states(cls, game_states):
+        return cls([gs.bitboard.white for gs in game_states],
+                   [gs.bitboard.red for gs in game_states],
+                   [gs.bitboard.kings for gs in game_states],
+                   [gs.turn == 'white' for gs in game_states],
+                   [gs.moves_since_last_capture for gs in game_states])
+
+    def __len__(self):
+        return len(self.white)
+
+    """Pieces of the side to move"""
+    def own(self):
+        return np.where(self.white_to_move, self.white, self.red)
+
+    """Pieces of the side not to move"""
+    def enemy(self):
+        return np.where(self.white_to_move, self.red, self.white)
+
+
+# ----- Move Masks ----- #
+'''
+    _direction_origins() Function:
+        For each direction d, the pieces (of either colour) that could step / jump that way
+        Men only go forward (white north, red south), kings go every way
+        Returns (steps, jumps), each a list of four uint32 arrays
+'''
+def _direction_origins(batch):
+    white, red, kings = batch.white, batch.red, batch.kings
+    empty = ~(white | red)
+    steps = []
+    jumps = []
+    for d in range(4):
+        back = BACKWARD[d]
+        movers = (white | (red & kings)) if d in NORTH else (red | (white & kings))
+        white_movers = movers & white
+        red_movers = movers & red
+        landing = back(empty)
+        steps.append(landing & movers)
+        jumps.append((back(landing & red) & white_movers) | (back(landing & white) & red_movers))
+    return steps, jumps
+
+"""Pieces of the side to move that have a capture (Bitboard.jumpers for each position)"""
+def jumpers(batch):
+    steps, jumps = _direction_origins(batch)
+    return (jumps[0] | jumps[1] | jumps[2] | jumps[3]) & batch.own()
+
+"""Pieces of the side to move that have a non-capturing move (Bitboard.movers for each position)"""
+def movers(batch):
+    steps, jumps = _direction_origins(batch)
+    return (steps[0] | steps[1] | steps[2] | steps[3]) & batch.own()
+
+"""True where the side to move has to capture (GameState.must_capture)"""
+def capture_flags(batch):
+    return jumpers(batch) != 0
+
+"""Pieces the side to move may start its turn with: the jumpers if there are any, otherwise the movers"""
+def movable(batch):
+    steps, jumps = _direction_origins(batch)
+    own = batch.own()
+    can_jump = (jumps[0] | jumps[1] | jumps[2] | jumps[3]) & own
+    can_step = (steps[0] | steps[1] | steps[2] | steps[3]) & own
+    return np.where(can_jump != 0, can_jump, can_step)
+
+'''
+    legal_move_masks() Function:
+        Returns an (N, 32) uint32 array: entry [i, sq] is the mask of squares that
+        GameState.legal_moves() returns for the piece on sq in position i (0 for an empty square)
+        Like legal_moves(), a piece with a capture only lists its captures
+'''
+def legal_move_masks(batch):
+    steps, jumps = _direction_origins(batch)
+    step_targets = np.zeros((len(batch), 32), dtype=U32)
+    jump_targets = np.zeros((len(batch), 32), dtype=U32)
+    for d in range(4):
+        # Expand each origin mask to one flag per square, then look up the landing square
+        step_targets |= ((steps[d][:, None] >> _SQUARES) & U32(1)) * _STEP_BITS[d]
+        jump_targets |= ((jumps[d][:, None] >> _SQUARES) & U32(1)) * _JUMP_BITS[d]
+    return np.where(jump_targets != 0, jump_targets, step_targets)
+
+
+# ----- Counts, Game Over and Evaluation ----- #
+def _popcount(b):
+    return np.bitwise_count(b).astype(np.int32)
+
+"""Pieces left per side, like GameState.piece_counts"""
+def piece_counts(batch):
+    return {'white': _popcount(batch.white), 'red': _popcount(batch.red)}
+
+'''
+    game_over() Function:
+        check_game_over() for every position, as ONGOING/WHITE_WINS/RED_WINS/DRAW codes
+        Same order of checks: elimination, then the 40-move draw, then no legal moves for the side to move
+        Threefold repetition needs each game's history, so it is left to GameState
+'''
+def game_over(batch):
+    white_count = _popcount(batch.white)
+    red_count = _popcount(batch.red)
+    steps, jumps = _direction_origins(batch)
+    any_move = ((steps[0] | steps[1] | steps[2] | steps[3] | jumps[0] | jumps[1] | jumps[2] | jumps[3])
+                & batch.own()) != 0
+    stuck_result = np.where(batch.white_to_move, RED_WINS, WHITE_WINS)
+    status = np.where(any_move, ONGOING, stuck_result)
+    status = np.where(batch.quiet >= 40, DRAW, status)
+    status = np.where(red_count == 0, WHITE_WINS, status)
+    status = np.where(white_count == 0, RED_WINS, status)
+    return status.astype(np.int8)
+
+"""Vectorised engine._side_score"""
+def _side_score(pieces, kings, man_terms):
+    men = pieces & ~kings
+    own_kings = pieces & kings
+    score = MAN_VALUE * _popcount(men) + KING_VALUE * _popcount(own_kings)
+    for mask, bonus in man_terms:
+        score += bonus * _popcount(men & U32(mask))
+    score += MAN_CENTER_BONUS * _popcount(men & U32(MAN_CENTER))
+    score += KING_CENTER_BONUS * _popcount(own_kings & U32(KING_CENTER))
+    return score
+
+"""engine.evaluate() for every position, from the point of view of the side to move"""
+def evaluate(batch):
+    white_score = _side_score(batch.white, batch.kings, WHITE_MAN_TERMS)
+    red_score = _side_score(batch.red, batch.kings, RED_MAN_TERMS)
+    score = np.where(batch.white_to_move, white_score - red_score, red_score - white_score)
+    pieces = _popcount(batch.white | batch.red)
+    # Floor division, the same rounding as the integer engine code
+    return score + score * (24 - pieces) // 96
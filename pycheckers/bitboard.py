@@ -0,0 +1,362 @@
+'''
+Bitboard Rules Engine
+    Stores the board as three 32-bit masks (white, red, kings) over the dark squares
+    Square index = row * 4 + col // 2, so bit 0 is (0, 1) and bit 31 is (7, 6)
+    Moves and captures are found with shifts and masks instead of walking Tile objects
+    Whole turns (including multi-jumps) are expanded from lookup tables built at import
+'''
+from collections import namedtuple
+
+
+FULL = 0xFFFFFFFF
+
+# Square index <-> (row, col) lookups
+SQUARE_TO_COORD = tuple((sq // 4, 2 * (sq % 4) + (1 if (sq // 4) % 2 == 0 else 0)) for sq in range(32))
+COORD_TO_SQUARE = {coord: sq for sq, coord in enumerate(SQUARE_TO_COORD)}
+
+# Row masks used to pick the correct shift for each row parity
+EVEN_ROWS = 0
+for _sq in range(32):
+    if (_sq // 4) % 2 == 0:
+        EVEN_ROWS |= 1 << _sq
+ODD_ROWS = FULL ^ EVEN_ROWS
+# Squares on the left/right edge of the board (col 0 / col 7)
+LEFT_EDGE = ODD_ROWS & 0x11111111
+RIGHT_EDGE = EVEN_ROWS & 0x88888888
+
+# Promotion rows: white moves up to row 0, red moves down to row 7
+WHITE_PROMOTION = 0x0000000F
+RED_PROMOTION = 0xF0000000
+
+
+# ----- Directional Shifts ----- #
+'''
+    Shift Functions:
+        Move every bit in a mask one diagonal step in the given direction
+        Bits that would leave the board are dropped
+'''
+def shift_nw(b):
+    return (((b & EVEN_ROWS) >> 4) | ((b & ODD_ROWS & ~LEFT_EDGE) >> 5)) & FULL
+
+def shift_ne(b):
+    return (((b & EVEN_ROWS & ~RIGHT_EDGE) >> 3) | ((b & ODD_ROWS) >> 4)) & FULL
+
+def shift_sw(b):
+    return (((b & EVEN_ROWS) << 4) | ((b & ODD_ROWS & ~LEFT_EDGE) << 3)) & FULL
+
+def shift_se(b):
+    return (((b & EVEN_ROWS & ~RIGHT_EDGE) << 5) | ((b & ODD_ROWS) << 4)) & FULL
+
+# (forward, backward) pairs; backward undoes forward for bits that stayed on the board
+NORTH_SHIFTS = ((shift_nw, shift_se), (shift_ne, shift_sw))
+SOUTH_SHIFTS = ((shift_sw, shift_ne), (shift_se, shift_nw))
+ALL_SHIFTS = NORTH_SHIFTS + SOUTH_SHIFTS
+
+
+# ----- Precomputed Geometry ----- #
+# Direction indices; (row, col) deltas match the old NORTHWEST/NORTHEAST/SOUTHWEST/SOUTHEAST constants
+NW, NE, SW, SE = 0, 1, 2, 3
+DIRECTION_DELTAS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+
+# Piece kinds index the step/jump tables
+WHITE_MAN, RED_MAN, KING = 0, 1, 2
+KIND_DIRECTIONS = ((NW, NE), (SW, SE), (NW, NE, SW, SE))
+
+"""Square one diagonal step away in direction d, or -1 off the board"""
+def _neighbour(sq, d):
+    row, col = SQUARE_TO_COORD[sq]
+    d_row, d_col = DIRECTION_DELTAS[d]
+    return COORD_TO_SQUARE.get((row + d_row, col + d_col), -1)
+
+# NEIGHBOURS[sq][d] -> adjacent square or -1
+NEIGHBOURS = tuple(tuple(_neighbour(sq, d) for d in range(4)) for sq in range(32))
+
+# STEPS[kind][sq] -> ((to_sq, to_bit), ...) for plain moves
+STEPS = tuple(
+    tuple(
+        tuple((NEIGHBOURS[sq][d], 1 << NEIGHBOURS[sq][d]) for d in directions if NEIGHBOURS[sq][d] >= 0)
+        for sq in range(32)
+    )
+    for directions in KIND_DIRECTIONS
+)
+
+# JUMPS[kind][sq] -> ((over_bit, land_sq, land_bit), ...) for single captures
+JUMPS = tuple(
+    tuple(
+        tuple(
+            (1 << NEIGHBOURS[sq][d], NEIGHBOURS[NEIGHBOURS[sq][d]][d], 1 << NEIGHBOURS[NEIGHBOURS[sq][d]][d])
+            for d in directions
+            if NEIGHBOURS[sq][d] >= 0 and NEIGHBOURS[NEIGHBOURS[sq][d]][d] >= 0
+        )
+        for sq in range(32)
+    )
+    for directions in KIND_DIRECTIONS
+)
+
+
+"""Yields the square index of every set bit, lowest first"""
+def iter_squares(b):
+    while b:
+        low = b & -b
+        yield low.bit_length() - 1
+        b ^= low
+
+
+"""Mask of own pieces that have at least one capture"""
+def jumpers_mask(own, enemy, kings, is_white):
+    empty = FULL ^ (own | enemy)
+    forward, backward = (NORTH_SHIFTS, SOUTH_SHIFTS) if is_white else (SOUTH_SHIFTS, NORTH_SHIFTS)
+    result = 0
+    for _, back in forward:
+        result |= back(back(empty) & enemy) & own
+    own_kings = own & kings
+    if own_kings:
+        for _, back in backward:
+            result |= back(back(empty) & enemy) & own_kings
+    return result
+
+"""Mask of own pieces that have at least one non-capturing move"""
+def movers_mask(own, enemy, kings, is_white):
+    empty = FULL ^ (own | enemy)
+    forward, backward = (NORTH_SHIFTS, SOUTH_SHIFTS) if is_white else (SOUTH_SHIFTS, NORTH_SHIFTS)
+    result = 0
+    for _, back in forward:
+        result |= back(empty) & own
+    own_kings = own & kings
+    if own_kings:
+        for _, back in backward:
+            result |= back(empty) & own_kings
+    return result
+
+
+# ----- Full Turn Generation ----- #
+'''
+    Move Record:
+        One complete turn: every square the piece visits and a mask of the pieces it captures
+        path[0] is the starting square and path[-1] the final square
+'''
+class Move(namedtuple('Move', ('path', 'captured'))):
+    __slots__ = ()
+
+    @property
+    def start(self):
+        return self.path[0]
+
+    @property
+    def end(self):
+        return self.path[-1]
+
+    @property
+    def is_capture(self):
+        return self.captured != 0
+
+    """Returns the path as (row, col) board coordinates"""
+    def coords(self):
+        return [SQUARE_TO_COORD[sq] for sq in self.path]
+
+    """Standard 1-32 square notation, e.g. '22-17' or '17x10x1' for a double jump"""
+    def notation(self):
+        return ('x' if self.captured else '-').join(str(sq + 1) for sq in self.path)
+
+"""Follow every capture chain from sq, appending a Move for each path that cannot jump further"""
+def _extend_jumps(sq, jumps, enemy, empty, path, captured, turns):
+    extended = False
+    for over_bit, land_sq, land_bit in jumps[sq]:
+        if enemy & over_bit and empty & land_bit:
+            extended = True
+            # Captured pieces leave the board immediately, like move_piece does hop by hop
+            _extend_jumps(land_sq, jumps, enemy ^ over_bit, (empty | over_bit | (1 << sq)) ^ land_bit,
+                          path + (land_sq,), captured | over_bit, turns)
+    if not extended and captured:
+        turns.append(Move(path, captured))
+
+'''
+    generate_turns() Function:
+        Returns every complete legal turn for the side with pieces in own
+        Captures are mandatory, and a capture chain always continues until no jump is left
+'''
+def generate_turns(own, enemy, kings, is_white):
+    man_kind = WHITE_MAN if is_white else RED_MAN
+    empty = FULL ^ (own | enemy)
+    turns = []
+
+    jumpers = jumpers_mask(own, enemy, kings, is_white)
+    if jumpers:
+        for sq in iter_squares(jumpers):
+            jumps = JUMPS[KING if kings >> sq & 1 else man_kind]
+            _extend_jumps(sq, jumps, enemy, empty, (sq,), 0, turns)
+        return turns
+
+    for sq in iter_squares(movers_mask(own, enemy, kings, is_white)):
+        for to_sq, to_bit in STEPS[KING if kings >> sq & 1 else man_kind][sq]:
+            if empty & to_bit:
+                turns.append(Move((sq, to_sq), 0))
+    return turns
+
+
+'''
+    apply_turn() Function:
+        Plays a Move on side-relative masks without touching any objects
+        Returns (own, enemy, kings, promoted); the caller swaps own/enemy to pass the turn
+'''
+def apply_turn(own, enemy, kings, is_white, move):
+    from_bit = 1 << move.path[0]
+    to_bit = 1 << move.path[-1]
+    captured = move.captured
+    if captured:
+        enemy &= ~captured
+        kings &= ~captured
+    # XOR with both bits leaves the piece in place when a capture loop ends on its start square
+    own ^= from_bit ^ to_bit
+    promoted = False
+    if kings & from_bit:
+        kings ^= from_bit ^ to_bit
+    elif to_bit & (WHITE_PROMOTION if is_white else RED_PROMOTION):
+        kings |= to_bit
+        promoted = True
+    return own, enemy, kings, promoted
+
+'''
+    Bitboard Class:
+        Holds the white, red and kings masks for one position
+        White pieces are the ones with Checker.is_white set (they move up the board)
+'''
+class Bitboard:
+    __slots__ = ('white', 'red', 'kings')
+
+    def __init__(self, white=0, red=0, kings=0):
+        self.white = white
+        self.red = red
+        self.kings = kings
+
+    """Build the masks from a board of Tile objects"""
+    @classmethod
+    def from_tiles(cls, board):
+        bitboard = cls()
+        for sq, (row, col) in enumerate(SQUARE_TO_COORD):
+            checker = board[row][col].hasChecker
+            if checker is None:
+                continue
+            bit = 1 << sq
+            if checker.is_white:
+                bitboard.white |= bit
+            else:
+                bitboard.red |= bit
+            if checker.king:
+                bitboard.kings |= bit
+        return bitboard
+
+    def copy(self):
+        return Bitboard(self.white, self.red, self.kings)
+
+    def empty(self):
+        return FULL ^ (self.white | self.red)
+
+    def pieces(self, is_white):
+        return self.white if is_white else self.red
+
+    """Returns (is_white, king) for the piece on sq, or None if it is empty"""
+    def piece_at(self, sq):
+        bit = 1 << sq
+        if self.white & bit:
+            return (True, bool(self.kings & bit))
+        if self.red & bit:
+            return (False, bool(self.kings & bit))
+        return None
+
+    """Mask of is_white pieces that have at least one capture"""
+    def jumpers(self, is_white):
+        if is_white:
+            return jumpers_mask(self.white, self.red, self.kings, True)
+        return jumpers_mask(self.red, self.white, self.kings, False)
+
+    """Mask of is_white pieces that have at least one non-capturing move"""
+    def movers(self, is_white):
+        if is_white:
+            return movers_mask(self.white, self.red, self.kings, True)
+        return movers_mask(self.red, self.white, self.kings, False)
+
+    """Every complete legal turn for is_white, multi-jumps expanded"""
+    def turns(self, is_white):
+        if is_white:
+            return generate_turns(self.white, self.red, self.kings, True)
+        return generate_turns(self.red, self.white, self.kings, False)
+
+    """Returns the shift pairs the piece on sq may use"""
+    def _piece_shifts(self, sq):
+        bit = 1 << sq
+        if self.kings & bit:
+            return ALL_SHIFTS
+        return NORTH_SHIFTS if self.white & bit else SOUTH_SHIFTS
+
+    """Mask of landing squares for captures by the piece on sq"""
+    def captures_from(self, sq):
+        bit = 1 << sq
+        enemy = self.red if self.white & bit else self.white
+        empty = self.empty()
+        result = 0
+        for forward, backward in self._piece_shifts(sq):
+            result |= forward(forward(bit) & enemy) & empty
+        return result
+
+    """Mask of squares the piece on sq can step to without capturing"""
+    def moves_from(self, sq):
+        bit = 1 << sq
+        empty = self.empty()
+        result = 0
+        for forward, backward in self._piece_shifts(sq):
+            result |= forward(bit) & empty
+        return result
+
+    """
+    Move the piece on from_sq to to_sq, removing a jumped piece if there is one
+    Returns the captured square index or None
+    """
+    def move(self, from_sq, to_sq):
+        from_bit = 1 << from_sq
+        to_bit = 1 << to_sq
+        captured = None
+        from_row, from_col = SQUARE_TO_COORD[from_sq]
+        to_row, to_col = SQUARE_TO_COORD[to_sq]
+        if abs(to_row - from_row) == 2:
+            captured = COORD_TO_SQUARE[((from_row + to_row) // 2, (from_col + to_col) // 2)]
+            clear = ~(1 << captured)
+            self.white &= clear
+            self.red &= clear
+            self.kings &= clear
+        if self.white & from_bit:
+            self.white ^= from_bit | to_bit
+        else:
+            self.red ^= from_bit | to_bit
+        if self.kings & from_bit:
+            self.kings ^= from_bit | to_bit
+        return captured
+
+    """Crown the piece on sq if it is a man standing on its promotion row; returns True if promoted"""
+    def promote(self, sq):
+        bit = 1 << sq
+        if self.kings & bit:
+            return False
+        if (self.white & bit and WHITE_PROMOTION & bit) or (self.red & bit and RED_PROMOTION & bit):
+            self.kings |= bit
+            return True
+        return False
+
+    """Play a whole turn produced by turns(): remove captured pieces, move the piece and promote it"""
+    def apply(self, move):
+        from_bit = 1 << move.path[0]
+        to_bit = 1 << move.path[-1]
+        if move.captured:
+            clear = ~move.captured
+            self.white &= clear
+            self.red &= clear
+            self.kings &= clear
+        # A king can finish a capture loop on the square it started from
+        if from_bit != to_bit:
+            if self.white & from_bit:
+                self.white ^= from_bit | to_bit
+            else:
+                self.red ^= from_bit | to_bit
+            if self.kings & from_bit:
+                self.kings ^= from_bit | to_bit
+        self.promote(move.path[-1])
@@ -0,0 +1,203 @@
+'''
+Opening Book
+    Moves worth playing from early positions, keyed by the position's Zobrist hash
+    Stored as a sorted file of fixed-size records and searched with bisection over an mmap,
+    so opening the book reads nothing until a position is looked up
+    Built from self-play (python -m pycheckers.simulate players) or imported game records (text or PDN)
+    Run with `python -m pycheckers.book` (see --help)
+'''
+import argparse
+import mmap
+import struct
+import sys
+
+from .bitboard import apply_turn, generate_turns
+from .fen import START_FEN, parse_fen
+from .pdn import find_move, iter_games
+from .zobrist import hash_move, hash_position
+
+MAGIC = b'PCBK'
+HEADER = struct.Struct('<4sI')       # magic, record count
+'''
+    Record Layout (16 bytes, little-endian):
+        hash u64, captured mask u32, from square u8, to square u8, weight u16
+        Records are sorted by hash, so all moves of a position sit next to each other
+'''
+RECORD = struct.Struct('<QIBBH')
+_HASH = struct.Struct('<Q')
+MAX_WEIGHT = 0xFFFF
+# Weight each side's moves earn from the game result
+RESULT_POINTS = {'win': 2, 'draw': 1, 'loss': 0}
+
+
+'''
+    OpeningBook Class:
+        Read-only book file mapped into memory
+        entries() lists (from, to, captured, weight) for a hash; choose() picks a legal Move at random by weight
+'''
+class OpeningBook:
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or len(self.data) != HEADER.size + self.count * RECORD.size:
+            raise ValueError(f"{path} is not an opening book")
+
+    def __len__(self):
+        return self.count
+
+    def _hash_at(self, i):
+        return _HASH.unpack_from(self.data, HEADER.size + i * RECORD.size)[0]
+
+    """Every book move for a position hash, as (from_sq, to_sq, captured, weight)"""
+    def entries(self, h):
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            if self._hash_at(mid) < h:
+                low = mid + 1
+            else:
+                high = mid
+        entries = []
+        while low < self.count and self._hash_at(low) == h:
+            key, captured, from_sq, to_sq, weight = RECORD.unpack_from(self.data, HEADER.size + low * RECORD.size)
+            entries.append((from_sq, to_sq, captured, weight))
+            low += 1
+        return entries
+
+    '''
+        choose() Method:
+            Weighted random pick among the book moves that are legal in moves
+            Returns a Move from moves, or None when the position is not in the book
+    '''
+    def choose(self, h, moves, rng):
+        candidates = []
+        weights = []
+        for from_sq, to_sq, captured, weight in self.entries(h):
+            for move in moves:
+                if move.path[0] == from_sq and move.path[-1] == to_sq and move.captured == captured:
+                    candidates.append(move)
+                    weights.append(weight)
+                    break
+        if not candidates:
+            return None
+        return rng.choices(candidates, weights)[0]
+
+    def close(self):
+        self.data.close()
+
+
+# ----- Building ----- #
+'''
+    BookBuilder Class:
+        Replays games from their starting position and adds up a weight for every (position, move)
+        Each move earns RESULT_POINTS for how the game ended for the side that played it
+'''
+class BookBuilder:
+    def __init__(self, max_plies=16):
+        self.max_plies = max_plies
+        self.weights = {}
+        self.games = 0
+
+    '''
+        add_game() Method:
+            moves are turns in notation form ('22-17', '17x10x1'), winner is 'white', 'red' or 'draw'
+            fen is the position the game starts from, side to move included (default: this game's opening)
+            Raises ValueError for a bad FEN or at the first move that is not legal
+    '''
+    def add_game(self, moves, winner, fen=START_FEN):
+        white, red, kings, is_white = parse_fen(fen)
+        own, enemy = (white, red) if is_white else (red, white)
+        h = hash_position(white, red, kings, is_white)
+        for ply, text in enumerate(moves[:self.max_plies]):
+            try:
+                move = find_move(generate_turns(own, enemy, kings, is_white), text)
+            except ValueError as error:
+                raise ValueError(f"ply {ply + 1}: {error}") from None
+            side = 'white' if is_white else 'red'
+            result = 'draw' if winner == 'draw' else ('win' if winner == side else 'loss')
+            key = (h, move.path[0], move.path[-1], move.captured)
+            self.weights[key] = min(MAX_WEIGHT, self.weights.get(key, 0) + RESULT_POINTS[result])
+            child_own, child_enemy, child_kings, promoted = apply_turn(own, enemy, kings, is_white, move)
+            h = hash_move(h, move, kings, is_white, promoted)
+            own, enemy, kings, is_white = child_enemy, child_own, child_kings, not is_white
+        self.games += 1
+
+    """Write the book, sorted by hash; moves that never earned a point are left out"""
+    def write(self, path):
+        records = sorted((h, captured, from_sq, to_sq, weight)
+                         for (h, from_sq, to_sq, captured), weight in self.weights.items() if weight)
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, len(records)))
+            for record in records:
+                f.write(RECORD.pack(*record))
+        return len(records)
+
+'''
+    read_game_lines() Function:
+        Yields (moves, winner) from a text file with one game per line, turns separated by spaces
+        A line ends with a result: 1-0 (white, the side moving first, won), 0-1 or 1/2-1/2
+        winner is None for an unfinished game (ending in * or with no result), which says nothing about its moves
+'''
+def read_game_lines(path):
+    results = {'1-0': 'white', '0-1': 'red', '1/2-1/2': 'draw'}
+    with open(path) as f:
+        for line in f:
+            tokens = line.split()
+            if not tokens:
+                continue
+            winner = results.get(tokens[-1])
+            if tokens[-1] in results or tokens[-1] == '*':
+                tokens = tokens[:-1]
+            yield tokens, winner
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m pycheckers.book', description='Build an opening book.')
+    parser.add_argument('--out', default='book.bin', help="book file to write (default book.bin)")
+    parser.add_argument('--games', type=int, default=0, help="self-play games between ai players to learn from")
+    parser.add_argument('--depth', type=int, default=4, help="search depth of the self-play ai (default 4)")
+    parser.add_argument('--opening', type=int, default=2, help="random turns at the start of each self-play game")
+    parser.add_argument('--seed', type=int, default=0, help="base seed for self-play")
+    parser.add_argument('--jobs', type=int, default=None, help="self-play worker processes (default: one per CPU)")
+    parser.add_argument('--import', dest='imports', action='append', default=[], metavar='FILE',
+                        help="text file of games, one per line, from the opening position (repeatable)")
+    parser.add_argument('--pdn', action='append', default=[], metavar='FILE',
+                        help="PDN file of games (.gz to decompress), each from its own FEN tag (repeatable)")
+    parser.add_argument('--plies', type=int, default=16, help="how many turns of each game go into the book")
+    args = parser.parse_args(argv)
+
+    builder = BookBuilder(args.plies)
+    for path in args.imports:
+        for line, (moves, winner) in enumerate(read_game_lines(path), 1):
+            if winner is None:
+                print(f"{path}: skipped game {line}: no result")
+                continue
+            try:
+                builder.add_game(moves, winner)
+            except ValueError as error:
+                print(f"{path}: skipped game {line}: {error}")
+    for path in args.pdn:
+        # Games without a FEN tag start from the standard opening, Black to move (see PdnGame.fen)
+        for number, game in enumerate(iter_games(path), 1):
+            if game.winner is None:
+                print(f"{path}: skipped game {number}: no result")
+                continue
+            try:
+                builder.add_game(game.moves, game.winner, game.fen)
+            except ValueError as error:
+                print(f"{path}: skipped game {number}: {error}")
+    if args.games:
+        # simulate imports this module for its --book option, so import it only when needed
+        from .simulate import run_games
+        # The simulator's random opening turns play the part of a ballot: the results weed out the bad ones
+        for result in run_games(args.games, args.seed, args.jobs, 'ai', 'ai', args.depth, args.opening):
+            builder.add_game(result.moves, result.winner)
+    count = builder.write(args.out)
+    print(f"{count} book moves from {builder.games} games written to {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,256 @@
+'''
+Training Data Export
+    Plays self-play games (pycheckers.simulate players) and writes every position to .npy shards
+    for training evaluation functions: the position, the side to move, its legal moves and how the game ended
+    Records have a fixed width, so a shard is one NumPy structured array that np.load(path, mmap_mode='r') maps
+    without reading it; shards are appended through a memory-mapped window, so memory stays flat however long a run is
+    Each worker process writes its own shard, and appending to an existing shard carries on after its last record;
+    a run whose games are already in its shards (the same --seed again) is refused rather than duplicated
+    Run with `python -m pycheckers.dataset` (see --help)
+'''
+import argparse
+import os
+import struct
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import perf_counter
+
+import numpy as np
+from numpy.lib import format as npy_format
+
+from .batch import DRAW, RED_WINS, WHITE_WINS, PositionBatch
+from .simulate import PLAYERS, game_seed, play_game
+
+'''
+    Record Layout (154 bytes, little-endian, no padding):
+        white, red, kings: u32 masks in the bitboard.py layout (white is GameState's 'white' side)
+        moves: 32 x u32, moves[sq] is the mask of squares a legal turn starting on sq ends on
+        seed: u64 the game's seed, which identifies it (play_game() replays it), ply: u16 turn number
+        white_to_move: u8, quiet: u8 moves since the last capture
+        result: i8 how the game ended (batch.WHITE_WINS, RED_WINS or DRAW)
+        value: i8 the result for the side to move: 1 win, 0 draw, -1 loss
+'''
+RECORD = np.dtype([('white', '<u4'), ('red', '<u4'), ('kings', '<u4'), ('moves', '<u4', (32,)), ('seed', '<u8'),
+                   ('ply', '<u2'), ('white_to_move', 'u1'), ('quiet', 'u1'), ('result', 'i1'), ('value', 'i1')])
+RESULT_CODES = {'white': WHITE_WINS, 'red': RED_WINS, 'draw': DRAW}
+# The .npy header is padded to a fixed size so the record count can be rewritten in place
+HEADER_SIZE = 512
+
+
+"""A version 1.0 .npy header for count records, padded to HEADER_SIZE bytes"""
+def _npy_header(count):
+    header = repr({'descr': npy_format.dtype_to_descr(RECORD), 'fortran_order': False, 'shape': (count,)})
+    return (npy_format.MAGIC_PREFIX + b'\x01\x00' + struct.pack('<H', HEADER_SIZE - 10)
+            + header.encode('latin1').ljust(HEADER_SIZE - 11) + b'\n')
+
+"""Record count of an existing shard; raises ValueError if it is not one"""
+def _read_count(f):
+    f.seek(0)
+    try:
+        if npy_format.read_magic(f) != (1, 0):
+            raise ValueError("unexpected .npy version")
+        shape, fortran_order, dtype = npy_format.read_array_header_1_0(f)
+    except ValueError as error:
+        raise ValueError(f"{f.name} is not a training data shard: {error}") from None
+    if dtype != RECORD or fortran_order or len(shape) != 1 or f.tell() != HEADER_SIZE:
+        raise ValueError(f"{f.name} is not a training data shard")
+    return shape[0]
+
+
+'''
+    ShardWriter Class:
+        Appends records to one .npy shard, creating it if needed
+        The file grows chunk records at a time and only the current chunk is mapped; the header count
+        is rewritten each time the file grows, so a shard cut off by a crash still loads (up to the last chunk)
+        close() trims the file to the records written
+'''
+class ShardWriter:
+    def __init__(self, path, chunk=65536):
+        self.path = path
+        self.chunk = chunk
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self.file = open(path, 'r+b' if exists else 'w+b')
+        try:
+            self.count = _read_count(self.file) if exists else 0
+        except ValueError:
+            self.file.close()
+            raise
+        self.window = None
+        self.window_start = self.count
+        self._write_header()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _write_header(self):
+        self.file.seek(0)
+        self.file.write(_npy_header(self.count))
+        self.file.flush()
+
+    """Map the next chunk of records after the ones written so far, growing the file to hold it"""
+    def _next_window(self):
+        if self.window is not None:
+            self.window.flush()
+            self.window = None
+        self._write_header()
+        self.file.truncate(HEADER_SIZE + (self.count + self.chunk) * RECORD.itemsize)
+        self.window = np.memmap(self.file, dtype=RECORD, mode='r+', offset=HEADER_SIZE + self.count * RECORD.itemsize,
+                                shape=(self.chunk,))
+        self.window_start = self.count
+
+    """Append an array of RECORD records"""
+    def append(self, records):
+        written = 0
+        while written < len(records):
+            if self.window is None or self.count == self.window_start + self.chunk:
+                self._next_window()
+            at = self.count - self.window_start
+            n = min(len(records) - written, self.chunk - at)
+            self.window[at:at + n] = records[written:written + n]
+            self.count += n
+            written += n
+
+    def close(self):
+        if self.file.closed:
+            return
+        if self.window is not None:
+            self.window.flush()
+            self.window = None
+        self._write_header()
+        self.file.truncate(HEADER_SIZE + self.count * RECORD.itemsize)
+        self.file.close()
+
+
+"""Open a shard read-only and memory-mapped; records are only read as they are used"""
+def load_shard(path):
+    with open(path, 'rb') as f:
+        _read_count(f)
+    return np.load(path, mmap_mode='r')
+
+"""A batch.PositionBatch over some records, for the vectorised rules and evaluation"""
+def position_batch(records):
+    return PositionBatch(records['white'], records['red'], records['kings'], records['white_to_move'],
+                         records['quiet'])
+
+
+# ----- Recording Games ----- #
+"""The fields of a position that do not depend on how the game ends"""
+def snapshot(game_state):
+    bitboard = game_state.bitboard
+    moves = [0] * 32
+    for move in game_state.legal_turns():
+        moves[move.start] |= 1 << move.end
+    return (bitboard.white, bitboard.red, bitboard.kings, moves, game_state.turn == 'white',
+            game_state.moves_since_last_capture)
+
+"""RECORD array for the snapshots of one game, labelled with its result ('white', 'red' or 'draw')"""
+def game_records(seed, snapshots, winner):
+    records = np.zeros(len(snapshots), dtype=RECORD)
+    if not snapshots:
+        return records
+    white, red, kings, moves, white_to_move, quiet = zip(*snapshots)
+    records['white'] = white
+    records['red'] = red
+    records['kings'] = kings
+    records['moves'] = moves
+    records['seed'] = seed
+    records['ply'] = np.arange(len(snapshots))
+    records['white_to_move'] = white_to_move
+    records['quiet'] = quiet
+    records['result'] = RESULT_CODES[winner]
+    if winner != 'draw':
+        records['value'] = np.where(records['white_to_move'] == (winner == 'white'), 1, -1)
+    return records
+
+'''
+    export_shard() Function:
+        Plays the games numbered in indices and appends their positions to the shard at path
+        Runs in a worker process; only one game's positions are held in memory at a time
+        Returns (path, games, positions)
+'''
+def export_shard(path, indices, base_seed=0, white='random', red='random', max_depth=4, random_opening=4,
+                 tablebase=None, book=None, chunk=65536):
+    positions = 0
+    with ShardWriter(path, chunk) as writer:
+        for index in indices:
+            snapshots = []
+            result = play_game(index, game_seed(base_seed, index), white, red, max_depth, random_opening, tablebase,
+                               book, on_turn=lambda game_state: snapshots.append(snapshot(game_state)))
+            writer.append(game_records(result.seed, snapshots, result.winner))
+            positions += len(snapshots)
+    return path, len(indices), positions
+
+"""Path of shard number shard for an output prefix"""
+def shard_path(prefix, shard):
+    return f"{prefix}-{shard:03d}.npy"
+
+"""Seeds of the games already in a shard (a game's first record has ply 0); empty if there is no shard yet"""
+def shard_seeds(path):
+    if not os.path.exists(path) or not os.path.getsize(path):
+        return set()
+    records = load_shard(path)
+    return set(records['seed'][records['ply'] == 0].tolist())
+
+'''
+    run_export() Function:
+        Generator that spreads count games over `shards` files and yields (path, games, positions) as each finishes
+        Game i goes to shard i % shards, so a run is reproducible whatever the number of worker processes
+        Raises ValueError before playing anything if a shard already holds one of its games
+'''
+def run_export(prefix, count, shards=None, jobs=None, base_seed=0, white='random', red='random', max_depth=4,
+               random_opening=4, tablebase=None, book=None, chunk=65536):
+    jobs = jobs or os.cpu_count() or 1
+    shards = shards or jobs
+    for shard in range(shards):
+        path = shard_path(prefix, shard)
+        existing = shard_seeds(path)
+        for index in range(shard, count, shards):
+            if game_seed(base_seed, index) in existing:
+                raise ValueError(f"{path} already holds game {index} of seed {base_seed}; "
+                                 f"use another --seed to add more games")
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(export_shard, shard_path(prefix, shard), range(shard, count, shards), base_seed,
+                               white, red, max_depth, random_opening, tablebase, book, chunk)
+                   for shard in range(shards)]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m pycheckers.dataset',
+                                     description='Write self-play positions to .npy shards for training.')
+    parser.add_argument('prefix', help="output prefix; shards are written to PREFIX-000.npy, PREFIX-001.npy, ...")
+    parser.add_argument('--games', type=int, default=1000, help="number of games to play (default 1000)")
+    parser.add_argument('--shards', type=int, default=None, help="number of shard files (default: one per job)")
+    parser.add_argument('--jobs', type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument('--seed', type=int, default=0, help="base seed; game i uses a seed derived from it")
+    parser.add_argument('--white', choices=PLAYERS, default='random', help="player for the side drawn red, which moves first")
+    parser.add_argument('--red', choices=PLAYERS, default='random', help="player for the side drawn white")
+    parser.add_argument('--depth', type=int, default=4, help="search depth for the ai player (default 4)")
+    parser.add_argument('--opening', type=int, default=4, help="random turns before the ai starts searching")
+    parser.add_argument('--tablebase', metavar='DIR', help="endgame tables for the ai player (see pycheckers.tablebase)")
+    parser.add_argument('--book', metavar='FILE', help="opening book for the ai player (see pycheckers.book)")
+    parser.add_argument('--chunk', type=int, default=65536, help="records the shard files grow by (default 65536)")
+    args = parser.parse_args(argv)
+
+    start = perf_counter()
+    total = 0
+    export = run_export(args.prefix, args.games, args.shards, args.jobs, args.seed, args.white, args.red, args.depth,
+                        args.opening, args.tablebase, args.book, args.chunk)
+    try:
+        for path, games, positions in export:
+            total += positions
+            print(f"{path}: {games} games, {positions} positions ({len(load_shard(path))} in the shard)")
+    except ValueError as error:
+        parser.error(str(error))
+    elapsed = perf_counter() - start
+    print(f"{args.games} games, {total} positions in {elapsed:.2f}s ({total / elapsed:.0f} positions/s, "
+          f"{total * RECORD.itemsize / 2 ** 20:.1f} MiB)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,425 @@
+'''
+Search Engine
+    Computer player built on the bitboard rules
+    Negamax alpha-beta with iterative deepening, a Zobrist-hashed transposition table,
+    and move ordering by TT move, captures, killer moves and the history heuristic
+'''
+import random
+from array import array
+from time import perf_counter
+
+from .bitboard import RED_PROMOTION, WHITE_PROMOTION, apply_turn, generate_turns
+from .zobrist import hash_move, hash_position
+
+MATE = 100000
+MATE_BOUND = MATE - 1000   # scores beyond this are forced wins/losses
+TB_WIN = MATE_BOUND - 1000 # endgame tablebase wins score TB_WIN - distance - ply, so the quickest win scores best
+TB_BOUND = TB_WIN - 500    # scores beyond this are tablebase wins/losses (distance <= 40, ply < MAX_PLY)
+INFINITY = MATE + 1
+MAX_DEPTH = 64
+MAX_PLY = 256
+DRAW_PLIES = 40            # same 40-move rule as GameState.check_game_over
+
+# Transposition table bound types
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+# ----- Evaluation ----- #
+MAN_VALUE = 100
+KING_VALUE = 160
+
+"""Mask of the dark squares on a board row"""
+def _row_mask(row):
+    return 0xF << (4 * row)
+
+# (mask, bonus) terms for men, per colour. White men advance towards row 0, red towards row 7
+_ADVANCE = ((6, 0), (5, 2), (4, 4), (3, 7), (2, 10), (1, 14))
+_BACK_RANK_GUARD = 6
+WHITE_MAN_TERMS = tuple((_row_mask(row), bonus) for row, bonus in _ADVANCE) + ((_row_mask(7), _BACK_RANK_GUARD),)
+RED_MAN_TERMS = tuple((_row_mask(7 - row), bonus) for row, bonus in _ADVANCE) + ((_row_mask(0), _BACK_RANK_GUARD),)
+# Centre squares (3,2) (3,4) (4,3) (4,5) for men; the wider centre for kings
+MAN_CENTER = (1 << 13) | (1 << 14) | (1 << 17) | (1 << 18)
+MAN_CENTER_BONUS = 4
+KING_CENTER = 0
+for _sq in (9, 10, 13, 14, 17, 18, 21, 22):
+    KING_CENTER |= 1 << _sq
+KING_CENTER_BONUS = 6
+
+"""Material and positional score for one side's pieces"""
+def _side_score(pieces, kings, is_white):
+    men = pieces & ~kings
+    own_kings = pieces & kings
+    score = MAN_VALUE * men.bit_count() + KING_VALUE * own_kings.bit_count()
+    for mask, bonus in (WHITE_MAN_TERMS if is_white else RED_MAN_TERMS):
+        score += bonus * (men & mask).bit_count()
+    score += MAN_CENTER_BONUS * (men & MAN_CENTER).bit_count()
+    score += KING_CENTER_BONUS * (own_kings & KING_CENTER).bit_count()
+    return score
+
+'''
+    evaluate() Function:
+        Static score of a position from the point of view of the side to move
+        Material plus advancement, back-rank and centre bonuses
+        The side that is ahead is nudged towards trading pieces off
+'''
+def evaluate(own, enemy, kings, is_white):
+    score = _side_score(own, kings, is_white) - _side_score(enemy, kings, not is_white)
+    pieces = (own | enemy).bit_count()
+    return score + score * (24 - pieces) // 96
+
+
+# ----- Transposition Table ----- #
+'''
+    TranspositionTable Class:
+        Fixed memory budget: two 64-bit arrays (keys, packed data), 16 bytes per entry
+        Entries are grouped in buckets of two slots:
+            slot 0 keeps the deepest result, unless it is left over from an older search
+            slot 1 is always replaced
+        Packed data: score (21 bits), depth (8), bound type (2), best move index + 1 (8), search age (8)
+'''
+class TranspositionTable:
+    ENTRY_BYTES = 16
+
+    def __init__(self, megabytes=16):
+        entries = 2
+        while entries * 2 * self.ENTRY_BYTES <= megabytes * 1024 * 1024:
+            entries *= 2
+        self.size = entries
+        self.bucket_mask = entries - 2
+        self.keys = array('Q', bytes(8 * entries))
+        self.data = array('Q', bytes(8 * entries))
+        self.age = 0
+        self.probes = 0
+        self.hits = 0
+
+    """Start a new search; older entries become preferred victims for replacement"""
+    def new_search(self):
+        self.age = (self.age + 1) & 0xFF
+
+    def clear(self):
+        self.keys = array('Q', bytes(8 * self.size))
+        self.data = array('Q', bytes(8 * self.size))
+
+    """Returns (depth, bound, score, move_index) for key, or None; move_index is -1 when unknown"""
+    def probe(self, key):
+        self.probes += 1
+        index = key & self.bucket_mask
+        keys = self.keys
+        if keys[index] != key:
+            index += 1
+            if keys[index] != key:
+                return None
+        self.hits += 1
+        packed = self.data[index]
+        return ((packed >> 21) & 0xFF, (packed >> 29) & 0x3, (packed & 0x1FFFFF) - 0x100000, ((packed >> 31) & 0xFF) - 1)
+
+    def store(self, key, depth, bound, score, move_index):
+        move_bits = move_index + 1 if move_index < 0xFF else 0
+        packed = ((score + 0x100000)
+                  | (min(depth, 0xFF) << 21)
+                  | (bound << 29)
+                  | (move_bits << 31)
+                  | (self.age << 39))
+        index = key & self.bucket_mask
+        keys = self.keys
+        data = self.data
+        stored = data[index]
+        if (keys[index] == key
+                or (stored >> 39) & 0xFF != self.age
+                or depth >= (stored >> 21) & 0xFF):
+            keys[index] = key
+            data[index] = packed
+        else:
+            keys[index + 1] = key
+            data[index + 1] = packed
+
+
+# ----- Search ----- #
+"""Raised inside the search when the time budget runs out or the search is stopped"""
+class SearchAborted(Exception):
+    pass
+
+'''
+    SearchResult Class:
+        Best move found plus the statistics of the search that found it
+'''
+class SearchResult:
+    def __init__(self):
+        self.move = None
+        self.score = 0
+        self.depth = 0
+        self.nodes = 0
+        self.elapsed = 0.0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.tb_hits = 0
+        self.book = False  # True when the move came from the opening book
+
+    """Independent copy, safe to hand to another thread while the search carries on"""
+    def snapshot(self):
+        copy = SearchResult()
+        copy.__dict__.update(self.__dict__)
+        return copy
+
+    @property
+    def nps(self):
+        return int(self.nodes / self.elapsed) if self.elapsed > 0 else 0
+
+    @property
+    def tt_hit_rate(self):
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    def __str__(self):
+        move = self.move.notation() if self.move else 'none'
+        if self.book:
+            return f"move {move} from the opening book"
+        text = (f"move {move} score {self.score} depth {self.depth} nodes {self.nodes} "
+                f"nps {self.nps} tt hits {self.tt_hit_rate:.1%}")
+        return text + f" tb hits {self.tb_hits}" if self.tb_hits else text
+
+'''
+    Engine Class:
+        search() picks a move for the side to move in a GameState
+        search_position() does the same for raw side-relative masks
+        Both accept on_progress, called with a SearchResult snapshot after every finished depth,
+        and stop, a threading.Event that aborts the search as soon as it is set
+        The transposition table and history survive between searches in the same game
+        tablebase is an optional tablebase.Tablebase, probed instead of searching small endgames
+        book is an optional book.OpeningBook; book moves are played without searching, picked with rng
+'''
+class Engine:
+    def __init__(self, time_limit=1.0, max_depth=MAX_DEPTH, tt_megabytes=16, tablebase=None, book=None):
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.tt = TranspositionTable(tt_megabytes)
+        self.tablebase = tablebase
+        self.tb_hits = 0
+        self.book = book
+        self.rng = random.Random()
+        self.history = [0] * 1024
+        self.killers = [[None, None] for ply in range(MAX_PLY)]
+        self.nodes = 0
+        self.deadline = 0.0
+        self.stop = None
+        # Hashes of the game's earlier positions and of the current search path
+        self.seen = {}
+
+    """Clear everything learned from earlier positions (call between games)"""
+    def reset(self):
+        self.tt.clear()
+        self.history = [0] * 1024
+
+    def choose_move(self, game_state):
+        return self.search(game_state).move
+
+    def search(self, game_state, time_limit=None, max_depth=None, on_progress=None, stop=None):
+        bitboard = game_state.bitboard
+        is_white = game_state.turn == 'white'
+        own, enemy = (bitboard.white, bitboard.red) if is_white else (bitboard.red, bitboard.white)
+        return self.search_position(own, enemy, bitboard.kings, is_white, game_state.moves_since_last_capture,
+                                    time_limit, max_depth, on_progress, stop, game_state.position_history())
+
+    '''
+        search_position() Method:
+            Iterative deepening until the time budget or max_depth runs out
+            A depth that does not finish in time is thrown away; the last finished one is returned
+            history holds the hashes of earlier positions in the game (GameState.position_history());
+            any line that returns to one of them, or repeats itself, is scored as a draw
+    '''
+    def search_position(self, own, enemy, kings, is_white, quiet=0, time_limit=None, max_depth=None,
+                        on_progress=None, stop=None, history=()):
+        time_limit = self.time_limit if time_limit is None else time_limit
+        max_depth = self.max_depth if max_depth is None else max_depth
+        result = SearchResult()
+        start = perf_counter()
+
+        moves = generate_turns(own, enemy, kings, is_white)
+        if len(moves) <= 1:
+            # Nothing to think about
+            result.move = moves[0] if moves else None
+            return result
+
+        h = hash_position(*((own, enemy) if is_white else (enemy, own)), kings, is_white)
+        if self.book is not None:
+            result.move = self.book.choose(h, moves, self.rng)
+            if result.move is not None:
+                result.book = True
+                result.elapsed = perf_counter() - start
+                return result
+
+        self.nodes = 0
+        self.tb_hits = 0
+        self.deadline = start + time_limit
+        self.stop = stop
+        self.tt.new_search()
+        probes, hits = self.tt.probes, self.tt.hits
+        for ply_killers in self.killers:
+            ply_killers[0] = ply_killers[1] = None
+        self.history = [value >> 1 for value in self.history]
+
+        self.seen = dict.fromkeys(history, 1)
+        self.seen[h] = 1
+        best_index = -1
+        for depth in range(1, max_depth + 1):
+            if stop is not None and stop.is_set():
+                break
+            try:
+                score, best_index = self._root(own, enemy, kings, is_white, h, depth, quiet, moves, best_index)
+            except SearchAborted:
+                break
+            result.move = moves[best_index]
+            result.score = score
+            result.depth = depth
+            if on_progress is not None:
+                self._fill_stats(result, start, probes, hits)
+                on_progress(result.snapshot())
+            # Stop early on a forced or tablebase result, or when the next depth clearly cannot finish
+            if abs(score) >= TB_BOUND or perf_counter() - start > time_limit / 2:
+                break
+
+        if result.move is None:
+            result.move = moves[0]  # not even depth 1 finished
+        self._fill_stats(result, start, probes, hits)
+        self.stop = None
+        return result
+
+    def _fill_stats(self, result, start, probes, hits):
+        result.nodes = self.nodes
+        result.elapsed = perf_counter() - start
+        result.tt_probes = self.tt.probes - probes
+        result.tt_hits = self.tt.hits - hits
+        result.tb_hits = self.tb_hits
+
+    """One full-width search of the root moves; returns (score, index of the best move)"""
+    def _root(self, own, enemy, kings, is_white, h, depth, quiet, moves, previous_best):
+        alpha = -INFINITY
+        best_index = previous_best
+        for index in self._order(moves, kings, previous_best, 0):
+            move = moves[index]
+            child_own, child_enemy, child_kings, promoted = apply_turn(own, enemy, kings, is_white, move)
+            child_hash = hash_move(h, move, kings, is_white, promoted)
+            score = -self._negamax(child_enemy, child_own, child_kings, not is_white, child_hash,
+                                   depth - 1, -INFINITY, -alpha, 1, 0 if move.captured else quiet + 1)
+            if score > alpha:
+                alpha = score
+                best_index = index
+        self.tt.store(h, depth, EXACT, alpha, best_index)
+        return alpha, best_index
+
+    """Returns move indices, best candidates first"""
+    def _order(self, moves, kings, tt_index, ply):
+        killers = self.killers[ply] if ply < MAX_PLY else (None, None)
+        history = self.history
+        scored = []
+        for index, move in enumerate(moves):
+            if index == tt_index:
+                score = 1 << 40
+            elif move.captured:
+                # Captures first: longer chains and captured kings before single men
+                score = (1 << 30) + (move.captured.bit_count() << 8) + (move.captured & kings).bit_count()
+            elif move == killers[0]:
+                score = 1 << 29
+            elif move == killers[1]:
+                score = (1 << 29) - 1
+            else:
+                score = history[move.path[0] << 5 | move.path[-1]]
+                if not kings >> move.path[0] & 1 and (1 << move.path[-1]) & (WHITE_PROMOTION | RED_PROMOTION):
+                    score += 1 << 28  # promotion
+            scored.append((score, index))
+        scored.sort(reverse=True)
+        return [index for score, index in scored]
+
+    def _negamax(self, own, enemy, kings, is_white, h, depth, alpha, beta, ply, quiet):
+        self.nodes += 1
+        if not self.nodes & 2047 and (perf_counter() >= self.deadline or (self.stop is not None and self.stop.is_set())):
+            raise SearchAborted()
+
+        # Same order as check_game_over: 40-move draw, then no legal moves (or no pieces) loses
+        if quiet >= DRAW_PLIES:
+            return 0
+        # A repeated position is a draw: the side that could improve on it would not have repeated
+        if h in self.seen:
+            return 0
+        # Small endgames are looked up instead of searched
+        tablebase = self.tablebase
+        if tablebase is not None and (own | enemy).bit_count() <= tablebase.max_pieces:
+            distance = tablebase.probe(own, enemy, kings, is_white, quiet)
+            if distance is not None:
+                self.tb_hits += 1
+                # Counted from the root like mate scores, so a win found nearer the root scores higher
+                if distance > 0:
+                    return TB_WIN - distance - ply
+                return -TB_WIN - distance + ply if distance else 0
+        moves = generate_turns(own, enemy, kings, is_white)
+        if not moves:
+            return ply - MATE
+        # Captures are forced, so keep searching them past the horizon instead of evaluating mid-exchange
+        if depth <= 0 and not moves[0].captured:
+            return evaluate(own, enemy, kings, is_white)
+        depth = max(depth, 0)
+
+        tt = self.tt
+        tt_index = -1
+        entry = tt.probe(h)
+        if entry is not None:
+            entry_depth, bound, score, tt_index = entry
+            if entry_depth >= depth:
+                # Mate and tablebase scores are stored relative to the node, not the root
+                if score >= TB_BOUND:
+                    score -= ply
+                elif score <= -TB_BOUND:
+                    score += ply
+                if bound == EXACT:
+                    return score
+                if bound == LOWER and score > alpha:
+                    alpha = score
+                elif bound == UPPER and score < beta:
+                    beta = score
+                if alpha >= beta:
+                    return score
+
+        alpha_start = alpha
+        best = -INFINITY
+        best_index = -1
+        order = self._order(moves, kings, tt_index, ply) if len(moves) > 1 else (0,)
+        seen = self.seen
+        seen[h] = 1
+        for index in order:
+            move = moves[index]
+            child_own, child_enemy, child_kings, promoted = apply_turn(own, enemy, kings, is_white, move)
+            child_hash = hash_move(h, move, kings, is_white, promoted)
+            score = -self._negamax(child_enemy, child_own, child_kings, not is_white, child_hash,
+                                   depth - 1, -beta, -alpha, ply + 1, 0 if move.captured else quiet + 1)
+            if score > best:
+                best = score
+                best_index = index
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        if not move.captured:
+                            self._record_cutoff(move, depth, ply)
+                        break
+        del seen[h]
+
+        if best >= beta:
+            bound = LOWER
+        elif best > alpha_start:
+            bound = EXACT
+        else:
+            bound = UPPER
+        stored = best
+        if stored >= TB_BOUND:
+            stored += ply
+        elif stored <= -TB_BOUND:
+            stored -= ply
+        tt.store(h, depth, bound, stored, best_index)
+        return best
+
+    """Remember a quiet move that caused a beta cutoff (killer and history heuristics)"""
+    def _record_cutoff(self, move, depth, ply):
+        if ply < MAX_PLY:
+            killers = self.killers[ply]
+            if killers[0] != move:
+                killers[1] = killers[0]
+                killers[0] = move
+        self.history[move.path[0] << 5 | move.path[-1]] += depth * depth
@@ -0,0 +1,68 @@
+'''
+FEN Positions
+    PDN-style FEN strings such as "W:W21,22,K30:B1-12"
+    Squares use the standard 1-32 numbering (bitboard square + 1)
+    'W' pieces are GameState's white side (starting on 21-32), 'B' pieces are its red side (starting on 1-12)
+'''
+from .bitboard import iter_squares
+
+START_FEN = "W:W21-32:B1-12"           # the opening as the game sets it up: the side on 21-32 moves first
+STANDARD_START_FEN = "B:W21-32:B1-12"  # the usual English draughts opening: Black, on 1-12, moves first
+
+
+"""Parse one side's piece list, e.g. "K3,9-11"; returns (pieces, kings) masks"""
+def _parse_pieces(text):
+    pieces = 0
+    kings = 0
+    for token in text.split(','):
+        token = token.strip()
+        if not token:
+            continue
+        king = token[0].upper() == 'K'
+        if king:
+            token = token[1:]
+        if '-' in token:
+            first, last = (int(number) for number in token.split('-'))
+        else:
+            first = last = int(token)
+        for number in range(first, last + 1):
+            if not 1 <= number <= 32:
+                raise ValueError(f"square {number} is off the board")
+            pieces |= 1 << (number - 1)
+            if king:
+                kings |= 1 << (number - 1)
+    return pieces, kings
+
+'''
+    parse_fen() Function:
+        Returns (white, red, kings, white_to_move) masks for a FEN string
+        Raises ValueError for anything it cannot read
+'''
+def parse_fen(fen):
+    fields = fen.strip().strip('"').split(':')
+    if not fields or fields[0].upper() not in ('W', 'B'):
+        raise ValueError(f"bad FEN side to move: {fen!r}")
+    white = red = kings = 0
+    for field in fields[1:]:
+        if not field:
+            continue
+        color, pieces_text = field[0].upper(), field[1:]
+        pieces, side_kings = _parse_pieces(pieces_text)
+        if color == 'W':
+            white |= pieces
+        elif color == 'B':
+            red |= pieces
+        else:
+            raise ValueError(f"bad FEN colour {field[0]!r} in {fen!r}")
+        kings |= side_kings
+    if white & red:
+        raise ValueError(f"square occupied twice in {fen!r}")
+    return white, red, kings, fields[0].upper() == 'W'
+
+"""One side's piece list in FEN form, kings prefixed with K"""
+def _format_pieces(pieces, kings):
+    return ','.join(('K' if kings >> sq & 1 else '') + str(sq + 1) for sq in iter_squares(pieces))
+
+"""FEN string for a position given as masks"""
+def format_fen(white, red, kings, white_to_move):
+    return f"{'W' if white_to_move else 'B'}:W{_format_pieces(white, kings)}:B{_format_pieces(red, kings)}"
@@ -0,0 +1,1021 @@
+'''
+Program 3
+- Brian Chu
+    bbch223@uky.edu
+- Clark Conrad
+    caco375@uky.edu
+'''
+import pygame
+
+from .book import OpeningBook
+from .engine import Engine
+from .pdn import append_game, record_game
+from .profiler import profiler
+from .worker import SearchWorker
+from .rules import Checker, GameState, create_board, set_checkers
+from .tablebase import Tablebase
+from .variants import ENGLISH, VARIANTS
+from .trace import DEBUG, tracer
+from .textcache import TextCache
+from pygame.locals import (
+    MOUSEBUTTONDOWN,
+    MOUSEMOTION,
+    K_DOWN,
+    K_ESCAPE,
+    K_F3,
+    K_F4,
+    K_KP_ENTER,
+    K_RETURN,
+    K_SPACE,
+    K_UP,
+    K_u,
+    K_y,
+    K_z,
+    KEYDOWN,
+    QUIT,
+)
+
+
+# ----- Pygame Initializations ----- #
+# pygame itself is only started by main(), so importing this module stays cheap
+SCREEN_WIDTH = 1280
+SCREEN_HEIGHT = 720
+screen = None
+renderer = None
+clock = None
+running = True
+selected_piece = None
+turn = 'white'
+# Every piece of text is laid out and rendered once, then reused from here
+text_cache = TextCache()
+# GameState's 'white' pieces are drawn red (see draw_checker), so name sides by what the player sees
+SIDE_NAMES = {'white': 'Red', 'red': 'White'}
+COLOR_SIDES = {'red': 'white', 'white': 'red'}
+# The scene the main loop is running (see PlayingScene, GameOverScene and MenuScene)
+scene = None
+# GameState sides played by the computer, and the background worker that searches for them
+computer_sides = set()
+search_worker = None
+search_job = None
+# PDN file that finished games are appended to (None: games are not recorded)
+record_path = None
+# Rules and board size of every game (see pycheckers.variants)
+game_variant = ENGLISH
+# Where F4 (and quitting, when profiling was asked for on the command line) writes the frame timings
+profile_path = 'pycheckers-profile.csv'
+# pygame event types posted by the search thread (created in main)
+SEARCH_PROGRESS = None
+SEARCH_DONE = None
+
+
+# ----- Setup Menu Graphical Components ----- #
+'''
+    Button Class:
+        Parameterize button size, text, and color
+        Add hover effect
+        Add callback function for button click
+'''
+class Button:
+    def __init__(self, x, y, width, height, text, callback):
+        self.text = text
+        self.callback = callback    # set callback function
+        self.place(pygame.Rect(x, y, width, height))
+        self.color = (50, 150, 50)
+        self.hover_color = (100, 200, 100)
+        self.text_color = (255, 255, 255)
+
+    def draw(self, surface):
+        # Change the color if mouse hovers over button
+        mouse_pos = pygame.mouse.get_pos()
+        current_color = self.color
+        if self.rect.collidepoint(mouse_pos):
+            current_color = self.hover_color
+        # Draw the button and text
+        pygame.draw.rect(surface, current_color, self.rect)
+        text_surface = text_cache.render(self.font, self.text, self.text_color)
+        text_rect = text_surface.get_rect(center=self.rect.center)
+        surface.blit(text_surface, text_rect)
+
+    """Move and resize the button; the label is sized to the button (36 for the default height of 50)"""
+    def place(self, rect):
+        self.rect = pygame.Rect(rect)
+        self.font = sized_font(self.rect.height * 36 // 50)
+
+    # When button gets pressed by mouse, perform function
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if self.rect.collidepoint(event.pos):
+                self.callback()
+
+'''
+    draw_instructions() Function:
+        Draws the instructions on the screen
+        Wrapped lines come from the text cache, so each text is only laid out once
+        Lines that would reach past bottom (when given) are left out
+'''
+def draw_instructions(surface, instructions, font, color, x, y, max_width, line_spacing=5, bottom=None):
+    # Wrap each instruction text to fit within the max width
+    for text in instructions:
+        # Draw each line of wrapped text
+        for text_surface in text_cache.lines(font, text, color, max_width):
+            if bottom is not None and y + text_surface.get_height() > bottom:
+                return
+            surface.blit(text_surface, (x, y))
+            y += text_surface.get_height() + line_spacing
+
+"""Height draw_instructions() needs for the same texts"""
+def instructions_height(instructions, font, max_width, line_spacing=5):
+    lines = [line for text in instructions for line in text_cache.lines(font, text, (0, 0, 0), max_width)]
+    return sum(line.get_height() for line in lines) + line_spacing * max(len(lines) - 1, 0)
+
+# Fonts by size, so layouts that come back to a size reuse the font (and its cached text)
+fonts = {}
+
+def sized_font(size):
+    font = fonts.get(size)
+    if font is None:
+        font = fonts[size] = pygame.font.Font(None, size)
+    return font
+
+'''
+    wait_for_events() Function:
+        Blocks until at least one event arrives or timeout_ms passes, then drains the queue
+        timeout_ms=None sleeps until the next event, so an idle window uses no CPU
+'''
+def wait_for_events(timeout_ms=None):
+    if timeout_ms is None:
+        first = pygame.event.wait()
+    else:
+        first = pygame.event.wait(max(1, int(timeout_ms)))
+    events = [] if first.type == pygame.NOEVENT else [first]
+    events.extend(pygame.event.get())
+    return events
+
+# ----- Board and Checker Drawing ----- #
+'''
+    draw_tile() Function:
+        Draws a single board square
+        White tiles are drawn white, the playable dark tiles black
+'''
+def draw_tile(surface, tile):
+    if tile.is_white:
+        color = (255, 255, 255)
+    else:
+        color = (0, 0, 0)
+    pygame.draw.rect(surface, color, (tile.x_start, tile.y_start, tile.width_height, tile.width_height))
+
+'''
+    draw_checker() Function:
+        Draws a checker piece at its pixel position
+        Kings get a gold border
+'''
+def draw_checker(surface, checker):
+    # THIS IS MESSED UP. But if I fix it, idk what it will break so we'll just leave it...
+    if checker.is_white:
+        color = (255, 0, 0)  
+    else:
+        color = (255, 255,255)
+
+    # Add a border to the king piece
+    if checker.king:
+        border_color = (255, 223, 0)
+        border_thickness = max(2, checker.radius // 10)  # 3 at the default tile size
+        # Draw the border circle first
+        pygame.draw.circle(surface, border_color, (checker.x_pos, checker.y_pos), checker.radius + border_thickness, 0)
+
+    pygame.draw.circle(surface, color, (checker.x_pos, checker.y_pos), checker.radius, 0)
+
+
+
+# ----- Cached Rendering ----- #
+PANEL_COLOR = (200, 200, 200)
+SELECTED_COLOR = (255, 255, 0)
+MOVE_COLOR = (0, 255, 0)
+FLASH_COLORS = ((255, 0, 0), (255, 255, 0))
+FLASH_PERIOD = 500 # ms between mandatory-capture flash colour changes
+padding = 10
+
+'''
+    build_static_layer() Function:
+        Pre-renders everything that never changes during a game
+        Background, board tiles, both panel backgrounds and the instructions text
+'''
+def build_static_layer():
+    layer = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+    layer.fill((128, 128, 128))
+
+    # Tiles are the same for every game, so build a throwaway board just to draw them
+    for row in create_board(board_x, board_y, tile_size, game_variant.size):
+        for tile in row:
+            draw_tile(layer, tile)
+
+    # Left-side panel with instructions
+    pygame.draw.rect(layer, PANEL_COLOR, panel_rect)
+    draw_instructions(layer, instructions, instruction_font, (0,0,0), panel_x + padding, panel_y + padding,
+                      PANEL_WIDTH - (2 * padding), instruction_spacing, button_rect.top - padding)
+
+    # Right-side panel background; the status text is drawn per frame
+    pygame.draw.rect(layer, PANEL_COLOR, right_panel_rect)
+    return layer
+
+"""Piece radius for a tile size (30 at the default 80)"""
+def piece_radius(size):
+    return size * 3 // 8
+
+'''
+    SpriteAtlas Class:
+        Every piece and highlight sprite at one tile size, rendered once into a single converted surface
+        Keys are ('piece', is_white, king) and ('outline', colour); blit() copies one sprite out
+        Built again only when the tile size changes, so a frame costs the same blits at any board size
+'''
+class SpriteAtlas:
+    def __init__(self, size):
+        self.size = size
+        keys = [('piece', is_white, king) for is_white in (True, False) for king in (False, True)]
+        keys += [('outline', color) for color in dict.fromkeys((SELECTED_COLOR, MOVE_COLOR) + FLASH_COLORS)]
+        sheet = pygame.Surface((size * len(keys), size), pygame.SRCALPHA)
+        self.rects = {}
+        for i, key in enumerate(keys):
+            rect = pygame.Rect(i * size, 0, size, size)
+            self.rects[key] = rect
+            if key[0] == 'piece':
+                draw_checker(sheet, Checker(rect.centerx, rect.centery, piece_radius(size), key[2], key[1]))
+            else:
+                pygame.draw.rect(sheet, key[1], rect, max(2, size // 26))
+        self.surface = sheet.convert_alpha()
+
+    def blit(self, surface, key, topleft):
+        surface.blit(self.surface, topleft, self.rects[key])
+
+'''
+    Renderer Class:
+        Draws the game on top of the cached static layer
+        Remembers what each dark square, the button and the status panel last showed
+        Only areas whose contents changed are redrawn and passed to display.update
+'''
+class Renderer:
+    def __init__(self, surface):
+        self.surface = surface
+        self.static_layer = build_static_layer()
+        self.atlas = SpriteAtlas(tile_size)
+        self.invalidate()
+
+    """The window changed size: rebuild the static layer, and the sprites if the tiles changed size"""
+    def resize(self, surface):
+        self.surface = surface
+        self.static_layer = build_static_layer()
+        if self.atlas.size != tile_size:
+            self.atlas = SpriteAtlas(tile_size)
+        self.invalidate()
+
+    """Forget everything on screen so the next draw() repaints the whole window"""
+    def invalidate(self):
+        self.full_redraw = True
+        self.square_keys = {}
+        self.button_key = None
+        self.status_key = None
+        self.hud_shown = False
+
+    """Returns the outline colour for each highlighted square, keyed by (row, col)"""
+    def highlights(self, game_state):
+        colors = {}
+        # Draw highlights for selected pieces
+        if game_state.selected_piece:
+            colors[tuple(game_state.selected_piece)] = (SELECTED_COLOR,)
+        if game_state.valid_moves:
+            if game_state.must_capture:
+                # Toggle flash every 500ms to signal mandatory capture
+                move_color = FLASH_COLORS[(pygame.time.get_ticks() // FLASH_PERIOD) % 2]
+            else: # No mandatory move
+                move_color = MOVE_COLOR
+            for move in game_state.valid_moves:
+                colors[tuple(move)] = colors.get(tuple(move), ()) + (move_color,)
+        return colors
+
+    """Restore a rectangle from the static layer before drawing over it"""
+    def restore(self, rect):
+        self.surface.blit(self.static_layer, rect, rect)
+
+    '''
+        draw() Method:
+            Brings the screen up to date and returns the rects that changed
+            overlay is the current scene; it repaints its box when the box changed or was drawn over
+    '''
+    def draw(self, game_state, button, overlay=None):
+        dirty = []
+        if self.full_redraw:
+            self.surface.blit(self.static_layer, (0, 0))
+            dirty.append(self.surface.get_rect())
+            self.full_redraw = False
+
+        # Board squares: a square is redrawn when its piece or highlight changes
+        highlights = self.highlights(game_state)
+        for sq, (row, col) in enumerate(game_state.variant.square_to_coord):
+            checker = game_state.pieces.get(sq)
+            outlines = highlights.get((row, col), ())
+            key = (checker.is_white, checker.king, outlines) if checker else (None, None, outlines)
+            if self.square_keys.get(sq) == key:
+                continue
+            self.square_keys[sq] = key
+            tile = game_state.board[row][col]
+            rect = pygame.Rect(tile.x_start, tile.y_start, tile.width_height, tile.width_height)
+            self.restore(rect)
+            if checker:
+                self.atlas.blit(self.surface, ('piece', checker.is_white, checker.king), rect.topleft)
+            for color in outlines:
+                self.atlas.blit(self.surface, ('outline', color), rect.topleft)
+            dirty.append(rect)
+        profiler.lap('board')
+
+        # Reset button only changes with hover
+        button_key = button.rect.collidepoint(pygame.mouse.get_pos())
+        if button_key != self.button_key:
+            self.button_key = button_key
+            self.restore(button.rect)
+            button.draw(self.surface)
+            dirty.append(button.rect)
+        profiler.lap('button')
+
+        # Right-side status panel
+        thinking = thinking_status()
+        status_key = (game_state.moves_since_last_capture, game_state.must_capture, thinking)
+        if status_key != self.status_key:
+            self.status_key = status_key
+            self.restore(right_panel_rect)
+            move_status = f"Moves since last capture: {game_state.moves_since_last_capture}"
+            if game_state.must_capture:
+                capture_status = ["Mandatory Capture Available!", "MUST CAPTURE"]
+            else:
+                capture_status = [] # get rid of the message if no mandatory capture
+            draw_instructions(self.surface, capture_status, status_font, (255,0,0), right_panel_x + padding, right_panel_y + 40, RIGHT_PANEL_WIDTH - (2 * padding))
+            # Draw moves status text
+            moves_text_surface = text_cache.render(status_font, move_status, (0, 0, 0))
+            self.surface.blit(moves_text_surface, (right_panel_x + padding, right_panel_y + padding))
+            if thinking:
+                thinking_surface = text_cache.render(status_font, thinking, (0, 0, 0))
+                self.surface.blit(thinking_surface, (right_panel_x + padding, right_panel_y + 112))
+            dirty.append(right_panel_rect)
+        profiler.lap('status')
+
+        # Profiling HUD, redrawn every frame while it is on and cleared once when it goes off
+        if profiler.enabled and hud_visible:
+            self.draw_hud()
+            dirty.append(hud_rect)
+            self.hud_shown = True
+        elif self.hud_shown:
+            self.restore(hud_rect)
+            dirty.append(hud_rect)
+            self.hud_shown = False
+        profiler.lap('hud')
+
+        if overlay is not None:
+            overlay_rect = overlay.draw(self.surface, dirty)
+            if overlay_rect is not None:
+                dirty.append(overlay_rect)
+            profiler.lap('overlay')
+
+        if dirty:
+            pygame.display.update(dirty)
+        profiler.lap('update')
+        return dirty
+
+    '''
+        draw_hud() Method:
+            Frame time statistics, the slowest stage, rules calls per frame and the last search speed
+            The numbers change every frame, so the lines are rendered directly instead of through text_cache
+    '''
+    def draw_hud(self):
+        summary = profiler.summary()
+        lines = [f"Frame {summary['mean']:.2f} ms  p50 {summary['p50']:.2f}  p99 {summary['p99']:.2f}",
+                 f"Slowest stage: {summary['slowest'] or '-'}"]
+        for name, stage in summary['stages'].items():
+            lines.append(f"  {name:<8} {stage['mean']:.3f} ms  p99 {stage['p99']:.3f}")
+        calls = summary['calls_per_frame']
+        lines.append(f"Rules calls/frame: {sum(calls.values()):.1f}")
+        lines.extend(f"  {name} {number:.2f}" for name, number in sorted(calls.items(), key=lambda item: -item[1])[:3])
+        if profiler.search:
+            lines.append(f"Search: depth {profiler.search[0]}, {profiler.search[1] / 1000:.0f}k nodes/s")
+        lines.append("F3 hides, F4 exports")
+
+        pygame.draw.rect(self.surface, HUD_COLOR, hud_rect)
+        y = hud_rect.y + 6
+        for line in lines:
+            if y + HUD_LINE_HEIGHT > hud_rect.bottom:
+                break
+            self.surface.blit(hud_font.render(line, True, (255, 255, 255)), (hud_rect.x + 6, y))
+            y += HUD_LINE_HEIGHT
+
+'''
+    next_frame_delay() Function:
+        Milliseconds until the screen changes without any input, or None if it never will
+        Only the mandatory-capture flash animates on its own; the search thread wakes the loop with events
+'''
+def next_frame_delay(game_state):
+    if game_state.valid_moves and game_state.must_capture:
+        return FLASH_PERIOD - pygame.time.get_ticks() % FLASH_PERIOD
+    return None
+
+
+'''
+    reset_game() Function:
+        Initialize game board
+        Used when reset button is clicked
+'''
+def reset_game():
+    global board, game_state, search_job
+    # Whatever the computer was thinking about belongs to the old game
+    if search_worker is not None:
+        search_worker.cancel()
+    search_job = None
+    board = create_board(board_x, board_y, tile_size, game_variant.size)
+    set_checkers(board, tile_size, game_variant.rows)
+    game_state = GameState(board, variant=game_variant)
+    profiler.watch(game_state)
+    switch_scene(PlayingScene())
+    tracer.info('reset')
+
+
+# ----- Initialize Game State ----- #
+# Initialization of panel dimensions for menu
+PANEL_WIDTH = 300
+panel_x = 50
+panel_y = 50
+# Create board sligtly to the right of the instruction panel
+board_x = panel_x + PANEL_WIDTH + 20
+# Smallest window: the panels side by side, and a board with room for a line of status text
+# Windows shorter than the default get smaller margins, a smaller button and smaller instructions text
+MIN_SCREEN_WIDTH = 900
+MIN_SCREEN_HEIGHT = 400
+DEFAULT_HEIGHT = 720
+INSTRUCTION_FONT_SIZES = range(24, 13, -1)  # largest first
+
+'''
+    rules_instructions() Function:
+        Instructions text for the panel, following the rules the variant actually enforces:
+        board size, backward captures by men, the longest-capture rule, flying kings and the draw count
+'''
+def rules_instructions(variant):
+    instructions = [
+        "Instructions:",
+        f"- {variant.size}x{variant.size} board. Red moves first.",
+        "- Click a piece to select it. Valid moves are highlighted green.",
+        "- Click a highlighted square to move.",
+        "- Pieces move diagonally forward to the next empty dark square.",
+    ]
+    if variant.men_capture_backward:
+        instructions.append("- Jump over an opponent's piece diagonally, forward or back, to capture it.")
+    else:
+        instructions.append("- Jump over an opponent's piece diagonally to capture it.")
+    instructions.append("- Multiple jumps in one turn are possible if available.")
+    if variant.max_capture:
+        instructions.append("- Captures are mandatory, and you must take the most pieces you can!")
+    else:
+        instructions.append("- Captures are mandatory! If a jump exists, that is the only move you can make.")
+    instructions.append("- Reach the opponent's back row to promote a piece to a King.")
+    if variant.flying_kings:
+        instructions.append("- Kings fly: they move and capture any distance diagonally, forward AND backward.")
+    else:
+        instructions.append("- Kings can move diagonally forward AND backward.")
+    instructions += [
+        "- Win when the opponent has no pieces left or cannot move.",
+        f"- A draw occurs if neither player makes a capture after {variant.draw_plies} moves.",
+        "- U undoes a move, Y redoes it, Esc opens the menu.",
+    ]
+    return instructions
+
+# Instructions text in panel
+instructions = rules_instructions(game_variant)
+
+# Right panel initializations
+RIGHT_PANEL_WIDTH = 240
+RIGHT_PANEL_HEIGHT = 140
+right_panel_y = panel_y
+
+# Profiling HUD (F3), under the right panel
+HUD_COLOR = (30, 30, 30)
+HUD_LINE_HEIGHT = 17
+hud_visible = False
+
+'''
+    layout() Function:
+        Sizes and places everything for a window of width x height
+        The side panels keep their width; the board gets the tile size that fits between them
+        (80 for the 8x8 board in the default 1280x720 window)
+        Below the default height the margins and the New Game button shrink with the window,
+        and the instructions get the largest font that fits above the button (see fit_instructions)
+'''
+def layout(width, height):
+    global SCREEN_WIDTH, SCREEN_HEIGHT, panel_y, panel_rect, button_rect, tile_size, board_width, board_height
+    global board_y, right_panel_x, right_panel_y, right_panel_rect, hud_rect
+    SCREEN_WIDTH, SCREEN_HEIGHT = width, height
+    scale = min(1.0, height / DEFAULT_HEIGHT)
+    panel_y = right_panel_y = round(50 * scale)
+    panel_rect = pygame.Rect(panel_x, panel_y, PANEL_WIDTH, SCREEN_HEIGHT - 2 * panel_y)
+    button_rect = pygame.Rect(0, 0, round(200 * scale), round(50 * scale))
+    button_rect.midbottom = (panel_rect.centerx, panel_rect.bottom - round(20 * scale))
+    size = game_variant.size
+    tile_size = min((width - board_x - RIGHT_PANEL_WIDTH - 30) // size, (height - round(80 * scale)) // size)
+    board_width = size * tile_size
+    board_height = size * tile_size
+    board_y = (SCREEN_HEIGHT - board_height) // 2
+    right_panel_x = board_x + board_width + 20
+    right_panel_rect = pygame.Rect(right_panel_x, right_panel_y, RIGHT_PANEL_WIDTH, RIGHT_PANEL_HEIGHT)
+    hud_top = right_panel_y + RIGHT_PANEL_HEIGHT + 20
+    hud_rect = pygame.Rect(right_panel_x, hud_top, RIGHT_PANEL_WIDTH, max(0, min(260, height - panel_y - hud_top)))
+    if pygame.font.get_init():
+        fit_instructions()
+
+'''
+    fit_instructions() Function:
+        Picks the instructions font (and line spacing) for the current layout:
+        the largest size whose wrapped text fits between the top of the panel and the New Game button
+        At the smallest size the text may still not fit a minimum-height window; the lines past the button are left out
+'''
+def fit_instructions():
+    global instruction_font, instruction_spacing
+    room = button_rect.top - panel_rect.top - 2 * padding
+    for size in INSTRUCTION_FONT_SIZES:
+        instruction_font = sized_font(size)
+        instruction_spacing = round(size * 5 / 24)  # 5 at the default size
+        height = instructions_height(instructions, instruction_font, PANEL_WIDTH - 2 * padding, instruction_spacing)
+        if height <= room:
+            break
+
+layout(SCREEN_WIDTH, SCREEN_HEIGHT)
+
+"""Move the Tiles and Checkers of a board to the current layout (they carry pixel positions for rendering)"""
+def place_board(board):
+    for row_i, row in enumerate(board):
+        for col_i, tile in enumerate(row):
+            tile.x_start = board_x + col_i * tile_size
+            tile.y_start = board_y + row_i * tile_size
+            tile.width_height = tile_size
+            if tile.hasChecker:
+                tile.hasChecker.x_pos = tile.x_start + tile_size // 2
+                tile.hasChecker.y_pos = tile.y_start + tile_size // 2
+                tile.hasChecker.radius = piece_radius(tile_size)
+
+'''
+    resize_window() Function:
+        Handles a window resize: new layout, the board and button moved onto it,
+        the renderer's cached layers rebuilt and any overlay re-centred
+        Windows smaller than the minimum are grown back to it
+'''
+def resize_window(width, height):
+    global screen
+    width, height = max(width, MIN_SCREEN_WIDTH), max(height, MIN_SCREEN_HEIGHT)
+    layout(width, height)
+    if screen.get_size() != (width, height):
+        screen = pygame.display.set_mode((width, height), pygame.RESIZABLE)
+    place_board(game_state.board)
+    new_game_button.place(button_rect)
+    renderer.resize(screen)
+    scene.invalidate()
+
+'''
+    start_computer_turn() Function:
+        Starts a background search for the side to move
+        Progress and the finished result come back to the main loop as pygame events
+'''
+def start_computer_turn():
+    global search_job
+    search_job = search_worker.submit(
+        game_state,
+        on_progress=lambda job, result: pygame.event.post(pygame.event.Event(SEARCH_PROGRESS, job=job)),
+        on_done=lambda job: pygame.event.post(pygame.event.Event(SEARCH_DONE, job=job)))
+
+'''
+    finish_computer_turn() Function:
+        Plays the move from a finished search, unless the search was cancelled or belongs to an old game
+        Returns the game over status after the move
+'''
+def finish_computer_turn(job):
+    global search_job
+    if job is not search_job or job.result is None:
+        return None
+    search_job = None
+    result = job.result
+    profiler.note_search(result)
+    tracer.info('search', side=game_state.turn, move=result.move.notation(), score=result.score, depth=result.depth,
+                nodes=result.nodes, seconds=round(result.elapsed, 4), book=result.book)
+    game_state.play_turn(result.move)
+    return game_state.check_game_over()
+
+'''
+    undo_turn() / redo_turn() Functions:
+        Take back or replay turns through GameState's undo stack
+        Against the computer they keep going until it is the player's turn again
+        Any search in progress is cancelled, since it was for a position that is gone
+'''
+def undo_turn():
+    global search_job
+    search_worker.cancel()
+    search_job = None
+    if not game_state.unmake_move():
+        return
+    while game_state.turn in computer_sides and len(computer_sides) < 2 and game_state.unmake_move():
+        pass
+    tracer.info('undo', turn=game_state.turn, turns=len(game_state.undo_stack))
+
+def redo_turn():
+    global search_job
+    search_worker.cancel()
+    search_job = None
+    if not game_state.redo_move():
+        return
+    while game_state.turn in computer_sides and len(computer_sides) < 2 and game_state.redo_move():
+        pass
+    tracer.info('redo', turn=game_state.turn, turns=len(game_state.undo_stack))
+
+"""Status line shown while the computer is thinking, or '' when it is not"""
+def thinking_status():
+    if search_job is None:
+        return ''
+    progress = search_job.progress
+    if progress is None:
+        return 'Computer is thinking...'
+    return f"Thinking: depth {progress.depth}, best {progress.move.notation()}"
+
+
+"""Append the finished game to record_path, naming each side (as drawn) by who played it"""
+def save_game():
+    players = {side: 'computer' if side in computer_sides else 'human' for side in SIDE_NAMES}
+    game = record_game(game_state, Event='pycheckers', White=f"{players['white']} (red pieces)",
+                       Black=f"{players['red']} (white pieces)")
+    append_game(record_path, game)
+    tracer.info('recorded', path=record_path, turns=len(game.moves))
+
+
+'''
+    handle_board_click() Function:
+        Selects a piece or moves the selected one for a click at pixel pos
+        Returns the game over status when the click finished a turn that ended the game
+'''
+def handle_board_click(pos):
+    # Convert to board coordinates
+    col = (pos[0] - board_x) // tile_size
+    row = (pos[1] - board_y) // tile_size
+
+    if not (0 <= row < game_variant.size and 0 <= col < game_variant.size):
+        # Clicked outside board
+        game_state.selected_piece = None
+        game_state.valid_moves = []
+        return None
+
+    # Clicks are traced at DEBUG level (python -m pycheckers --trace debug --trace-echo) #
+    # If a capture is found, only allow clicking the forced piece or its valid capture moves
+    if game_state.must_capture and (row, col) != game_state.selected_piece:
+         if game_state.selected_piece and (row, col) not in game_state.valid_moves:
+              tracer.debug('click_ignored', reason='capture sequence unfinished')
+              return None # Ignore clicks elsewhere during multi-capture
+
+    tile = game_state.board[row][col]
+
+    # Check if any piece for this turn has a mandatory capture available
+    if tile.hasChecker and tile.hasChecker.is_white == (game_state.turn == 'white'):
+        # check for a mandatory capture available on the board
+        if game_state.must_capture:
+            # Selected piece is or isn't able to capture (flying kings capture from further than 2 rows away)
+            if any(move.start == game_state.variant.coord_to_square[(row, col)] for move in game_state.legal_turns()):
+                game_state.selected_piece = (row, col)
+                game_state.valid_moves = game_state.legal_moves((row, col))
+                tracer.debug('select', row=row, col=col, capture=True)
+            else:
+                tracer.debug('click_ignored', reason='a capture is mandatory elsewhere')
+        # No mandatory captures; normal behavior
+        else:
+            game_state.selected_piece = (row, col)
+            game_state.valid_moves = game_state.legal_moves((row, col))
+            tracer.debug('select', row=row, col=col, capture=False)
+        return None
+
+    # Piece has already been selected
+    if game_state.selected_piece:
+        if (row, col) in game_state.valid_moves:
+            turn_complete = game_state.move_piece(game_state.selected_piece, (row, col))
+
+            if turn_complete:
+                # Turn potentially ends, check game over
+                game_state.end_turn()
+                return game_state.check_game_over()
+        elif tracer.level <= DEBUG:
+            # Invalid move clicked
+            tracer.emit(DEBUG, 'invalid_move', start=game_state.selected_piece, end=(row, col),
+                        valid=game_state.valid_moves)
+    return None
+
+"""The smallest of the given delays in ms, ignoring None; None if there are none"""
+def earliest(*delays):
+    delays = [delay for delay in delays if delay is not None]
+    return min(delays) if delays else None
+
+"""Make new_scene the one the main loop runs; the old scene's box is painted over on the next frame"""
+def switch_scene(new_scene):
+    global scene
+    scene = new_scene
+    if renderer is not None:
+        renderer.invalidate()
+
+"""The game just ended: record it if asked to and show the result"""
+def finish_game(game_over_status):
+    if record_path:
+        save_game()
+    switch_scene(GameOverScene(game_over_status))
+
+def quit_game():
+    global running
+    running = False
+
+
+# ----- Scenes ----- #
+'''
+    Scene Classes:
+        The main loop runs one scene at a time and none of them ever blocks
+        handle_event() gets every event the loop does not handle itself (quit, expose, F3/F4, search results)
+        update() runs once per frame for timers, next_wake() is the ms until the scene changes
+        on its own (None: never), and draw() paints the scene over the game, returning the rect it changed
+        engine_runs says whether the computer may start thinking while the scene is up
+'''
+class PlayingScene:
+    engine_runs = True
+
+    def handle_event(self, event):
+        new_game_button.handle_event(event)
+        if event.type == KEYDOWN and event.key == K_ESCAPE:
+            switch_scene(MenuScene())
+        # Takeback keys: U or Z (so Ctrl+Z too) undoes, Y (Ctrl+Y) redoes
+        elif event.type == KEYDOWN and event.key in (K_u, K_z):
+            undo_turn()
+        elif event.type == KEYDOWN and event.key == K_y:
+            redo_turn()
+        elif event.type == MOUSEBUTTONDOWN and game_state.turn not in computer_sides:
+            game_over_status = handle_board_click(event.pos)
+            if game_over_status:
+                finish_game(game_over_status)
+
+    def update(self):
+        pass
+
+    def next_wake(self):
+        return None
+
+    def invalidate(self):
+        pass
+
+    def draw(self, surface, dirty):
+        return None
+
+'''
+    OverlayScene Class:
+        Base for scenes shown as a box in the middle of the window, over the game
+        The box is only painted when key() changes or the renderer drew over part of it
+'''
+class OverlayScene(PlayingScene):
+    BOX_COLOR = (50, 50, 150)
+    TEXT_COLOR = (255, 255, 255)
+
+    def __init__(self, width, height):
+        self.box_rect = pygame.Rect(0, 0, width, height)
+        self.invalidate()
+
+    """Centre the box in the window"""
+    def place(self):
+        self.box_rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+
+    """Paint the box on the next frame, wherever the window now puts it"""
+    def invalidate(self):
+        self.place()
+        self.shown_key = None
+
+    """Whatever the box shows; a new value means the box needs painting"""
+    def key(self):
+        return None
+
+    def draw(self, surface, dirty):
+        key = self.key()
+        if key == self.shown_key and self.box_rect.collidelist(dirty) < 0:
+            return None
+        self.shown_key = key
+        pygame.draw.rect(surface, self.BOX_COLOR, self.box_rect, border_radius=15)
+        pygame.draw.rect(surface, self.TEXT_COLOR, self.box_rect, width=2, border_radius=15)
+        self.paint(surface)
+        return self.box_rect
+
+    """Draw the box contents (the box itself is already there)"""
+    def paint(self, surface):
+        pass
+
+'''
+    GameOverScene Class:
+        Shows the result and counts down 5 seconds before starting a new game
+        Enter, Space or a click starts the new game straight away; Escape quits
+        The countdown is a deadline checked each frame, and the loop sleeps until the next second ticks over
+'''
+class GameOverScene(OverlayScene):
+    engine_runs = False
+    DURATION = 5000  # ms
+
+    def __init__(self, game_over_status):
+        super().__init__(400, 200)
+        if game_over_status == 'draw':
+            self.message = "It's a Draw!"
+        elif game_over_status in ['white', 'red']:
+            self.message = f"{SIDE_NAMES[game_over_status]} Wins!"
+        else: # Should not happen, but just in case
+            self.message = "Game Over!"
+        self.deadline = pygame.time.get_ticks() + self.DURATION
+
+    def remaining_ms(self):
+        return max(0, self.deadline - pygame.time.get_ticks())
+
+    def handle_event(self, event):
+        new_game_button.handle_event(event)
+        if event.type == KEYDOWN and event.key == K_ESCAPE:
+            quit_game()
+        elif (event.type == KEYDOWN and event.key in (K_RETURN, K_KP_ENTER, K_SPACE)
+              or event.type == MOUSEBUTTONDOWN and self.box_rect.collidepoint(event.pos)):
+            reset_game()
+
+    def update(self):
+        if not self.remaining_ms():
+            reset_game()
+
+    def next_wake(self):
+        return self.remaining_ms() % 1000 or 1000
+
+    def key(self):
+        return (self.remaining_ms() + 999) // 1000
+
+    def paint(self, surface):
+        box_rect = self.box_rect
+        win_text_surface = text_cache.render(win_font_large, self.message, self.TEXT_COLOR)
+        surface.blit(win_text_surface, win_text_surface.get_rect(center=(box_rect.centerx, box_rect.centery - 30)))
+        countdown_surface = text_cache.render(win_font_small, f"Resetting in {self.key()} seconds...", self.TEXT_COLOR)
+        surface.blit(countdown_surface, countdown_surface.get_rect(center=(box_rect.centerx, box_rect.centery + 40)))
+
+'''
+    MenuScene Class:
+        Escape menu over the game: Resume, New Game, Quit
+        Arrow keys and Enter or the mouse pick an item; Escape resumes
+        The game carries on underneath, so a computer player keeps thinking and moving
+'''
+class MenuScene(OverlayScene):
+    ITEM_HEIGHT = 50
+
+    def __init__(self):
+        self.items = (("Resume", lambda: switch_scene(PlayingScene())), ("New Game", reset_game), ("Quit", quit_game))
+        self.selected = 0
+        super().__init__(320, 80 + 3 * self.ITEM_HEIGHT)
+
+    def place(self):
+        super().place()
+        self.item_rects = [pygame.Rect(self.box_rect.x + 30, self.box_rect.y + 60 + i * self.ITEM_HEIGHT,
+                                       self.box_rect.width - 60, self.ITEM_HEIGHT - 8) for i in range(len(self.items))]
+
+    def handle_event(self, event):
+        if event.type == KEYDOWN and event.key == K_ESCAPE:
+            switch_scene(PlayingScene())
+        elif event.type == KEYDOWN and event.key in (K_UP, K_DOWN):
+            self.selected = (self.selected + (1 if event.key == K_DOWN else -1)) % len(self.items)
+        elif event.type == KEYDOWN and event.key in (K_RETURN, K_KP_ENTER, K_SPACE):
+            self.items[self.selected][1]()
+        elif event.type in (MOUSEMOTION, MOUSEBUTTONDOWN):
+            hovered = pygame.Rect(event.pos, (1, 1)).collidelist(self.item_rects)
+            if hovered >= 0:
+                self.selected = hovered
+                if event.type == MOUSEBUTTONDOWN:
+                    self.items[hovered][1]()
+            elif event.type == MOUSEBUTTONDOWN:
+                new_game_button.handle_event(event)
+
+    def key(self):
+        return self.selected
+
+    def paint(self, surface):
+        title = text_cache.render(win_font_small, "Menu", self.TEXT_COLOR)
+        surface.blit(title, title.get_rect(center=(self.box_rect.centerx, self.box_rect.y + 30)))
+        for i, ((label, action), rect) in enumerate(zip(self.items, self.item_rects)):
+            if i == self.selected:
+                pygame.draw.rect(surface, (90, 90, 200), rect, border_radius=8)
+            text = text_cache.render(win_font_small, label, self.TEXT_COLOR)
+            surface.blit(text, text.get_rect(center=rect.center))
+
+
+# ----- Main Game Loop ----- #
+'''
+    main() Function:
+        Starts pygame, opens the window and runs the game loop
+        Entry point for `python -m pycheckers`
+        computer lists the colours (as drawn, 'red'/'white') the engine plays
+        tablebase is an optional directory of endgame tables and book an optional opening book file
+        record is an optional PDN file every finished game is appended to
+        profile turns the frame profiler on from the start and writes its timings to that file on exit
+        variant names the rules (pycheckers.variants.VARIANTS); the engine and PDN recording only play English
+'''
+def main(computer=(), think_time=1.0, tablebase=None, book=None, record=None, profile=None, variant='english'):
+    global screen, clock, running, win_font_large, win_font_small, status_font, new_game_button, renderer
+    global search_worker, SEARCH_PROGRESS, SEARCH_DONE, record_path, profile_path, hud_visible, hud_font
+    global game_variant, instructions
+
+    if variant != 'english' and (computer or record):
+        raise ValueError(f"the computer player and --record only play English draughts, not {variant}")
+    game_variant = VARIANTS[variant]
+    instructions = rules_instructions(game_variant)
+    layout(SCREEN_WIDTH, SCREEN_HEIGHT)
+
+    computer_sides.clear()
+    computer_sides.update(COLOR_SIDES[color.lower()] for color in computer)
+    search_worker = SearchWorker(Engine(time_limit=think_time, tablebase=Tablebase(tablebase) if tablebase else None,
+                                        book=OpeningBook(book) if book else None))
+    record_path = record
+    if profile:
+        profile_path = profile
+        profiler.enable()
+    SEARCH_PROGRESS = pygame.event.custom_type()
+    SEARCH_DONE = pygame.event.custom_type()
+
+    pygame.init()
+    # Resizable: the layout, the static layer and the sprite atlas follow the window size
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
+    clock = pygame.time.Clock()
+    running = True
+
+    # Font initialization for win screen
+    fonts.clear()  # fonts from an earlier pygame session cannot be used again
+    win_font_large = pygame.font.Font(None, 72)
+    win_font_small = pygame.font.Font(None, 36)
+    status_font = pygame.font.Font(None, 24)
+    hud_font = pygame.font.Font(None, 20)
+    fit_instructions()
+
+    # Initial creation of board and checkers
+    reset_game()
+
+    # Initial creation of side panel
+    new_game_button = Button(*button_rect, "New Game", reset_game)
+
+    # Pre-render the static board and panels once
+    renderer = Renderer(screen)
+    renderer.draw(game_state, new_game_button, scene)
+
+    while running:
+        # Hand the computer's turn to the search thread; the loop keeps drawing while it thinks
+        if scene.engine_runs and search_job is None and game_state.turn in computer_sides:
+            start_computer_turn()
+
+        # Sleep until input arrives, the capture flash needs its next frame or the scene's timer is due
+        # The sleep is not part of the frame
+        events = wait_for_events(earliest(next_frame_delay(game_state), scene.next_wake()))
+        profiler.begin_frame()
+        for event in events:
+            # If user quits game
+            if event.type == pygame.QUIT:
+                running = False
+
+            # The window contents were lost (e.g. uncovered), so repaint everything next frame
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                renderer.invalidate()
+                scene.invalidate()
+
+            elif event.type == pygame.VIDEORESIZE:
+                resize_window(event.w, event.h)
+
+            # F3 shows the profiling HUD (profiling while it is up), F4 writes the timings out
+            elif event.type == KEYDOWN and event.key == K_F3:
+                hud_visible = not hud_visible
+                if hud_visible:
+                    profiler.enable()
+                elif not profile:
+                    profiler.disable()
+            elif event.type == KEYDOWN and event.key == K_F4:
+                if profiler.frames:
+                    tracer.info('profile_exported', path=profile_path, frames=profiler.export(profile_path))
+
+            # The search thread finished; play its move if it still applies, whatever scene is up
+            elif event.type == SEARCH_DONE:
+                game_over_status = finish_computer_turn(event.job)
+                if game_over_status:
+                    finish_game(game_over_status)
+
+            else:
+                scene.handle_event(event)
+        # Timers (the game over countdown) run here, once per frame
+        scene.update()
+        profiler.lap('events')
+
+        # Only squares and widgets that changed since the last frame are redrawn
+        with tracer.span('frame'):
+            renderer.draw(game_state, new_game_button, scene)
+        profiler.end_frame()
+
+        # Cap the frame rate while events are streaming in (e.g. mouse motion)
+        clock.tick(60)
+
+    # on_done posts a pygame event, so the search thread has to finish before pygame shuts down
+    search_worker.shutdown()
+    pygame.quit()
+    if profile:
+        print(f"{profiler.export(profile_path)} frames of timings written to {profile_path}")
+        profiler.disable()
+    # Let the trace file catch up before the process exits
+    tracer.close()
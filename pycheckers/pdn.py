@@ -0,0 +1,366 @@
+'''
+PDN Game Records
+    Reads and writes games in Portable Draughts Notation, one game at a time
+    Readers and writers are generators over lines, so archives of any size stream through in constant memory
+    A game without a FEN tag starts from the usual English draughts opening, Black (squares 1-12) to move
+    Games played here start with the side on squares 21-32 (GameState's 'white') to move instead,
+    so every game written carries a FEN tag that says so
+    Files ending in .gz are compressed and decompressed on the fly
+    Run with `python -m pycheckers.pdn` (see --help)
+'''
+import argparse
+import gzip
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+from .bitboard import SQUARE_TO_COORD, apply_turn, generate_turns
+from .fen import STANDARD_START_FEN, format_fen, parse_fen
+from .rules import Checker, GameState, create_board
+from .zobrist import hash_move, hash_position
+
+# Result tokens and the GameState side they name: '1-0' is a win for White, the FEN's W pieces (GameState's 'white',
+# starting on 21-32), whichever side moved first
+RESULTS = {'1-0': 'white', '0-1': 'red', '1/2-1/2': 'draw', '*': None}
+RESULT_TOKENS = {'white': '1-0', 'red': '0-1', 'draw': '1/2-1/2', None: '*'}
+SEVEN_TAGS = ('Event', 'Site', 'Date', 'Round', 'White', 'Black', 'Result')
+GAME_TYPE = '21'  # English draughts
+LINE_WIDTH = 79
+
+_TAG = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+_TOKEN = re.compile(r'[{}()]|[^\s{}()]+')
+_MOVE_NUMBER = re.compile(r'^\d+\.+')
+_MOVE = re.compile(r'^\d+(?:[-x:]\d+)+')
+
+
+'''
+    PdnGame Class:
+        One game record: tags (in file order), moves in notation form ('22-17', '17x10x1') and the result token
+'''
+class PdnGame:
+    def __init__(self, tags=None, moves=None, result='*'):
+        self.tags = dict(tags or {})
+        self.moves = list(moves or [])
+        self.result = result
+
+    """Starting position; games without a FEN tag start from the usual English opening, Black to move"""
+    @property
+    def fen(self):
+        return self.tags.get('FEN', STANDARD_START_FEN)
+
+    """'white', 'red', 'draw', or None for an unfinished game"""
+    @property
+    def winner(self):
+        return RESULTS.get(self.result)
+
+
+# ----- Reading ----- #
+'''
+    read_games() Function:
+        Generator turning an iterable of lines into PdnGame objects
+        Comments { ... } (even across lines), variations ( ... ), move numbers, annotations and NAGs are skipped
+        A result token or the tags of the next game end a game
+'''
+def read_games(lines):
+    tags = {}
+    moves = []
+    in_comment = False
+    depth = 0
+    for line in lines:
+        stripped = line.strip()
+        if not in_comment and not depth and stripped.startswith('['):
+            if moves:
+                # Tags of a new game, but the last one never gave a result
+                yield PdnGame(tags, moves, tags.get('Result', '*'))
+                tags, moves = {}, []
+            match = _TAG.match(stripped)
+            if match:
+                tags[match.group(1)] = match.group(2).replace('\\"', '"')
+            continue
+
+        for token in _TOKEN.findall(stripped):
+            if in_comment:
+                in_comment = token != '}'
+            elif token == '{':
+                in_comment = True
+            elif token == '(':
+                depth += 1
+            elif token == ')':
+                depth = max(0, depth - 1)
+            elif depth:
+                continue
+            elif token in RESULTS:
+                yield PdnGame(tags, moves, token)
+                tags, moves = {}, []
+            else:
+                token = _MOVE_NUMBER.sub('', token)
+                match = _MOVE.match(token)
+                if match:
+                    moves.append(match.group(0).replace(':', 'x'))
+    if tags or moves:
+        yield PdnGame(tags, moves, tags.get('Result', '*'))
+
+"""Open a PDN file for reading ('r') or writing ('w'/'a'), compressed if the name ends in .gz"""
+def open_archive(path, mode='r'):
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8', errors='replace')
+    return open(path, mode, encoding='utf-8', errors='replace')
+
+"""Every game in a file, one at a time"""
+def iter_games(path):
+    with open_archive(path) as f:
+        yield from read_games(f)
+
+
+# ----- Writing ----- #
+"""Movetext with move numbers, wrapped to LINE_WIDTH, ending with the result"""
+def _movetext(game):
+    tokens = []
+    number = 1
+    white_to_move = parse_fen(game.fen)[3]
+    if not white_to_move and game.moves:
+        tokens.append('1...')
+    for move in game.moves:
+        # A move number stays on the same line as its move
+        if white_to_move:
+            tokens.append(f"{number}. {move}")
+        else:
+            tokens.append(move)
+            number += 1
+        white_to_move = not white_to_move
+    tokens.append(game.result)
+
+    lines = []
+    line = ''
+    for token in tokens:
+        if line and len(line) + 1 + len(token) > LINE_WIDTH:
+            lines.append(line)
+            line = token
+        else:
+            line = f"{line} {token}" if line else token
+    lines.append(line)
+    return '\n'.join(lines)
+
+'''
+    format_game() Function:
+        PDN text for one game: the seven tag roster first (with '?' for anything missing),
+        then GameType and FEN, then any other tags, then the movetext
+'''
+def format_game(game):
+    tags = dict(game.tags)
+    tags['Result'] = game.result
+    tags.setdefault('GameType', GAME_TYPE)
+    tags.setdefault('FEN', game.fen)
+    names = list(SEVEN_TAGS) + [name for name in tags if name not in SEVEN_TAGS]
+    lines = ['[{} "{}"]'.format(name, str(tags.get(name, '?')).replace('"', '\\"')) for name in names]
+    return '\n'.join(lines) + '\n\n' + _movetext(game) + '\n'
+
+"""Generator stage: writes each game to f as it passes through, then yields it on"""
+def write_games(games, f):
+    for game in games:
+        f.write(format_game(game))
+        f.write('\n')
+        yield game
+
+"""Append one game to a PDN file"""
+def append_game(path, game):
+    with open_archive(path, 'a') as f:
+        f.write(format_game(game))
+        f.write('\n')
+
+
+# ----- Replaying ----- #
+'''
+    find_move() Function:
+        Returns the Move in moves that a notation token names
+        The full path ('17x10x1') always works; the short form ('17x1') is accepted when it is unambiguous
+        Raises ValueError for an illegal or ambiguous token
+'''
+def find_move(moves, text):
+    path = tuple(int(square) - 1 for square in re.split('[-x]', text))
+    matches = []
+    for move in moves:
+        if move.path == path:
+            return move
+        if move.path[0] == path[0] and move.path[-1] == path[-1] and len(path) == 2:
+            matches.append(move)
+    if len(matches) == 1:
+        return matches[0]
+    if matches:
+        raise ValueError(f"ambiguous move {text}")
+    raise ValueError(f"illegal move {text}")
+
+"""A GameState set up from a FEN string, with Tiles and Checkers laid out like set_checkers does"""
+def game_state_from_fen(fen, board_x=0, board_y=0, tile_size=80):
+    white, red, kings, white_to_move = parse_fen(fen)
+    board = create_board(board_x, board_y, tile_size)
+    radius = tile_size // 2 - 10
+    for sq, (row, col) in enumerate(SQUARE_TO_COORD):
+        bit = 1 << sq
+        if (white | red) & bit:
+            tile = board[row][col]
+            tile.hasChecker = Checker(tile.x_start + tile.width_height // 2, tile.y_start + tile.width_height // 2,
+                                      radius, bool(kings & bit), bool(white & bit))
+    return GameState(board, 'white' if white_to_move else 'red')
+
+"""Play a record through GameState and return the resulting game; raises ValueError on an illegal move"""
+def replay(game):
+    game_state = game_state_from_fen(game.fen)
+    for ply, text in enumerate(game.moves, 1):
+        if game_state.check_game_over():
+            raise ValueError(f"ply {ply}: {text} played after the game was over")
+        try:
+            game_state.play_turn(find_move(game_state.legal_turns(), text))
+        except ValueError as error:
+            raise ValueError(f"ply {ply}: {error}") from None
+    return game_state
+
+'''
+    record_game() Function:
+        PdnGame for the turns played in a GameState so far (its undo stack)
+        The result defaults to check_game_over(); extra keyword arguments become tags
+        Raises ValueError if an undo record is not a legal turn from the position it was played in
+'''
+def record_game(game_state, result=None, **tags):
+    white, red, kings, is_white = game_state.start
+    own, enemy = (white, red) if is_white else (red, white)
+    moves = []
+    for ply, record in enumerate(game_state.undo_stack, 1):
+        for move in generate_turns(own, enemy, kings, is_white):
+            if move.path[0] == record.from_sq and move.path[-1] == record.to_sq and move.captured == record.captured:
+                break
+        else:
+            raise ValueError(f"ply {ply}: undo record {record.from_sq + 1}-{record.to_sq + 1} "
+                             f"(captured {record.captured:#x}) is not a legal turn")
+        moves.append(move.notation())
+        child_own, child_enemy, kings, promoted = apply_turn(own, enemy, kings, is_white, move)
+        own, enemy, is_white = child_enemy, child_own, not is_white
+    if result is None:
+        result = RESULT_TOKENS[game_state.check_game_over()]
+    tags.setdefault('FEN', format_fen(*game_state.start))
+    tags.setdefault('GameType', GAME_TYPE)
+    return PdnGame(tags, moves, result)
+
+
+# ----- Bulk Validation ----- #
+'''
+    validate_game() Function:
+        Replays a record on bitboard masks with every rule check_game_over applies
+        (elimination, the 40-move draw, threefold repetition, no legal moves)
+        Returns (plies replayed, error message or None); a finished game must match its result token
+'''
+def validate_game(game):
+    try:
+        white, red, kings, is_white = parse_fen(game.fen)
+    except ValueError as error:
+        return 0, str(error)
+    own, enemy = (white, red) if is_white else (red, white)
+    h = hash_position(white, red, kings, is_white)
+    seen = {h: 1}
+    quiet = 0
+    status = None
+    for ply, text in enumerate(game.moves):
+        moves = generate_turns(own, enemy, kings, is_white)
+        status = _status(own, moves, is_white, quiet, seen[h])
+        if status:
+            return ply, f"ply {ply + 1}: {text} played after the game was over ({status})"
+        try:
+            move = find_move(moves, text)
+        except ValueError as error:
+            return ply, f"ply {ply + 1}: {error}"
+        child_own, child_enemy, child_kings, promoted = apply_turn(own, enemy, kings, is_white, move)
+        h = hash_move(h, move, kings, is_white, promoted)
+        seen[h] = seen.get(h, 0) + 1
+        quiet = 0 if move.captured else quiet + 1
+        own, enemy, kings, is_white = child_enemy, child_own, child_kings, not is_white
+
+    status = _status(own, generate_turns(own, enemy, kings, is_white), is_white, quiet, seen[h])
+    if status and game.winner and status != game.winner:
+        return len(game.moves), f"result {game.result} but the game ended with {status}"
+    return len(game.moves), None
+
+"""check_game_over() on side-relative data"""
+def _status(own, moves, is_white, quiet, repetitions):
+    loser_result = 'red' if is_white else 'white'
+    if not own:
+        return loser_result
+    if quiet >= 40 or repetitions >= 3:
+        return 'draw'
+    if not moves:
+        return loser_result
+    return None
+
+"""Pool task: parse a slice of an archive and validate every game in it"""
+def _validate_lines(lines):
+    results = []
+    for game in read_games(lines):
+        plies, error = validate_game(game)
+        results.append((plies, error, game.tags.get('Event', '?'), game.tags.get('Round', '?')))
+    return results
+
+'''
+    _archive_slices() Function:
+        Splits the lines of the archives into slices of about slice_lines lines, cutting only
+        where a tag line follows movetext, so no game is split between two slices
+'''
+def _archive_slices(paths, slice_lines):
+    for path in paths:
+        lines = []
+        in_movetext = False
+        with open_archive(path) as f:
+            for line in f:
+                is_tag = line.startswith('[')
+                if is_tag and in_movetext and len(lines) >= slice_lines:
+                    yield lines
+                    lines = []
+                if line.strip():
+                    in_movetext = not is_tag
+                lines.append(line)
+        if lines:
+            yield lines
+
+'''
+    validate_archives() Function:
+        Generator pipeline: archive slices -> process pool -> (plies, error, event, round) per game
+        Only a few slices per worker are in flight, so memory stays flat however big the archives are
+'''
+def validate_archives(paths, jobs=None, slice_lines=20000):
+    jobs = jobs or os.cpu_count() or 1
+    slices = _archive_slices(paths, slice_lines)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = []
+        for lines in slices:
+            pending.append(pool.submit(_validate_lines, lines))
+            # Yield in archive order, keeping at most two slices per worker queued
+            while len(pending) >= jobs * 2 or (pending and pending[0].done()):
+                yield from pending.pop(0).result()
+        for future in pending:
+            yield from future.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m pycheckers.pdn', description='Check PDN game archives.')
+    parser.add_argument('files', nargs='+', help="PDN files to replay (.gz is fine)")
+    parser.add_argument('--jobs', type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument('--max-errors', type=int, default=20, help="how many bad games to list (default 20)")
+    args = parser.parse_args(argv)
+
+    start = perf_counter()
+    games = plies = errors = 0
+    for game_plies, error, event, round_ in validate_archives(args.files, args.jobs):
+        games += 1
+        plies += game_plies
+        if error:
+            errors += 1
+            if errors <= args.max_errors:
+                print(f"game {games} ({event}, round {round_}): {error}")
+    elapsed = perf_counter() - start
+    rate = plies / elapsed * 60 if elapsed > 0 else 0
+    print(f"{games} games, {plies} moves, {errors} bad games in {elapsed:.1f}s ({rate:,.0f} moves/minute)")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
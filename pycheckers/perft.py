@@ -0,0 +1,230 @@
+'''
+Perft and Benchmarks
+    perft() counts the leaf nodes of the move tree to a fixed depth
+    Comparing the counts with known references catches move generation bugs,
+    and timing them catches speed regressions
+    Run with `python -m pycheckers.perft` (see --help); --variant checks the other rule variants
+'''
+import argparse
+import random
+import sys
+from time import perf_counter
+
+from .bitboard import apply_turn, generate_turns, jumpers_mask, movers_mask
+from .fen import START_FEN, format_fen, parse_fen
+from .pdn import game_state_from_fen
+from .rules import GameState, create_board, set_checkers
+from .variants import VARIANTS
+
+'''
+    Reference Positions:
+        (name, FEN, leaf counts for depth 1, 2, 3, ...)
+        The start position counts are the published English draughts perft numbers;
+        the others were cross-checked against the original Tile/Checker move walk
+'''
+REFERENCE_POSITIONS = (
+    ("start", START_FEN, (7, 49, 302, 1469, 7361, 36768, 179740, 845931, 3963680, 18391564)),
+    ("kings endgame", "W:W5,23,24:B4,10,11,15,K29,K30", (5, 25, 87, 410, 1535)),
+    ("red to move", "B:W11,19,24,30:B10,14,21,K29", (5, 22, 96, 480, 2102)),
+    ("crowded middle", "B:W17,19,20,29,31:B4,5,7,10,11,22,K26", (9, 42, 188, 832, 4071)),
+    ("lone king", "W:WK2,19,21,28,29,31:B4,8,12,22", (9, 27, 97, 350, 1732)),
+    ("three red kings", "W:WK9,14:B7,8,19,20,K28,K30,K32", (4, 34, 145, 1296, 4235)),
+    ("two red kings", "W:W17,22,23,26,27:B1,2,4,6,7,9,11,K30,K32", (6, 35, 190, 1117, 4997)),
+    ("king capture loop", "W:WK26,29:B1,3,14,15,22,23", (2, 8, 40, 150, 660, 2420)),
+)
+
+# Published start position counts for the other variants, played through Variant.generate_turns()
+VARIANT_REFERENCES = {
+    'international': (9, 81, 658, 4265, 27117, 167140, 1049442),
+    'brazilian': (7, 49, 302, 1469, 7473, 37628, 187302),
+}
+
+
+"""Leaf nodes below a position, counting each complete turn (multi-jumps included) as one move"""
+def perft(own, enemy, kings, is_white, depth):
+    moves = generate_turns(own, enemy, kings, is_white)
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1
+    nodes = 0
+    for move in moves:
+        child_own, child_enemy, child_kings, promoted = apply_turn(own, enemy, kings, is_white, move)
+        nodes += perft(child_enemy, child_own, child_kings, not is_white, depth - 1)
+    return nodes
+
+"""perft() split by root move; returns [(notation, nodes), ...] for tracking down a wrong count"""
+def divide(own, enemy, kings, is_white, depth):
+    counts = []
+    for move in generate_turns(own, enemy, kings, is_white):
+        child_own, child_enemy, child_kings, promoted = apply_turn(own, enemy, kings, is_white, move)
+        counts.append((move.notation(), perft(child_enemy, child_own, child_kings, not is_white, depth - 1)))
+    return counts
+
+"""perft() for any variant, using its tables instead of the English shift generator"""
+def variant_perft(variant, own, enemy, kings, is_white, depth):
+    moves = variant.generate_turns(own, enemy, kings, is_white)
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1
+    nodes = 0
+    for move in moves:
+        child_own, child_enemy, child_kings, promoted = variant.apply_turn(own, enemy, kings, is_white, move)
+        nodes += variant_perft(variant, child_enemy, child_own, child_kings, not is_white, depth - 1)
+    return nodes
+
+"""Side-relative masks (own, enemy, kings, is_white) for a FEN string"""
+def relative_position(fen):
+    white, red, kings, white_to_move = parse_fen(fen)
+    if white_to_move:
+        return white, red, kings, True
+    return red, white, kings, False
+
+"""The opening position exactly as the game builds it with create_board/set_checkers"""
+def start_position():
+    board = create_board(0, 0, 80)
+    set_checkers(board, 80)
+    bitboard = GameState(board).bitboard
+    return bitboard.white, bitboard.red, bitboard.kings, True
+
+'''
+    run_perft_suite() Function:
+        Runs every reference position up to max_depth and prints counts, timings and nodes/second
+        Returns True when every count matches
+'''
+def run_perft_suite(max_depth, out=print):
+    all_passed = True
+    for name, fen, expected in REFERENCE_POSITIONS:
+        position = start_position() if fen == START_FEN else relative_position(fen)
+        for depth in range(1, min(max_depth, len(expected)) + 1):
+            start = perf_counter()
+            nodes = perft(*position, depth)
+            elapsed = perf_counter() - start
+            passed = nodes == expected[depth - 1]
+            all_passed = all_passed and passed
+            rate = int(nodes / elapsed) if elapsed > 0 else 0
+            out(f"{name:<22} depth {depth:>2} {nodes:>10} {'ok  ' if passed else 'FAIL'} "
+                f"(expected {expected[depth - 1]}) {elapsed:8.3f}s {rate:>10} nodes/s")
+    return all_passed
+
+"""Runs a variant's start position up to max_depth against VARIANT_REFERENCES; returns True when all match"""
+def run_variant_perft(variant, max_depth, out=print):
+    expected = VARIANT_REFERENCES.get(variant.name, ())
+    white, red, kings = variant.start_position()
+    all_passed = True
+    for depth in range(1, max_depth + 1):
+        start = perf_counter()
+        nodes = variant_perft(variant, white, red, kings, True, depth)
+        elapsed = perf_counter() - start
+        if depth <= len(expected):
+            passed = nodes == expected[depth - 1]
+            all_passed = all_passed and passed
+            check = f"{'ok  ' if passed else 'FAIL'} (expected {expected[depth - 1]})"
+        else:
+            check = "(no reference)"
+        rate = int(nodes / elapsed) if elapsed > 0 else 0
+        out(f"{variant.name:<18} depth {depth:>2} {nodes:>10} {check} {elapsed:8.3f}s {rate:>10} nodes/s")
+    return all_passed
+
+
+# ----- Benchmarks ----- #
+"""Positions from seeded random playouts, as side-relative tuples"""
+def sample_positions(count=2000, seed=1):
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        own, enemy, kings, is_white = start_position()
+        for ply in range(200):
+            moves = generate_turns(own, enemy, kings, is_white)
+            if not moves:
+                break
+            positions.append((own, enemy, kings, is_white))
+            child_own, child_enemy, kings, promoted = apply_turn(own, enemy, kings, is_white, rng.choice(moves))
+            own, enemy, is_white = child_enemy, child_own, not is_white
+    return positions[:count]
+
+"""Times fn over every sample `rounds` times; returns (calls, seconds)"""
+def _time_calls(fn, samples, rounds):
+    start = perf_counter()
+    calls = 0
+    for _ in range(rounds):
+        for sample in samples:
+            calls += fn(sample)
+    return calls, perf_counter() - start
+
+def _bench_movegen(sample):
+    position, moves, game_state = sample
+    generate_turns(*position)
+    return 1
+
+def _bench_copy_make(sample):
+    (own, enemy, kings, is_white), moves, game_state = sample
+    for move in moves:
+        # Copy-make, as the engine searches: the parent masks are untouched, so there is nothing to unmake
+        apply_turn(own, enemy, kings, is_white, move)
+    return len(moves)
+
+def _bench_make_unmake(sample):
+    position, moves, game_state = sample
+    for move in moves:
+        # The game's own make/unmake: bitboard, piece registry, Tile view and hash history, both ways
+        game_state.play_turn(move)
+        game_state.unmake_move()
+    return len(moves)
+
+def _bench_game_over(sample):
+    (own, enemy, kings, is_white), moves, game_state = sample
+    # Same test as GameState.has_legal_moves: any piece that can jump or step
+    not own or not (jumpers_mask(own, enemy, kings, is_white) or movers_mask(own, enemy, kings, is_white))
+    return 1
+
+BENCHMARKS = (
+    ("move generation", _bench_movegen),
+    ("copy-make", _bench_copy_make),
+    ("GameState make/unmake", _bench_make_unmake),
+    ("game-over check", _bench_game_over),
+)
+
+'''
+    run_benchmarks() Function:
+        Times each stage separately over the same sample positions
+        Moves (and a GameState for each position) are built up front so making moves is timed on its own
+        Prints ns per operation and operations per second for each
+'''
+def run_benchmarks(rounds=5, count=2000, out=print):
+    samples = []
+    for own, enemy, kings, is_white in sample_positions(count):
+        white, red = (own, enemy) if is_white else (enemy, own)
+        game_state = game_state_from_fen(format_fen(white, red, kings, is_white))
+        samples.append(((own, enemy, kings, is_white), generate_turns(own, enemy, kings, is_white), game_state))
+    results = {}
+    for name, fn in BENCHMARKS:
+        calls, elapsed = _time_calls(fn, samples, rounds)
+        results[name] = (calls, elapsed)
+        out(f"{name:<22} {calls:>9} ops {elapsed:8.3f}s {elapsed / calls * 1e9:10.0f} ns/op {int(calls / elapsed):>10} ops/s")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m pycheckers.perft', description='Verify and time move generation.')
+    parser.add_argument('--depth', type=int, default=7, help="deepest perft depth to run (default 7)")
+    parser.add_argument('--fen', help="only run perft (with divide) on this position")
+    parser.add_argument('--variant', choices=[name for name in VARIANTS if name != 'english'],
+                        help="run perft from this variant's start position instead of the English suite")
+    parser.add_argument('--bench', action='store_true', help="also run the stage benchmarks")
+    parser.add_argument('--rounds', type=int, default=5, help="benchmark passes over the sample positions")
+    args = parser.parse_args(argv)
+
+    if args.fen:
+        for notation, nodes in divide(*relative_position(args.fen), args.depth):
+            print(f"{notation:<12} {nodes}")
+        return 0
+
+    if args.variant:
+        return 0 if run_variant_perft(VARIANTS[args.variant], args.depth) else 1
+
+    passed = run_perft_suite(args.depth)
+    if args.bench:
+        run_benchmarks(args.rounds)
+    return 0 if passed else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
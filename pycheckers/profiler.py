@@ -0,0 +1,181 @@
+'''
+Frame Profiler
+    Times each stage of a frame of the main loop and counts the GameState calls made during it
+    Stages are laps: lap('board') charges the time since the previous lap (or begin_frame) to 'board',
+    so the loop only needs one call between stages and a disabled profiler returns straight away
+    Keeps recent frames for the on-screen HUD (p50/p99, slowest stage) and a longer history for export
+    Exports to CSV (one row per frame) or JSON (frames plus a summary) for comparing builds
+    Has no pygame dependency; the GUI draws the HUD from summary()
+'''
+import csv
+import json
+from collections import deque
+from functools import wraps
+from time import perf_counter
+
+# GameState methods counted per frame while the profiler is enabled
+RULES_CALLS = ('legal_moves', 'legal_turns', 'move_piece', 'end_turn', 'play_turn', 'check_game_over',
+               'unmake_move', 'redo_move')
+
+
+"""Value at fraction q (0..1) of an already sorted list, nearest rank"""
+def percentile(values, q):
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+'''
+    FrameProfiler Class:
+        window: frames the HUD statistics cover
+        history: frames kept for export (the oldest are dropped first)
+        watch() picks the one GameState whose calls are counted; while enabled, its methods in RULES_CALLS
+        are wrapped with counters on that instance only, so other games in the process (server games,
+        simulations, search threads) are never touched, and disable() removes the wrappers again
+'''
+class FrameProfiler:
+    def __init__(self, window=240, history=100_000):
+        self.enabled = False
+        self.stages = []  # stage names in the order they were first seen
+        self.recent = deque(maxlen=window)
+        self.frames = deque(maxlen=history)
+        self.calls = dict.fromkeys(RULES_CALLS, 0)
+        self.search = None  # (depth, nodes per second) of the last computer move
+        self.frame_count = 0
+        self._current = None
+        self.game_state = None  # the game whose rules calls are counted
+
+    """Count the rules calls of game_state from now on, instead of the game watched before"""
+    def watch(self, game_state):
+        if self.enabled:
+            self._unhook()
+        self.game_state = game_state
+        if self.enabled:
+            self._hook()
+
+    def enable(self):
+        if self.enabled:
+            return
+        self._hook()
+        self.enabled = True
+
+    def disable(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        self._current = None
+        self._unhook()
+
+    """Wrap the watched game's methods with counters; a game can only be counted by one profiler at a time"""
+    def _hook(self):
+        game_state = self.game_state
+        if game_state is None:
+            return
+        if any(name in vars(game_state) for name in RULES_CALLS):
+            raise ValueError("this game is already being profiled")
+        for name in RULES_CALLS:
+            setattr(game_state, name, self._counted(name, getattr(game_state, name)))
+
+    def _unhook(self):
+        if self.game_state is not None:
+            for name in RULES_CALLS:
+                vars(self.game_state).pop(name, None)
+
+    def toggle(self):
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+        return self.enabled
+
+    def _counted(self, name, method):
+        calls = self.calls
+        @wraps(method)
+        def counted(*args, **kwargs):
+            calls[name] += 1
+            return method(*args, **kwargs)
+        return counted
+
+    """Start timing a frame; call once the loop has its events"""
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        now = perf_counter()
+        self._current = {}
+        self._start = self._last = now
+        for name in self.calls:
+            self.calls[name] = 0
+
+    """Charge the time since the last lap to stage name"""
+    def lap(self, name):
+        if self._current is None:
+            return
+        now = perf_counter()
+        self._current[name] = self._current.get(name, 0.0) + now - self._last
+        self._last = now
+        if name not in self.stages:
+            self.stages.append(name)
+
+    """Finish the frame: record its total time, stage times and rules calls"""
+    def end_frame(self):
+        if self._current is None:
+            return
+        self.frame_count += 1
+        frame = {'frame': self.frame_count, 'total': perf_counter() - self._start, 'stages': self._current,
+                 'calls': {name: count for name, count in self.calls.items() if count}}
+        self.recent.append(frame)
+        self.frames.append(frame)
+        self._current = None
+
+    """Remember the last search so the HUD can show the engine's speed"""
+    def note_search(self, result):
+        self.search = (result.depth, result.nps)
+
+    '''
+        summary() Method:
+            Statistics over the recent window, in milliseconds:
+            frame p50/p99/max, mean and p99 per stage, the slowest stage by mean and rules calls per frame
+    '''
+    def summary(self, frames=None):
+        frames = list(self.recent if frames is None else frames)
+        totals = sorted(frame['total'] * 1000 for frame in frames)
+        count = max(len(frames), 1)
+        stages = {}
+        for name in self.stages:
+            times = sorted(frame['stages'].get(name, 0.0) * 1000 for frame in frames)
+            stages[name] = {'mean': sum(times) / count, 'p99': percentile(times, 0.99)}
+        calls = {}
+        for frame in frames:
+            for name, number in frame['calls'].items():
+                calls[name] = calls.get(name, 0) + number
+        slowest = max(stages, key=lambda name: stages[name]['mean']) if stages else None
+        return {'frames': len(frames), 'p50': percentile(totals, 0.5), 'p99': percentile(totals, 0.99),
+                'max': totals[-1] if totals else 0.0, 'mean': sum(totals) / count, 'stages': stages,
+                'slowest': slowest, 'calls_per_frame': {name: number / count for name, number in calls.items()}}
+
+    '''
+        export() Method:
+            Writes the frame history to path: CSV when it ends in .csv, JSON otherwise
+            Times are in milliseconds; returns the number of frames written
+    '''
+    def export(self, path):
+        frames = list(self.frames)
+        if path.endswith('.csv'):
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['frame', 'total_ms'] + [f"{name}_ms" for name in self.stages] + list(RULES_CALLS))
+                for frame in frames:
+                    writer.writerow([frame['frame'], round(frame['total'] * 1000, 4)]
+                                    + [round(frame['stages'].get(name, 0.0) * 1000, 4) for name in self.stages]
+                                    + [frame['calls'].get(name, 0) for name in RULES_CALLS])
+        else:
+            rows = [{'frame': frame['frame'], 'total_ms': round(frame['total'] * 1000, 4),
+                     'stages_ms': {name: round(value * 1000, 4) for name, value in frame['stages'].items()},
+                     'calls': frame['calls']} for frame in frames]
+            with open(path, 'w') as f:
+                json.dump({'summary': self.summary(frames), 'frames': rows}, f, indent=1)
+        return len(frames)
+
+
+# The profiler the GUI loop reports to
+profiler = FrameProfiler()
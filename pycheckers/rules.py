@@ -0,0 +1,457 @@
+'''
+Checkers Rules
+    Board setup and game state logic with no pygame dependency
+    Tile and Checker only hold the geometry the front end needs to draw them
+'''
+from .bitboard import iter_squares
+from .trace import INFO, tracer
+from .variants import ENGLISH
+from .zobrist import SIDE_KEY, hash_position, piece_key
+
+
+# ----- Board and Checker Components ----- #
+'''
+    Tile Class:
+        Represents each square on the board
+        Has a color (white/red) and a checker (if present)
+'''
+class Tile:
+    def __init__(self, x_start, y_start, width_height, is_white, hasChecker = None):
+        self.x_start = x_start
+        self.y_start = y_start
+        self.width_height = width_height
+        self.is_white = is_white
+        self.hasChecker = hasChecker # For gamestate logic
+
+'''
+    Checker Class:
+        Represents each checker piece
+        Has a position, radius, and color (white/red)
+        Can be a king (if it reaches the opposite side)
+'''
+class Checker:
+    def __init__(self, x_pos, y_pos, radius, king, is_white):
+        self.x_pos = x_pos
+        self.y_pos = y_pos
+        self.king = king
+        self.radius = radius
+        self.is_white = is_white
+
+'''
+    create_board() Function:
+        Create a size x size Checker board using Tile objects (8x8 unless a variant needs more)
+        Each tile is either white or red
+'''
+def create_board(board_x, board_y, tile_size, size=8):
+    board = []
+    for row in range(size):
+        board_row = []
+        for col in range(size):
+            is_white = (row + col) % 2 == 0
+            tile = Tile(board_x + col * tile_size, board_y + row * tile_size, tile_size, is_white)
+            board_row.append(tile)
+        board.append(board_row)
+    return board
+
+'''
+    set_checkers() Function:
+        Sets up the initial positions of the checkers on the board
+        Creates checker objects and assigns them to the appropriate tiles
+        rows is how many rows of men each side starts with (the variant's rows)
+'''
+def set_checkers(board, tile_size, rows=3):
+    checkers = []
+    
+    radius = tile_size // 2 - 10
+    
+    # Go through each row and check if the tile is black, if black, place checker
+    for row_i, row in enumerate(board):
+        for tile in row:
+            tile.hasChecker = None
+            if not tile.is_white:
+                x_pos = tile.x_start + tile.width_height // 2
+                y_pos = tile.y_start + tile.width_height // 2
+                checker_obj = None
+                # Assign color based on row index
+                if row_i < rows:
+                    checker_obj = Checker(x_pos, y_pos, radius, False, False)
+                elif row_i >= len(board) - rows:
+                    checker_obj = Checker(x_pos, y_pos, radius, False, True)
+                
+                # Assign checker to tile and add to checkers list
+                if checker_obj:
+                    checkers.append(checker_obj)
+                    tile.hasChecker = checker_obj
+    return checkers
+
+'''
+    PieceRegistry Class:
+        Checker objects indexed by bitboard square
+        Adding, removing, moving and promoting a piece are single dictionary operations
+        Each GameState owns its own registry, so independent games can share a process
+'''
+class PieceRegistry:
+    def __init__(self):
+        self.by_square = {}
+
+    """Build the registry from the checkers currently sitting on a board of Tiles"""
+    @classmethod
+    def from_board(cls, board, variant=ENGLISH):
+        registry = cls()
+        for sq, (row, col) in enumerate(variant.square_to_coord):
+            if board[row][col].hasChecker is not None:
+                registry.add(sq, board[row][col].hasChecker)
+        return registry
+
+    def add(self, sq, checker):
+        self.by_square[sq] = checker
+
+    """Removes and returns the checker on sq"""
+    def remove(self, sq):
+        return self.by_square.pop(sq)
+
+    """Re-index the checker on from_sq under to_sq and return it"""
+    def move(self, from_sq, to_sq):
+        checker = self.by_square.pop(from_sq)
+        self.by_square[to_sq] = checker
+        return checker
+
+    def promote(self, sq):
+        self.by_square[sq].king = True
+
+    def get(self, sq):
+        return self.by_square.get(sq)
+
+    def __iter__(self):
+        return iter(self.by_square.values())
+
+    def __len__(self):
+        return len(self.by_square)
+
+
+'''
+    UndoRecord Class:
+        Everything needed to take back one turn, in a fixed set of slots
+        Captured pieces are stored as masks (all of them, and which were kings) instead of objects,
+        so a record is the same size whether the turn captured nothing or a whole chain
+'''
+class UndoRecord:
+    __slots__ = ('from_sq', 'to_sq', 'captured', 'captured_kings', 'promoted', 'moves_since_last_capture', 'turn')
+
+    def __init__(self, from_sq, moves_since_last_capture, turn):
+        self.from_sq = from_sq
+        self.to_sq = from_sq
+        self.captured = 0
+        self.captured_kings = 0
+        self.promoted = False
+        self.moves_since_last_capture = moves_since_last_capture
+        self.turn = turn
+
+
+# ----- Game State Logic and Behavior ----- #
+'''
+    GameState Class:
+        Logic for game state
+        Tracks the current state
+        Handles piece selection, movement, and turn switching
+        variant sets the board size and rules (pycheckers.variants); the board must be that size
+'''
+class GameState:
+    def __init__(self, board, turn='white', variant=ENGLISH):
+        if len(board) != variant.size:
+            raise ValueError(f"{variant.name} needs a {variant.size}x{variant.size} board, not {len(board)}x{len(board)}")
+        self.variant = variant
+        self.selected_piece = None
+        self.turn = turn  # white moves first (your red pieces) unless set up otherwise
+        self.valid_moves = []
+        self.must_capture = False  # Track if a capture is mandatory
+        self.board = board  # Tile/Checker view, only kept in sync for rendering
+        self.bitboard = variant.bitboard_from_tiles(board)  # Source of truth for the rules
+        self.moves_since_last_capture = 0  # Track moves since last capture
+        # Where the game started, so the moves in undo_stack can be written out (see pycheckers.pdn)
+        self.start = (self.bitboard.white, self.bitboard.red, self.bitboard.kings, turn == 'white')
+        self.pieces = PieceRegistry.from_board(board, variant)  # Checkers still on the board, by square
+        # Cached rules data, only recomputed when a move is applied
+        self.piece_counts = {'white': self.bitboard.white.bit_count(), 'red': self.bitboard.red.bit_count()}
+        self.available_turns = []
+        # Finished turns that can be taken back, the turn currently being played hop by hop,
+        # and turns that were taken back and can be replayed
+        self.undo_stack = []
+        self.pending = None
+        self.redo_stack = []
+        self.hops = ()  # squares visited so far by the piece playing the current turn
+        # Zobrist hash of the position, updated hop by hop, and the hash after every finished turn
+        # repetitions counts how often each of those positions has occurred, for the threefold rule
+        self.hash = hash_position(self.bitboard.white, self.bitboard.red, self.bitboard.kings, turn == 'white')
+        self.hash_history = [self.hash]
+        self.repetitions = {self.hash: 1}
+        self._refresh()
+
+    """Recompute the capture flag and legal turns for the side to move"""
+    def _refresh(self):
+        self.available_turns = self.bitboard.turns(self.turn == 'white')
+        self.must_capture = bool(self.available_turns) and self.available_turns[0].is_capture
+
+    """Hand the move to the other side; this is the only place the cached rules data is rebuilt"""
+    def end_turn(self):
+        self.turn = 'red' if self.turn == 'white' else 'white'
+        self.hash ^= SIDE_KEY
+        self.hash_history.append(self.hash)
+        self.repetitions[self.hash] = self.repetitions.get(self.hash, 0) + 1
+        self.selected_piece = None
+        self.valid_moves = []
+        self._refresh()
+
+    """Returns actual legal moves considering board state"""
+    def legal_moves(self, pixel, hop=False):
+        sq = self.variant.coord_to_square.get(tuple(pixel))
+        piece = None if sq is None else self.bitboard.piece_at(sq)
+        if piece is None:
+            return []
+
+        # In checkers, captures are mandatory
+        # The side to move follows its legal turns hop by hop, which also keeps to the longest-capture rule
+        # and to pieces captured earlier in the turn, for the variants that have them
+        continuing = bool(self.hops) and self.hops[-1] == sq
+        if continuing or self.must_capture and piece[0] == (self.turn == 'white'):
+            path = self.hops if continuing else (sq,)
+            targets = 0
+            for move in self.available_turns:
+                if move.path[:len(path)] == path and len(move.path) > len(path):
+                    targets |= 1 << move.path[len(path)]
+        else:
+            targets = self.bitboard.captures_from(sq)
+        if not targets and not hop:  # Only return normal moves if no captures available
+            targets = self.bitboard.moves_from(sq)
+        return [self.variant.square_to_coord[t] for t in iter_squares(targets)]
+    
+    """Returns every complete turn for the side to move (as of the start of its turn) as bitboard Move records"""
+    def legal_turns(self):
+        return self.available_turns
+
+    """Play a whole turn from legal_turns() hop by hop, then pass the turn to the other side (make move)"""
+    def play_turn(self, move):
+        path = [self.variant.square_to_coord[sq] for sq in move.path]
+        for from_pos, to_pos in zip(path, path[1:]):
+            self.move_piece(from_pos, to_pos)
+        self.end_turn()
+
+    """ check the bitboard to see if a player has any legal moves left"""
+    def has_legal_moves(self, player_color_turn):
+        is_white_turn = (player_color_turn == 'white')
+        return bool(self.bitboard.jumpers(is_white_turn) or self.bitboard.movers(is_white_turn))
+    
+    """Move a piece from from_pos to to_pos, handling captures and promotions"""
+    def move_piece(self, from_pos, to_pos):
+        from_row, from_col = from_pos
+        to_row, to_col = to_pos
+
+        from_tile = self.board[from_row][from_col]
+        to_tile = self.board[to_row][to_col]
+
+        # Update the rules state first, then mirror it onto the Tile/Checker view
+        from_sq = self.variant.coord_to_square[(from_row, from_col)]
+        to_sq = self.variant.coord_to_square[(to_row, to_col)]
+        if self.pending is None:
+            self.pending = UndoRecord(from_sq, self.moves_since_last_capture, self.turn)
+            self.hops = (from_sq,)
+        kings_before = self.bitboard.kings
+        captured_sq = self.bitboard.move(from_sq, to_sq)
+        self.hops += (to_sq,)
+        checker = self.pieces.move(from_sq, to_sq)
+        self.pending.to_sq = to_sq
+        was_king = bool(kings_before >> from_sq & 1)
+        self.hash ^= piece_key(checker.is_white, was_king, from_sq) ^ piece_key(checker.is_white, was_king, to_sq)
+
+        # Handle captures
+        if captured_sq is not None:  # This is a capture move
+            self.pending.captured |= 1 << captured_sq
+            self.pending.captured_kings |= kings_before & (1 << captured_sq)
+            self.hash ^= piece_key(not checker.is_white, bool(kings_before >> captured_sq & 1), captured_sq)
+            if tracer.level <= INFO:
+                tracer.emit(INFO, 'capture', side=self.turn, square=captured_sq + 1,
+                            king=bool(kings_before >> captured_sq & 1))
+            self.moves_since_last_capture = 0 # <<< RESET counter on capture
+            self.piece_counts['red' if checker.is_white else 'white'] -= 1
+            jumped_row, jumped_col = self.variant.square_to_coord[captured_sq]
+            jumped_tile = self.board[jumped_row][jumped_col]
+
+            # Remove the captured checker from the registry and the board view
+            self.pieces.remove(captured_sq)
+            jumped_tile.hasChecker = None
+
+            # Move the piece *after* handling capture details
+            from_tile.hasChecker = None
+            to_tile.hasChecker = checker
+            checker.x_pos = to_tile.x_start + to_tile.width_height // 2
+            checker.y_pos = to_tile.y_start + to_tile.width_height // 2
+
+            # Check for additional captures
+            self.valid_moves = self.legal_moves(to_pos, hop=True)
+            if self.valid_moves:
+                self.selected_piece = to_pos
+                self.must_capture = True
+                # We don't increment moves_since_last_capture here as it was reset
+                return False # Turn isn't over yet
+
+        else: # No capture
+             from_tile.hasChecker = None
+             to_tile.hasChecker = checker
+             checker.x_pos = to_tile.x_start + to_tile.width_height // 2
+             checker.y_pos = to_tile.y_start + to_tile.width_height // 2
+             # increment counter on non capture moves
+             self.moves_since_last_capture += 1
+
+        # Handle king promotion
+        if self.bitboard.promote(to_sq):
+            self.pieces.promote(to_sq)
+            self.pending.promoted = True
+            self.hash ^= piece_key(checker.is_white, False, to_sq) ^ piece_key(checker.is_white, True, to_sq)
+            if tracer.level <= INFO:
+                tracer.emit(INFO, 'promotion', side=self.turn, square=to_sq + 1)
+            # Removed radius increase as per previous request for border
+
+        # reset ONLY on capture
+        # if captured_piece or promoted:
+        #     self.moves_since_last_capture = 0
+
+        self.must_capture = False
+        # The turn is over, so it can be taken back; a new move replaces anything that was undone
+        self.undo_stack.append(self.pending)
+        self.pending = None
+        self.hops = ()
+        self.redo_stack.clear()
+        if tracer.level <= INFO:
+            record = self.undo_stack[-1]
+            tracer.emit(INFO, 'move', side=self.turn, start=record.from_sq + 1, end=record.to_sq + 1,
+                        captures=record.captured.bit_count(), quiet=self.moves_since_last_capture)
+        return True  # Turn is complete
+
+    """Put a checker on the tile at (row, col), in both the Tile view and its pixel position"""
+    def _place(self, checker, row, col):
+        tile = self.board[row][col]
+        tile.hasChecker = checker
+        checker.x_pos = tile.x_start + tile.width_height // 2
+        checker.y_pos = tile.y_start + tile.width_height // 2
+
+    '''
+        unmake_move() Method:
+            Takes back the last finished turn, or the hops played so far of an unfinished capture chain
+            Restores the bitboard, the piece registry, the Tile view, the counters and the side to move
+            Returns False when there is nothing to take back
+    '''
+    def unmake_move(self):
+        record = self.pending
+        finished = record is None
+        self.pending = None
+        self.hops = ()
+        if finished:
+            if not self.undo_stack:
+                return False
+            record = self.undo_stack.pop()
+            # Forget the position the turn led to
+            left = self.hash_history.pop()
+            self.repetitions[left] -= 1
+            if not self.repetitions[left]:
+                del self.repetitions[left]
+        self.hash = self.hash_history[-1]
+        mover_white = record.turn == 'white'
+        from_bit = 1 << record.from_sq
+        to_bit = 1 << record.to_sq
+
+        # Bitboard: move the piece back (a capture loop may end where it started), then un-crown it
+        bitboard = self.bitboard
+        if mover_white:
+            bitboard.white ^= from_bit ^ to_bit
+            bitboard.red |= record.captured
+        else:
+            bitboard.red ^= from_bit ^ to_bit
+            bitboard.white |= record.captured
+        if record.promoted:
+            bitboard.kings &= ~to_bit
+        elif bitboard.kings & to_bit:
+            bitboard.kings ^= from_bit ^ to_bit
+        bitboard.kings |= record.captured_kings
+
+        # Registry and Tile view
+        checker = self.pieces.move(record.to_sq, record.from_sq)
+        if record.promoted:
+            checker.king = False
+        square_to_coord = self.variant.square_to_coord
+        to_row, to_col = square_to_coord[record.to_sq]
+        self.board[to_row][to_col].hasChecker = None
+        self._place(checker, *square_to_coord[record.from_sq])
+        for sq in iter_squares(record.captured):
+            restored = Checker(0, 0, checker.radius, bool(record.captured_kings >> sq & 1), not mover_white)
+            self.pieces.add(sq, restored)
+            self._place(restored, *square_to_coord[sq])
+        self.piece_counts['red' if mover_white else 'white'] += record.captured.bit_count()
+
+        self.moves_since_last_capture = record.moves_since_last_capture
+        self.turn = record.turn
+        self.selected_piece = None
+        self.valid_moves = []
+        self._refresh()
+
+        # A finished turn can be replayed; find it again among the legal turns
+        if finished:
+            for move in self.available_turns:
+                if move.start == record.from_sq and move.end == record.to_sq and move.captured == record.captured:
+                    self.redo_stack.append(move)
+                    break
+        return True
+
+    """How many times the current position has occurred (with the same side to move); 3 is a draw"""
+    def repetition_count(self):
+        return self.repetitions.get(self.hash, 0)
+
+    """Hashes of the positions since the last capture, oldest first; no earlier position can come back"""
+    def position_history(self):
+        return self.hash_history[-(self.moves_since_last_capture + 1):]
+
+    """Replay the last turn taken back by unmake_move(); returns False if there is none"""
+    def redo_move(self):
+        if not self.redo_stack or self.pending is not None:
+            return False
+        redo_stack = self.redo_stack
+        self.redo_stack = []
+        self.play_turn(redo_stack.pop())
+        self.redo_stack = redo_stack
+        return True
+
+    """Checks all game over conditions: win, draw, no moves."""
+    def check_game_over(self):
+        # Check Win by Elimination (counts are kept up to date by move_piece)
+        if self.piece_counts['white'] == 0: return self._game_over('red', 'elimination')
+        if self.piece_counts['red'] == 0: return self._game_over('white', 'elimination')
+
+        # Check Draw by 40 Moves Rule (40 ply without capture; the variant sets the limit)
+        if self.moves_since_last_capture >= self.variant.draw_plies:
+             return self._game_over('draw', f"{self.variant.draw_plies} moves without a capture")
+
+        # Check Draw by Threefold Repetition (same position, same side to move)
+        if self.repetition_count() >= 3:
+             return self._game_over('draw', 'threefold repetition')
+
+        # Check Win by No Legal Moves (for the player whose turn it CURRENTLY is)
+        if not self.available_turns:
+             # If the current player has no moves, the *other* player wins
+             return self._game_over('red' if self.turn == 'white' else 'white', f"no legal moves for {self.turn}")
+
+        # No game over condition met
+        return None
+
+    """Trace the end of the game and pass the result through"""
+    def _game_over(self, result, reason):
+        if tracer.level <= INFO:
+            tracer.emit(INFO, 'game_over', result=result, reason=reason, turns=len(self.undo_stack))
+        return result
+    
+'''
+update_mandatory_capture() Function:
+    Checks for a mandatory capture for the side to move
+    GameState keeps must_capture current through end_turn(), so this is only
+    needed after changing game_state.turn or the board by hand
+'''
+def update_mandatory_capture(game_state):
+    game_state.must_capture = bool(game_state.bitboard.jumpers(game_state.turn == 'white'))
@@ -0,0 +1,427 @@
+'''
+Game Server
+    Hosts many headless games in one asyncio process, for remote players and bots
+    Protocol: one JSON object per line over TCP, in both directions
+        -> {"op": "new", "side": "white"}              start a game and take a seat ('white', 'red' or 'both')
+        -> {"op": "join", "game": 7, "side": "red"}    take a free seat, or just watch with side 'watch'
+        -> {"op": "move", "game": 7, "move": "22-17"}  play a turn ('17x10x1', or '17x1' when unambiguous)
+        -> {"op": "state", "game": 7}                  ask for the whole position again
+        -> {"op": "leave", "game": 7}
+        <- {"type": "state", ...}   the whole position: FEN, side to move, status and legal turns
+        <- {"type": "diff", ...}    sent to everyone in the game after each turn: the move, the squares
+                                    that changed ('w'/'W' white man/king, 'r'/'R' red, null empty) and the new status
+        <- {"type": "error", ...}
+        Replies (and the mover's copy of a diff) carry the request's "id" when it had one
+    A turn is applied and its diffs queued with no await in between, so a game's turns and diffs stay in order
+    Every connection has a bounded send queue drained by its own writer task; a client that falls
+    max_queue messages behind is disconnected instead of letting the server's memory grow
+    Plain TCP only: the standard library has no WebSocket support and the package has no networking dependencies
+    Run with `python -m pycheckers.server` (see --help); `loadtest` plays random games against a server
+'''
+import argparse
+import asyncio
+import json
+import random
+import sys
+import traceback
+from time import perf_counter
+
+from .fen import format_fen
+from .pdn import RESULT_TOKENS, find_move
+from .rules import GameState, create_board, set_checkers
+from .trace import INFO, WARNING, tracer
+
+SIDES = ('white', 'red')
+SEATS = SIDES + ('both', 'watch')  # what a request's "side" may ask for
+MAX_LINE = 4096  # longest request line accepted
+
+
+"""Piece code on sq for the protocol: 'w'/'W' for a white man/king, 'r'/'R' for red, None for empty"""
+def piece_code(white, red, kings, sq):
+    bit = 1 << sq
+    if not (white | red) & bit:
+        return None
+    code = 'w' if white & bit else 'r'
+    return code.upper() if kings & bit else code
+
+"""Squares (1-32, as strings for JSON) whose contents differ between two (white, red, kings) snapshots"""
+def square_diff(before, after):
+    changed = (before[0] ^ after[0]) | (before[1] ^ after[1]) | (before[2] ^ after[2])
+    squares = {}
+    sq = 0
+    while changed >> sq:
+        if changed >> sq & 1:
+            squares[str(sq + 1)] = piece_code(*after, sq)
+        sq += 1
+    return squares
+
+
+'''
+    ServerGame Class:
+        One hosted game: its GameState, the connection in each seat and the spectators
+'''
+class ServerGame:
+    def __init__(self, game_id):
+        self.id = game_id
+        board = create_board(0, 0, 80)
+        set_checkers(board, 80)
+        self.game_state = GameState(board)
+        self.seats = dict.fromkeys(SIDES)
+        self.watchers = set()
+        self.status = None
+
+    """Everyone who receives this game's diffs"""
+    def members(self):
+        return {conn for conn in self.seats.values() if conn is not None} | self.watchers
+
+    def snapshot(self):
+        bitboard = self.game_state.bitboard
+        return (bitboard.white, bitboard.red, bitboard.kings)
+
+    """The 'state' message for this game"""
+    def state(self):
+        game_state = self.game_state
+        white, red, kings = self.snapshot()
+        return {'type': 'state', 'game': self.id, 'fen': format_fen(white, red, kings, game_state.turn == 'white'),
+                'turn': game_state.turn, 'ply': len(game_state.undo_stack),
+                'quiet': game_state.moves_since_last_capture, 'status': self.status,
+                'result': RESULT_TOKENS[self.status] if self.status else None,
+                'seats': {side: conn is not None for side, conn in self.seats.items()},
+                'legal': [] if self.status else [move.notation() for move in game_state.legal_turns()]}
+
+
+'''
+    Connection Class:
+        One client socket: requests are read one line at a time (so a busy client waits on its own
+        TCP window), replies go through a bounded queue that a writer task drains with drain()
+'''
+class Connection:
+    def __init__(self, reader, writer, max_queue):
+        self.reader = reader
+        self.writer = writer
+        self.queue = asyncio.Queue(max_queue)
+        self.games = set()
+        self.closed = False
+        self.sender = asyncio.ensure_future(self._send_loop())
+
+    """Queue one encoded message; a client that is too far behind is cut off"""
+    def send_line(self, line):
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(line)
+        except asyncio.QueueFull:
+            tracer.emit(WARNING, 'client_dropped', reason='send queue full', games=len(self.games))
+            self.close()
+
+    def send(self, message):
+        self.send_line((json.dumps(message, separators=(',', ':')) + '\n').encode())
+
+    async def _send_loop(self):
+        try:
+            while True:
+                line = await self.queue.get()
+                if line is None:
+                    break
+                self.writer.write(line)
+                # Only waits when the socket buffer is above its high-water mark
+                await self.writer.drain()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.closed = True
+            self.writer.close()
+
+    '''
+        close() Method:
+            Closes the socket once the queued messages are out
+            If the queue is full the client has stopped reading, so the connection is aborted:
+            a graceful close would wait forever for the unsent data
+    '''
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self.queue.put_nowait(None)
+        except asyncio.QueueFull:
+            self.sender.cancel()
+            self.writer.transport.abort()
+
+
+'''
+    GameServer Class:
+        Keeps every hosted game by id and serves the line protocol
+        start() listens on (host, port); port 0 picks a free port (see .port)
+'''
+class GameServer:
+    def __init__(self, max_games=100_000, max_queue=256):
+        self.games = {}
+        self.next_id = 1
+        self.max_games = max_games
+        self.max_queue = max_queue
+        self.clients = {}  # Connection -> the task serving it
+        self.moves = 0
+        self.server = None
+
+    async def start(self, host='127.0.0.1', port=8765):
+        self.server = await asyncio.start_server(self.handle_client, host, port, limit=MAX_LINE)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    """Stop listening, hang up on every client and wait for their handlers to finish"""
+    async def close(self):
+        self.server.close()
+        for conn in list(self.clients):
+            conn.writer.close()
+        await asyncio.gather(*self.clients.values(), return_exceptions=True)
+        await self.server.wait_closed()
+
+    async def handle_client(self, reader, writer):
+        conn = Connection(reader, writer, self.max_queue)
+        self.clients[conn] = asyncio.current_task()
+        tracer.emit(INFO, 'client_connected', clients=len(self.clients))
+        try:
+            while not conn.closed:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # longer than MAX_LINE
+                    conn.send({'type': 'error', 'error': 'request too long'})
+                    break
+                if not line:
+                    break
+                if line.strip():
+                    await self.handle_line(conn, line)
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            del self.clients[conn]
+            for game in list(conn.games):
+                self.leave(conn, game)
+            conn.close()
+            tracer.emit(INFO, 'client_disconnected', clients=len(self.clients))
+
+    async def handle_line(self, conn, line):
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+            request_id = request.get('id')
+            op = request.get('op')
+            handler = self.HANDLERS.get(op)
+            if handler is None:
+                raise ValueError(f"unknown op {op!r}")
+            reply = await handler(self, conn, request)
+        except ValueError as error:
+            # The server's own checks: the message is meant for the client
+            reply = {'type': 'error', 'error': str(error)}
+        except Exception as error:
+            # Anything else is a bug; keep the details in the trace and tell the client nothing about them
+            tracer.emit(WARNING, 'request_failed', request=line[:200], error=repr(error),
+                        traceback=traceback.format_exc())
+            reply = {'type': 'error', 'error': 'internal error'}
+        if reply is not None:
+            if request_id is not None:
+                reply['id'] = request_id
+            conn.send(reply)
+
+    def game(self, request):
+        game_id = request.get('game')
+        # bool is an int subclass, so true/false would otherwise name games 1 and 0
+        game = self.games.get(game_id) if type(game_id) is int else None
+        if game is None:
+            raise ValueError(f"no game {request.get('game')!r}")
+        return game
+
+    """Seat conn in game ('both' takes both seats, 'watch' none)"""
+    def seat(self, conn, game, side):
+        if side not in SEATS:
+            raise ValueError(f"bad side {side!r}")
+        wanted = SIDES if side == 'both' else (side,) if side in SIDES else ()
+        taken = [name for name in wanted if game.seats[name] is not None]
+        if taken:
+            raise ValueError(f"seat {taken[0]} is taken in game {game.id}")
+        for name in wanted:
+            game.seats[name] = conn
+        if not wanted:
+            game.watchers.add(conn)
+        conn.games.add(game)
+
+    """Take conn out of game; a game nobody is connected to any more is dropped"""
+    def leave(self, conn, game):
+        for side, seated in game.seats.items():
+            if seated is conn:
+                game.seats[side] = None
+        game.watchers.discard(conn)
+        conn.games.discard(game)
+        if not game.members():
+            self.games.pop(game.id, None)
+
+    # ----- Requests ----- #
+    async def op_new(self, conn, request):
+        if len(self.games) >= self.max_games:
+            raise ValueError("server is full")
+        side = request.get('side', 'white')
+        if side not in SEATS:
+            raise ValueError(f"bad side {side!r}")
+        # Only a request that is going to succeed uses up a game id
+        game = ServerGame(self.next_id)
+        self.next_id += 1
+        self.seat(conn, game, side)
+        self.games[game.id] = game
+        return game.state()
+
+    async def op_join(self, conn, request):
+        game = self.game(request)
+        side = request.get('side')
+        if side is None:
+            side = next((name for name in SIDES if game.seats[name] is None), 'watch')
+        self.seat(conn, game, side)
+        return game.state()
+
+    async def op_state(self, conn, request):
+        return self.game(request).state()
+
+    async def op_leave(self, conn, request):
+        self.leave(conn, self.game(request))
+        return {'type': 'left', 'game': request.get('game')}
+
+    '''
+        op_move() Method:
+            Checks the turn against legal_turns(), plays it hop by hop through move_piece (play_turn),
+            then queues one diff for every member of the game
+            Nothing in here awaits, so no other request can run between the turn and its diffs
+            (send_line only queues); keep it that way, or turns could reach members out of order
+    '''
+    async def op_move(self, conn, request):
+        game = self.game(request)
+        game_state = game.game_state
+        if game.status:
+            raise ValueError(f"game {game.id} is over ({game.status})")
+        if game.seats[game_state.turn] is not conn:
+            raise ValueError(f"not your turn ({game_state.turn} to move)")
+        move = find_move(game_state.legal_turns(), str(request.get('move', '')))
+        before = game.snapshot()
+        game_state.play_turn(move)
+        game.status = game_state.check_game_over()
+        self.moves += 1
+
+        diff = {'type': 'diff', 'game': game.id, 'ply': len(game_state.undo_stack), 'move': move.notation(),
+                'squares': square_diff(before, game.snapshot()), 'turn': game_state.turn,
+                'quiet': game_state.moves_since_last_capture, 'status': game.status,
+                'legal': [] if game.status else [turn.notation() for turn in game_state.legal_turns()]}
+        line = (json.dumps(diff, separators=(',', ':')) + '\n').encode()
+        for member in game.members():
+            if member is not conn:
+                member.send_line(line)
+        # The mover's copy answers its request, so it carries the id
+        return diff
+
+    HANDLERS = {'new': op_new, 'join': op_join, 'state': op_state, 'leave': op_leave, 'move': op_move}
+
+
+# ----- Load Test ----- #
+'''
+    _load_client() Function:
+        One bot connection: plays games random move by random move, holding both seats
+        Appends each move's round-trip time to latencies
+'''
+async def _load_client(host, port, games, rng, latencies, totals):
+    reader, writer = await asyncio.open_connection(host, port, limit=1 << 20)
+
+    async def request(message):
+        writer.write((json.dumps(message) + '\n').encode())
+        await writer.drain()
+        reply = json.loads(await reader.readline())
+        if reply.get('type') == 'error':
+            raise RuntimeError(reply['error'])
+        return reply
+
+    try:
+        for _ in range(games):
+            state = await request({'op': 'new', 'side': 'both'})
+            game_id = state['game']
+            while not state['status']:
+                start = perf_counter()
+                state = await request({'op': 'move', 'game': game_id, 'move': rng.choice(state['legal'])})
+                latencies.append(perf_counter() - start)
+            await request({'op': 'leave', 'game': game_id})
+            totals['games'] += 1
+    finally:
+        writer.close()
+
+'''
+    run_load_test() Function:
+        clients bots connect at once and each plays games games; returns a stats dict
+        with games, moves, elapsed seconds, moves/s and round-trip p50/p99 in milliseconds
+'''
+async def run_load_test(host, port, clients=100, games=5, seed=0):
+    latencies = []
+    totals = {'games': 0}
+    start = perf_counter()
+    results = await asyncio.gather(*(_load_client(host, port, games, random.Random(seed * 1_000_003 + i),
+                                                  latencies, totals) for i in range(clients)),
+                                   return_exceptions=True)
+    elapsed = perf_counter() - start
+    errors = [result for result in results if isinstance(result, BaseException)]
+    latencies.sort()
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000 if latencies else 0.0
+    return {'clients': clients, 'games': totals['games'], 'moves': len(latencies), 'elapsed': elapsed,
+            'moves_per_second': len(latencies) / elapsed if elapsed else 0.0, 'p50_ms': pick(0.5),
+            'p99_ms': pick(0.99), 'errors': [str(error) for error in errors]}
+
+
+async def _serve(args):
+    server = await GameServer(args.max_games, args.max_queue).start(args.host, args.port)
+    print(f"Serving checkers on {args.host}:{server.port}")
+    async with server.server:
+        await server.server.serve_forever()
+
+async def _load_test(args):
+    server = None
+    port = args.port
+    if args.local:
+        # A server in this process, on a free port
+        server = await GameServer(max_queue=args.max_queue).start(args.host, 0)
+        port = server.port
+    try:
+        stats = await run_load_test(args.host, port, args.clients, args.games, args.seed)
+    finally:
+        if server is not None:
+            await server.close()
+    print(f"{stats['clients']} clients played {stats['games']} games, {stats['moves']} moves in {stats['elapsed']:.2f}s "
+          f"({stats['moves_per_second']:.0f} moves/s), round trip p50 {stats['p50_ms']:.2f} ms, "
+          f"p99 {stats['p99_ms']:.2f} ms")
+    for error in stats['errors'][:10]:
+        print(f"client error: {error}")
+    return 1 if stats['errors'] else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m pycheckers.server', description='Host checkers games over TCP.')
+    parser.add_argument('--host', default='127.0.0.1', help="address to listen on / connect to (default 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8765, help="TCP port (default 8765)")
+    parser.add_argument('--max-queue', type=int, default=256, help="messages a client may fall behind before it is dropped")
+    commands = parser.add_subparsers(dest='command')
+    serve = commands.add_parser('serve', help="run the server (the default)")
+    serve.add_argument('--max-games', type=int, default=100_000, help="games hosted at once (default 100000)")
+    load = commands.add_parser('loadtest', help="play random games against a server on localhost")
+    load.add_argument('--clients', type=int, default=100, help="concurrent bot connections (default 100)")
+    load.add_argument('--games', type=int, default=5, help="games each bot plays (default 5)")
+    load.add_argument('--seed', type=int, default=0, help="base seed for the bots' moves")
+    load.add_argument('--local', action='store_true', help="start a server in this process instead of connecting to --port")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'loadtest':
+            return asyncio.run(_load_test(args))
+        args.max_games = getattr(args, 'max_games', 100_000)
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,155 @@
+'''
+Self-Play Simulator
+    Plays complete headless games on GameState and check_game_over across a pool of worker processes
+    Every game gets its own seed derived from a base seed, so any single game can be replayed exactly
+    Results stream back as games finish
+    Run with `python -m pycheckers.simulate` (see --help)
+'''
+import argparse
+import os
+import random
+import sys
+from collections import Counter, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from time import perf_counter
+
+from .book import OpeningBook
+from .engine import Engine
+from .fen import START_FEN
+from .pdn import RESULT_TOKENS, PdnGame, format_game, open_archive
+from .rules import GameState, create_board, set_checkers
+from .tablebase import Tablebase
+
+PLAYERS = ('random', 'ai')
+
+'''
+    GameResult Record:
+        index and seed identify the game, winner is 'white', 'red' or 'draw' (GameState side names)
+        moves holds every turn in notation form, so a game can be checked or replayed
+'''
+GameResult = namedtuple('GameResult', ('index', 'seed', 'winner', 'plies', 'moves', 'elapsed'))
+
+
+"""Seed for game number index of a run; independent of how games are spread over processes"""
+def game_seed(base_seed, index):
+    return base_seed * 1_000_003 + index
+
+# One engine per worker process, search depth, tablebase directory and book file, reset between games
+_engines = {}
+
+"""The AI player searches to a fixed depth with no time limit, so its choices depend only on the position (and the seed)"""
+def _engine(max_depth, tablebase=None, book=None):
+    key = (max_depth, tablebase, book)
+    if key not in _engines:
+        _engines[key] = Engine(time_limit=float('inf'), max_depth=max_depth, tt_megabytes=4,
+                               tablebase=Tablebase(tablebase) if tablebase else None,
+                               book=OpeningBook(book) if book else None)
+    return _engines[key]
+
+'''
+    play_game() Function:
+        Plays one game to the end from the opening position
+        white/red pick the player for each side: 'random' or 'ai'
+        The first random_opening turns are random for both sides so AI games do not all repeat
+        tablebase is a directory of endgame tables and book an opening book file for the AI player
+        Book moves are drawn with the game's seed, so games stay reproducible
+        on_turn(game_state) is called before every turn, e.g. to record positions (see pycheckers.dataset)
+'''
+def play_game(index, seed, white='random', red='random', max_depth=4, random_opening=4, tablebase=None, book=None,
+              on_turn=None):
+    start = perf_counter()
+    rng = random.Random(seed)
+    players = {'white': white, 'red': red}
+    if 'ai' in players.values():
+        engine = _engine(max_depth, tablebase, book)
+        engine.reset()
+        engine.rng.seed(seed)
+
+    board = create_board(0, 0, 80)
+    set_checkers(board, 80)
+    game_state = GameState(board)
+    moves = []
+    winner = game_state.check_game_over()
+    while winner is None:
+        if on_turn is not None:
+            on_turn(game_state)
+        turns = game_state.legal_turns()
+        if players[game_state.turn] == 'ai' and len(moves) >= random_opening:
+            move = engine.search(game_state).move
+        else:
+            move = rng.choice(turns)
+        moves.append(move.notation())
+        game_state.play_turn(move)
+        winner = game_state.check_game_over()
+    return GameResult(index, seed, winner, len(moves), tuple(moves), perf_counter() - start)
+
+'''
+    run_games() Function:
+        Generator that yields a GameResult for each of count games, in the order they finish
+        jobs is the number of worker processes (default: one per CPU)
+        Only a few games per worker are queued at a time, so memory stays flat for long runs
+'''
+def run_games(count, base_seed=0, jobs=None, white='random', red='random', max_depth=4, random_opening=4,
+              tablebase=None, book=None):
+    jobs = jobs or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = set()
+        next_index = 0
+        while next_index < count or pending:
+            while next_index < count and len(pending) < jobs * 4:
+                pending.add(pool.submit(play_game, next_index, game_seed(base_seed, next_index),
+                                        white, red, max_depth, random_opening, tablebase, book))
+                next_index += 1
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                yield future.result()
+
+"""PDN record of a finished game; White is the side that moves first, as in GameState, which the FEN tag records"""
+def _pdn_game(result, args):
+    tags = {'Event': 'pycheckers self-play', 'Round': result.index + 1,
+            'White': args.white, 'Black': args.red, 'Seed': result.seed, 'FEN': START_FEN}
+    return PdnGame(tags, result.moves, RESULT_TOKENS[result.winner])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m pycheckers.simulate', description='Run headless self-play games.')
+    parser.add_argument('--games', type=int, default=100, help="number of games to play (default 100)")
+    parser.add_argument('--seed', type=int, default=0, help="base seed; game i uses a seed derived from it")
+    parser.add_argument('--jobs', type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument('--white', choices=PLAYERS, default='random', help="player for the side drawn red, which moves first")
+    parser.add_argument('--red', choices=PLAYERS, default='random', help="player for the side drawn white")
+    parser.add_argument('--depth', type=int, default=4, help="search depth for the ai player (default 4)")
+    parser.add_argument('--opening', type=int, default=4, help="random turns before the ai starts searching")
+    parser.add_argument('--tablebase', metavar='DIR', help="endgame tables for the ai player (see pycheckers.tablebase)")
+    parser.add_argument('--book', metavar='FILE', help="opening book for the ai player (see pycheckers.book)")
+    parser.add_argument('--pdn', metavar='FILE', help="write every game to a PDN file (.gz to compress)")
+    parser.add_argument('--verbose', action='store_true', help="print a line for every finished game")
+    args = parser.parse_args(argv)
+
+    tally = Counter()
+    plies = 0
+    archive = open_archive(args.pdn, 'w') if args.pdn else None
+    start = perf_counter()
+    for finished, result in enumerate(run_games(args.games, args.seed, args.jobs, args.white, args.red,
+                                                args.depth, args.opening, args.tablebase, args.book), 1):
+        tally[result.winner] += 1
+        if archive:
+            archive.write(format_game(_pdn_game(result, args)) + '\n')
+        plies += result.plies
+        if args.verbose:
+            print(f"game {result.index} seed {result.seed}: {result.winner} after {result.plies} plies "
+                  f"({result.elapsed:.2f}s)")
+        elif finished % 100 == 0:
+            print(f"{finished}/{args.games} games, {finished / (perf_counter() - start):.1f} games/s")
+
+    if archive:
+        archive.close()
+    elapsed = perf_counter() - start
+    print(f"{args.games} games in {elapsed:.2f}s ({args.games / elapsed:.1f} games/s), "
+          f"average {plies / max(args.games, 1):.1f} plies")
+    print(f"white (drawn red) {tally['white']}, red (drawn white) {tally['red']}, draws {tally['draw']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
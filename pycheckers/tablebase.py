@@ -0,0 +1,346 @@
+'''
+Endgame Tablebases
+    Win/loss/draw with distance for every position with up to a few pieces on the board
+    Built by retrograde analysis on the bitboard rules (the same moves as legal_moves and the same
+    end-of-turn promotion as move_piece), with the move generation spread over a process pool;
+    the solving passes that follow run in the parent process
+    Every material signature gets its own file, one byte per position, probed through mmap
+    Run with `python -m pycheckers.tablebase` (see --help)
+'''
+import argparse
+import mmap
+import os
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from math import comb
+from time import perf_counter
+
+from .bitboard import apply_turn, generate_turns, iter_squares
+
+MAGIC = b'PCTB'
+HEADER_BYTES = 8      # MAGIC + the four signature counts
+BUDGET = 40           # check_game_over's 40-move rule; a capture starts it again
+
+'''
+    Value Bytes:
+        0           draw
+        d (1-40)    the side to move wins when at least d plies are left before the 40-move draw,
+                    i.e. while moves_since_last_capture <= 40 - d
+        LOSS | d    the side to move loses under the same condition
+        INVALID     an index that is not a real position (two pieces on one square)
+'''
+LOSS = 0x80
+INVALID = 0xFF
+# Only used while solving: not decided yet, and a draw that no extra time can change
+_UNDECIDED = 0
+_DRAWN = 0xFD
+
+CHUNK = 20000
+
+
+# ----- Indexing ----- #
+'''
+    Signatures and Indices:
+        A signature is (white men, white kings, red men, red kings) with white to move
+        Red to move is looked up by turning the board around (square sq -> 31 - sq) and swapping colours,
+        so only white-to-move tables are stored
+        Each piece group is ranked as a combination of the squares it may stand on
+        (men never stand on their own promotion row, since they are crowned when the turn ends)
+'''
+_REVERSED_BYTES = bytes(int(f"{b:08b}"[::-1], 2) for b in range(256))
+
+"""Mask with every square turned around the board centre (sq -> 31 - sq)"""
+def flip(b):
+    return (_REVERSED_BYTES[b & 0xFF] << 24 | _REVERSED_BYTES[b >> 8 & 0xFF] << 16
+            | _REVERSED_BYTES[b >> 16 & 0xFF] << 8 | _REVERSED_BYTES[b >> 24])
+
+# (first square, number of squares) each piece group may use: white men, white kings, red men, red kings
+_GROUP_SQUARES = ((4, 28), (0, 32), (0, 28), (0, 32))
+
+def signature_of(white, red, kings):
+    return ((white & ~kings).bit_count(), (white & kings).bit_count(), (red & ~kings).bit_count(), (red & kings).bit_count())
+
+def table_size(signature):
+    size = 1
+    for count, (first, squares) in zip(signature, _GROUP_SQUARES):
+        size *= comb(squares, count)
+    return size
+
+"""Colex rank of the squares in b among the squares starting at first"""
+def _rank(b, first):
+    rank = 0
+    for i, sq in enumerate(iter_squares(b), 1):
+        rank += comb(sq - first, i)
+    return rank
+
+"""Inverse of _rank: mask of count squares"""
+def _unrank(rank, count, first, squares):
+    b = 0
+    c = squares
+    for i in range(count, 0, -1):
+        c -= 1
+        while comb(c, i) > rank:
+            c -= 1
+        rank -= comb(c, i)
+        b |= 1 << (c + first)
+    return b
+
+"""Index of a white-to-move position in its signature's table"""
+def position_index(signature, white, red, kings):
+    index = 0
+    for count, (first, squares), group in zip(signature, _GROUP_SQUARES,
+                                              (white & ~kings, white & kings, red & ~kings, red & kings)):
+        index = index * comb(squares, count) + _rank(group, first)
+    return index
+
+"""Returns (white, red, kings) for an index, or None if two pieces would share a square"""
+def position_at(signature, index):
+    groups = []
+    for count, (first, squares) in reversed(tuple(zip(signature, _GROUP_SQUARES))):
+        size = comb(squares, count)
+        groups.append(_unrank(index % size, count, first, squares))
+        index //= size
+    red_kings, red_men, white_kings, white_men = groups
+    occupied = 0
+    for group in groups:
+        if occupied & group:
+            return None
+        occupied |= group
+    return white_men | white_kings, red_men | red_kings, white_kings | red_kings
+
+def table_path(directory, signature):
+    return os.path.join(directory, "tb_{}{}_{}{}.bin".format(*signature))
+
+
+# ----- Probing ----- #
+'''
+    Tablebase Class:
+        Read-only view of a directory of tables
+        Files are mapped on first use, so only the pages that are probed are ever read
+        max_pieces is the largest piece count every table up to which is present
+'''
+class Tablebase:
+    def __init__(self, directory):
+        self.directory = directory
+        self.tables = {}
+        self.max_pieces = 0
+        while all(os.path.exists(table_path(directory, signature))
+                  for signature in _all_signatures(self.max_pieces + 1)):
+            self.max_pieces += 1
+
+    """The mapped bytes for a signature, or None if there is no such table"""
+    def _table(self, signature):
+        table = self.tables.get(signature, False)
+        if table is False:
+            table = None
+            path = table_path(self.directory, signature)
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                if table[:HEADER_BYTES] != MAGIC + bytes(signature):
+                    raise ValueError(f"{path} is not a table for {signature}")
+            self.tables[signature] = table
+        return table
+
+    """Raw value byte for a position, or None if it is not covered"""
+    def value(self, white, red, kings, white_to_move):
+        if not white_to_move:
+            white, red, kings = flip(red), flip(white), flip(kings)
+        signature = signature_of(white, red, kings)
+        table = self._table(signature)
+        if table is None:
+            return None
+        return table[HEADER_BYTES + position_index(signature, white, red, kings)]
+
+    '''
+        probe() Method:
+            Result for side-relative masks with quiet plies since the last capture
+            Returns d > 0 for a win in d plies of budget, -d for a loss, 0 for a draw, None if not covered
+    '''
+    def probe(self, own, enemy, kings, is_white, quiet=0):
+        if (own | enemy).bit_count() > self.max_pieces:
+            return None
+        value = self.value(*((own, enemy) if is_white else (enemy, own)), kings, is_white)
+        if value is None or value == INVALID:
+            return None
+        distance = value & ~LOSS
+        if not distance or distance > BUDGET - quiet:
+            return 0
+        return -distance if value & LOSS else distance
+
+    def close(self):
+        for table in self.tables.values():
+            if table is not None:
+                table.close()
+        self.tables.clear()
+
+
+# ----- Generation ----- #
+"""Every signature with at least one piece a side and at most max_pieces in total"""
+def _all_signatures(max_pieces):
+    return [signature for total in range(2, max_pieces + 1) for white in range(1, total)
+            for signature in _group_signatures(white, total - white)]
+
+def _group_signatures(white_count, red_count):
+    return [(wm, white_count - wm, rm, red_count - rm)
+            for wm in range(white_count + 1) for rm in range(red_count + 1)]
+
+# Smaller tables, opened once per worker process
+_worker_tables = {}
+
+'''
+    _expand_chunk() Function:
+        Runs in the pool: generates the moves of every position in one slice of a table
+        Positions decided straight away (no moves, or captures into smaller tables) get their value;
+        the rest list their quiet children as indices into the group being solved
+        Returns (values, child counts, children) as bytes
+'''
+def _expand_chunk(directory, offsets, signature, start, stop):
+    smaller = _worker_tables.get(directory)
+    if smaller is None:
+        smaller = _worker_tables[directory] = Tablebase(directory)
+    values = bytearray(stop - start)
+    counts = array('I')
+    children = array('I')
+    for i, index in enumerate(range(start, stop)):
+        position = position_at(signature, index)
+        if position is None:
+            values[i] = INVALID
+            counts.append(0)
+            continue
+        white, red, kings = position
+        moves = generate_turns(white, red, kings, True)
+        if not moves:
+            values[i] = LOSS | 1
+            counts.append(0)
+            continue
+
+        if moves[0].captured:
+            # Captures are forced and start the 40-move count again, so the smaller table has the answer
+            best = LOSS | 1
+            for move in moves:
+                own, enemy, child_kings, promoted = apply_turn(white, red, kings, True, move)
+                reply = smaller.value(own, enemy, child_kings, False) if enemy else LOSS
+                if reply & LOSS:
+                    best = 1
+                    break
+                if not reply:
+                    best = _DRAWN
+            values[i] = best
+            counts.append(0)
+            continue
+
+        for move in moves:
+            own, enemy, child_kings, promoted = apply_turn(white, red, kings, True, move)
+            # Red to move: turn the board around so it is a white-to-move position of the group
+            child = (flip(enemy), flip(own), flip(child_kings))
+            child_signature = signature_of(*child)
+            children.append(offsets[child_signature] + position_index(child_signature, *child))
+        counts.append(len(moves))
+    return bytes(values), counts.tobytes(), children.tobytes()
+
+'''
+    solve_group() Function:
+        Solves every table with white_count white and red_count red pieces, together with the
+        mirrored group (quiet moves hand the turn to the other colour, and men can be crowned)
+        Pass b decides the positions that are won or lost with b plies of budget: a win needs one
+        child lost within b - 1, a loss needs every child won within b - 1
+        Only the move expansion runs in pool; the passes are serial, in this process, since every pass
+        reads the whole group's values and children, which would have to be shipped to the workers each time
+        Tables with fewer pieces must already be on disk
+'''
+def solve_group(directory, white_count, red_count, pool):
+    signatures = _group_signatures(white_count, red_count)
+    if white_count != red_count:
+        signatures += _group_signatures(red_count, white_count)
+    offsets = {}
+    total = 0
+    for signature in signatures:
+        offsets[signature] = total
+        total += table_size(signature)
+
+    values = bytearray()
+    starts = array('Q', [0])
+    children = array('I')
+    futures = [pool.submit(_expand_chunk, directory, offsets, signature, start, min(start + CHUNK, table_size(signature)))
+               for signature in signatures for start in range(0, table_size(signature), CHUNK)]
+    for future in futures:
+        chunk_values, chunk_counts, chunk_children = future.result()
+        values += chunk_values
+        counts = array('I')
+        counts.frombytes(chunk_counts)
+        for count in counts:
+            starts.append(starts[-1] + count)
+        children.frombytes(chunk_children)
+
+    undecided = [i for i in range(total) if values[i] == _UNDECIDED]
+    for budget in range(2, BUDGET + 1):
+        # Values set in this pass have distance == budget, so they never satisfy the tests below
+        win_limit = budget - 1
+        loss_limit = LOSS + budget - 1
+        remaining = []
+        for i in undecided:
+            all_won = True
+            for child in children[starts[i]:starts[i + 1]]:
+                value = values[child]
+                if LOSS < value <= loss_limit:
+                    values[i] = budget
+                    break
+                if not 0 < value <= win_limit:
+                    all_won = False
+            else:
+                if all_won:
+                    values[i] = LOSS | budget
+                else:
+                    remaining.append(i)
+        undecided = remaining
+        if not undecided:
+            break
+
+    os.makedirs(directory, exist_ok=True)
+    stats = {}
+    for signature in signatures:
+        table = values[offsets[signature]:offsets[signature] + table_size(signature)]
+        table = table.replace(bytes([_DRAWN]), b'\0')
+        with open(table_path(directory, signature), 'wb') as f:
+            f.write(MAGIC + bytes(signature))
+            f.write(table)
+        wins = sum(1 for value in table if 0 < value < LOSS)
+        losses = sum(1 for value in table if LOSS < value < INVALID)
+        stats[signature] = (wins, losses, table.count(0))
+    return stats
+
+'''
+    build() Function:
+        Builds every table with up to max_pieces pieces, smallest first
+        Progress goes to the terminal; existing tables are rebuilt
+'''
+def build(directory, max_pieces, jobs=None, out=print):
+    start = perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        for total in range(2, max_pieces + 1):
+            for white_count in range(total - 1, 0, -1):
+                red_count = total - white_count
+                if red_count > white_count:
+                    continue  # solved together with its mirror
+                group_start = perf_counter()
+                stats = solve_group(directory, white_count, red_count, pool)
+                for signature, (wins, losses, draws) in stats.items():
+                    out("tb_{}{}_{}{}: ".format(*signature) + f"{wins} wins, {losses} losses, {draws} draws")
+                out(f"{white_count}v{red_count} solved in {perf_counter() - group_start:.1f}s")
+    out(f"Tablebases up to {max_pieces} pieces written to {directory} in {perf_counter() - start:.1f}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m pycheckers.tablebase', description='Build endgame tablebases.')
+    parser.add_argument('--pieces', type=int, default=4, help="largest number of pieces on the board (default 4)")
+    parser.add_argument('--dir', default='tablebases', help="output directory (default ./tablebases)")
+    parser.add_argument('--jobs', type=int, default=None, help="worker processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+    build(args.dir, args.pieces, args.jobs)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+'''
+Text Cache
+    Wrapped and rendered text surfaces keyed by (font, text, colour, wrap width)
+    Holds a bounded number of entries and evicts the least recently used one first
+    Works on any object with pygame's Font size()/render() methods, so it never imports pygame
+'''
+from collections import OrderedDict
+
+
+'''
+wrap_text() Function:
+    Wraps text to fit within a specified width
+    Splits text into lines that fit within the max width
+'''
+def wrap_text(text, font, max_width):
+    words = text.split(' ')
+    lines = []
+    current_line = ''
+
+    for word in words:
+        # Check if adding the next word exceeds the max width
+        test_line = current_line + word + " "
+        if font.size(test_line)[0] > max_width:
+            # current_line is not empty, push it and start a new one
+            if current_line != "":
+                lines.append(current_line.strip())
+            current_line = word + " "
+        else:
+            current_line = test_line
+    # Add the last line if it exists
+    if current_line:
+        lines.append(current_line)
+
+    return lines
+
+'''
+    TextCache Class:
+        lines() returns the rendered surfaces for a piece of text, one per wrapped line
+        render() is the single-line shortcut used for labels and status strings
+        hits/misses are counted so the cache size can be tuned
+'''
+class TextCache:
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    """Returns a tuple of rendered line surfaces; max_width=None means no wrapping"""
+    def lines(self, font, text, color, max_width=None):
+        key = (font, text, tuple(color), max_width)
+        surfaces = self.entries.get(key)
+        if surfaces is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return surfaces
+
+        self.misses += 1
+        wrapped = [text] if max_width is None else wrap_text(text, font, max_width)
+        surfaces = tuple(font.render(line, True, color) for line in wrapped)
+        self.entries[key] = surfaces
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)  # least recently used
+        return surfaces
+
+    """Returns the surface for a single unwrapped line of text"""
+    def render(self, font, text, color):
+        return self.lines(font, text, color)[0]
+
+    def clear(self):
+        self.entries.clear()
@@ -0,0 +1,187 @@
+'''
+Event Tracing
+    Structured records of what the game does (moves, captures, promotions, game over, search timings)
+    kept in an in-memory ring buffer instead of printed to the terminal
+    Each record has a level; anything below the tracer's level is dropped, and hot call sites check
+    `tracer.level <= INFO` first so a disabled tracer costs one comparison and builds nothing
+    Sampling keeps only every n-th record of a chatty event
+    A background thread can append records to a file as JSON lines, so the game never waits on disk I/O
+'''
+import json
+import queue
+import threading
+from collections import deque, namedtuple
+from contextlib import contextmanager
+from time import perf_counter
+
+DEBUG, INFO, WARNING, OFF = 10, 20, 30, 100
+LEVELS = {'debug': DEBUG, 'info': INFO, 'warning': WARNING, 'off': OFF}
+LEVEL_NAMES = {DEBUG: 'DEBUG', INFO: 'INFO', WARNING: 'WARNING'}
+
+'''
+    TraceRecord Record:
+        time is perf_counter() seconds, event a short name such as 'move' or 'game_over'
+        fields holds the event's data; squares are given in 1-32 PDN numbering
+'''
+TraceRecord = namedtuple('TraceRecord', ('time', 'level', 'event', 'fields'))
+
+
+"""One line of text for a record, e.g. '12.345 INFO move from=22 to=18'"""
+def format_record(record):
+    fields = ' '.join(f"{name}={value}" for name, value in record.fields.items())
+    return f"{record.time:.3f} {LEVEL_NAMES.get(record.level, record.level)} {record.event} {fields}".rstrip()
+
+"""A record as a JSON object on one line"""
+def record_json(record):
+    return json.dumps({'time': round(record.time, 6), 'level': LEVEL_NAMES.get(record.level, record.level),
+                       'event': record.event, **record.fields}, default=str)
+
+
+'''
+    FileFlusher Class:
+        Daemon thread that appends records to a file as JSON lines
+        put() only queues the record; the thread writes whatever has piled up in one go
+'''
+class FileFlusher:
+    def __init__(self, path, interval=0.5):
+        self.path = path
+        self.interval = interval
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name='pycheckers-trace', daemon=True)
+        self._thread.start()
+
+    def put(self, record):
+        self._queue.put(record)
+
+    def _run(self):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            while True:
+                try:
+                    batch = [self._queue.get(timeout=self.interval)]
+                except queue.Empty:
+                    continue
+                # Drain everything queued meanwhile, so a burst costs one write
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = None in batch
+                f.writelines(record_json(record) + '\n' for record in batch if record is not None)
+                f.flush()
+                if stop:
+                    return
+
+    """Write out everything queued so far and stop the thread"""
+    def close(self, timeout=5.0):
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+
+'''
+    Tracer Class:
+        level: records below it are dropped (OFF drops everything, the default)
+        capacity: size of the ring buffer; the oldest records fall out first
+        sample: {event: n} keeps one record in n for that event
+        echo: also print each kept record, like the old print statements did
+'''
+class Tracer:
+    def __init__(self, level=OFF, capacity=4096, sample=None, echo=False):
+        self.level = OFF
+        self.buffer = deque(maxlen=capacity)
+        self.sample = {}
+        self._seen = {}
+        self.echo = False
+        self.flusher = None
+        self.configure(level, capacity, sample, echo)
+
+    '''
+        configure() Method:
+            Changes the settings in place, so modules holding the shared tracer see them
+            path starts flushing records to that file (closing any earlier flusher)
+    '''
+    def configure(self, level=None, capacity=None, sample=None, echo=None, path=None):
+        if level is not None:
+            self.level = LEVELS[level.lower()] if isinstance(level, str) else level
+        if capacity is not None and capacity != self.buffer.maxlen:
+            self.buffer = deque(self.buffer, maxlen=capacity)
+        if sample is not None:
+            self.sample = dict(sample)
+            self._seen = {}
+        if echo is not None:
+            self.echo = echo
+        if path is not None:
+            self.close()
+            self.flusher = FileFlusher(path)
+
+    """Whether a record at this level would be kept; guard call sites that build costly fields with it"""
+    def enabled(self, level):
+        return level >= self.level
+
+    """Record an event; returns the TraceRecord, or None if it was filtered out"""
+    def emit(self, level, event, **fields):
+        if level < self.level:
+            return None
+        every = self.sample.get(event)
+        if every:
+            seen = self._seen.get(event, 0)
+            self._seen[event] = seen + 1
+            if seen % every:
+                return None
+        record = TraceRecord(perf_counter(), level, event, fields)
+        self.buffer.append(record)
+        if self.echo:
+            print(format_record(record))
+        if self.flusher is not None:
+            self.flusher.put(record)
+        return record
+
+    def debug(self, event, **fields):
+        return self.emit(DEBUG, event, **fields)
+
+    def info(self, event, **fields):
+        return self.emit(INFO, event, **fields)
+
+    def warning(self, event, **fields):
+        return self.emit(WARNING, event, **fields)
+
+    '''
+        span() Method:
+            Context manager that times its block and emits event with a seconds field
+            When the level is disabled the block runs untimed
+    '''
+    @contextmanager
+    def span(self, event, level=DEBUG, **fields):
+        if level < self.level:
+            yield
+            return
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.emit(level, event, seconds=round(perf_counter() - start, 6), **fields)
+
+    """Records in the buffer, oldest first, optionally only those of one event"""
+    def records(self, event=None):
+        return [record for record in self.buffer if event is None or record.event == event]
+
+    def clear(self):
+        self.buffer.clear()
+
+    """Stop the file flusher (if any) once it has written everything"""
+    def close(self):
+        if self.flusher is not None:
+            self.flusher.close()
+            self.flusher = None
+
+
+# The tracer the game modules write to; configure it rather than replacing it
+tracer = Tracer()
+
+"""Parse 'event=n' command line values into a sample dict"""
+def parse_sample(values):
+    sample = {}
+    for value in values:
+        event, _, every = value.partition('=')
+        sample[event] = int(every or 1)
+    return sample
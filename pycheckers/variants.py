@@ -0,0 +1,309 @@
+'''
+Rule Variants
+    Board size, starting rows and capture rules for each kind of draughts GameState can play
+    A Variant builds all of its geometry when it is created: square numbering, neighbours, diagonal rays,
+    step and jump tables and the promotion rows, so move generation on a bigger board is still table lookups
+    English draughts keeps the shift-based generator in pycheckers.bitboard (the engine, book, tablebase,
+    PDN and server modules only play English); the other variants generate moves from their tables
+'''
+from .bitboard import (Bitboard, DIRECTION_DELTAS, KIND_DIRECTIONS, KING, Move, RED_MAN, WHITE_MAN, apply_turn,
+                       generate_turns, iter_squares)
+
+
+'''
+    Variant Class:
+        name: what the command line calls it
+        size: squares along each side of the board; rows: rows of men each side starts with
+        flying_kings: kings slide any distance and capture from a distance
+        men_capture_backward: men may capture in all four directions (they still move forward)
+        max_capture: a capture must take as many pieces as possible
+        draw_plies: plies without a capture before the game is drawn
+        shifts: use the bitboard module's shift generator (only right for 8x8 English rules)
+        Square numbers run along the dark squares row by row from the top, as in PDN (square = number - 1)
+'''
+class Variant:
+    def __init__(self, name, size, rows, flying_kings=False, men_capture_backward=False, max_capture=False,
+                 draw_plies=40, shifts=False):
+        self.name = name
+        self.size = size
+        self.rows = rows
+        self.flying_kings = flying_kings
+        self.men_capture_backward = men_capture_backward
+        self.max_capture = max_capture
+        self.draw_plies = draw_plies
+        self.shifts = shifts
+
+        # Square index <-> (row, col); row 0 starts on column 1, like the 8x8 layout
+        per_row = size // 2
+        self.squares = size * per_row
+        self.full = (1 << self.squares) - 1
+        self.square_to_coord = tuple((sq // per_row, 2 * (sq % per_row) + (1 - (sq // per_row) % 2))
+                                     for sq in range(self.squares))
+        self.coord_to_square = {coord: sq for sq, coord in enumerate(self.square_to_coord)}
+
+        # RAYS[sq][d] -> ((sq, bit), ...) walking away from sq in direction d to the edge of the board
+        rays = []
+        for row, col in self.square_to_coord:
+            sq_rays = []
+            for d_row, d_col in DIRECTION_DELTAS:
+                ray = []
+                r, c = row + d_row, col + d_col
+                while 0 <= r < size and 0 <= c < size:
+                    ray.append((self.coord_to_square[(r, c)], 1 << self.coord_to_square[(r, c)]))
+                    r, c = r + d_row, c + d_col
+                sq_rays.append(tuple(ray))
+            rays.append(tuple(sq_rays))
+        self.rays = tuple(rays)
+
+        # STEPS[kind][sq] -> ((to_sq, to_bit), ...) and JUMPS[kind][sq] -> ((over_bit, land_sq, land_bit), ...)
+        # in the same layout as the bitboard module's tables; men may jump in more directions than they step
+        capture_directions = (KIND_DIRECTIONS[KING],) * 2 if men_capture_backward else KIND_DIRECTIONS[:2]
+        self.steps = tuple(tuple(tuple(ray[d][0] for d in directions if ray[d]) for ray in self.rays)
+                           for directions in KIND_DIRECTIONS)
+        self.jumps = tuple(tuple(tuple((ray[d][0][1],) + ray[d][1] for d in directions if len(ray[d]) > 1)
+                                 for ray in self.rays)
+                           for directions in capture_directions + (KIND_DIRECTIONS[KING],))
+
+        # White men move up and crown on row 0, red men crown on the last row; each side starts on its own rows
+        self.white_promotion = self._row_mask(range(1))
+        self.red_promotion = self._row_mask(range(size - 1, size))
+        self.white_start = self._row_mask(range(size - rows, size))
+        self.red_start = self._row_mask(range(rows))
+
+    def __repr__(self):
+        return f"Variant({self.name!r})"
+
+    def _row_mask(self, rows):
+        mask = 0
+        for sq, (row, col) in enumerate(self.square_to_coord):
+            if row in rows:
+                mask |= 1 << sq
+        return mask
+
+    """Masks (white, red, kings) of the opening position"""
+    def start_position(self):
+        return self.white_start, self.red_start, 0
+
+    """A bitboard for a board of Tiles that plays by these rules"""
+    def bitboard_from_tiles(self, board):
+        if self.shifts:
+            return Bitboard.from_tiles(board)
+        return VariantBitboard.from_tiles(board, self)
+
+    '''
+        generate_turns() Method:
+            Every complete legal turn for the side with pieces in own, like bitboard.generate_turns()
+            Captures are mandatory (only the longest ones under max_capture) and a chain continues
+            until no jump is left; captured pieces stay on the board until the turn ends, so they
+            block the capturing piece and cannot be jumped twice
+    '''
+    def generate_turns(self, own, enemy, kings, is_white):
+        if self.shifts:
+            return generate_turns(own, enemy, kings, is_white)
+        turns = []
+        for sq in iter_squares(own):
+            self._extend_captures(sq, kings >> sq & 1, is_white, enemy, (own | enemy) ^ (1 << sq), (sq,), 0, turns)
+        if turns:
+            if self.max_capture:
+                most = max(move.captured.bit_count() for move in turns)
+                turns = [move for move in turns if move.captured.bit_count() == most]
+            return turns
+        empty = self.full ^ (own | enemy)
+        for sq in iter_squares(own):
+            turns.extend(Move((sq, to_sq), 0) for to_sq in self._quiet_targets(sq, kings >> sq & 1, is_white, empty))
+        return turns
+
+    """Follow every capture chain from sq, appending a Move for each path that cannot jump further"""
+    def _extend_captures(self, sq, king, is_white, enemy, occupied, path, captured, turns):
+        extended = False
+        if king and self.flying_kings:
+            for ray in self.rays[sq]:
+                # Slide to the first piece on the diagonal; it must be an enemy not taken yet
+                for i, (over_sq, over_bit) in enumerate(ray):
+                    if occupied & over_bit:
+                        break
+                else:
+                    continue
+                if not enemy & over_bit or captured & over_bit:
+                    continue
+                # Then land on any empty square beyond it
+                for land_sq, land_bit in ray[i + 1:]:
+                    if occupied & land_bit:
+                        break
+                    extended = True
+                    self._extend_captures(land_sq, king, is_white, enemy, occupied, path + (land_sq,),
+                                          captured | over_bit, turns)
+        else:
+            for over_bit, land_sq, land_bit in self.jumps[KING if king else WHITE_MAN if is_white else RED_MAN][sq]:
+                if enemy & over_bit and not captured & over_bit and not occupied & land_bit:
+                    extended = True
+                    self._extend_captures(land_sq, king, is_white, enemy, occupied, path + (land_sq,),
+                                          captured | over_bit, turns)
+        if not extended and captured:
+            turns.append(Move(path, captured))
+
+    """Squares the piece on sq can move to without capturing, given the empty squares"""
+    def _quiet_targets(self, sq, king, is_white, empty):
+        if king and self.flying_kings:
+            targets = []
+            for ray in self.rays[sq]:
+                for to_sq, to_bit in ray:
+                    if not empty & to_bit:
+                        break
+                    targets.append(to_sq)
+            return targets
+        return [to_sq for to_sq, to_bit in self.steps[KING if king else WHITE_MAN if is_white else RED_MAN][sq]
+                if empty & to_bit]
+
+    '''
+        apply_turn() Method:
+            Plays a Move on side-relative masks, like bitboard.apply_turn(), crowning on this board's last rows
+            Returns (own, enemy, kings, promoted)
+    '''
+    def apply_turn(self, own, enemy, kings, is_white, move):
+        if self.shifts:
+            return apply_turn(own, enemy, kings, is_white, move)
+        from_bit = 1 << move.path[0]
+        to_bit = 1 << move.path[-1]
+        if move.captured:
+            enemy &= ~move.captured
+            kings &= ~move.captured
+        own ^= from_bit ^ to_bit
+        promoted = False
+        if kings & from_bit:
+            kings ^= from_bit ^ to_bit
+        elif to_bit & (self.white_promotion if is_white else self.red_promotion):
+            kings |= to_bit
+            promoted = True
+        return own, enemy, kings, promoted
+
+
+'''
+    VariantBitboard Class:
+        A Bitboard whose moves come from a Variant's tables instead of 32-bit shifts
+        GameState uses it for every variant other than English; the masks and piece_at() work the same
+'''
+class VariantBitboard(Bitboard):
+    __slots__ = ('variant',)
+
+    def __init__(self, variant, white=0, red=0, kings=0):
+        super().__init__(white, red, kings)
+        self.variant = variant
+
+    """Build the masks from a board of Tile objects"""
+    @classmethod
+    def from_tiles(cls, board, variant):
+        bitboard = cls(variant)
+        for sq, (row, col) in enumerate(variant.square_to_coord):
+            checker = board[row][col].hasChecker
+            if checker is None:
+                continue
+            bit = 1 << sq
+            if checker.is_white:
+                bitboard.white |= bit
+            else:
+                bitboard.red |= bit
+            if checker.king:
+                bitboard.kings |= bit
+        return bitboard
+
+    def copy(self):
+        return VariantBitboard(self.variant, self.white, self.red, self.kings)
+
+    def empty(self):
+        return self.variant.full ^ (self.white | self.red)
+
+    def turns(self, is_white):
+        if is_white:
+            return self.variant.generate_turns(self.white, self.red, self.kings, True)
+        return self.variant.generate_turns(self.red, self.white, self.kings, False)
+
+    """Mask of is_white pieces that start one of the legal captures"""
+    def jumpers(self, is_white):
+        result = 0
+        for move in self.turns(is_white):
+            if not move.captured:
+                break
+            result |= 1 << move.start
+        return result
+
+    """Mask of is_white pieces that have at least one non-capturing move"""
+    def movers(self, is_white):
+        empty = self.empty()
+        result = 0
+        for sq in iter_squares(self.pieces(is_white)):
+            if self.variant._quiet_targets(sq, self.kings >> sq & 1, is_white, empty):
+                result |= 1 << sq
+        return result
+
+    """Mask of landing squares for the first capture by the piece on sq"""
+    def captures_from(self, sq):
+        bit = 1 << sq
+        is_white = bool(self.white & bit)
+        enemy = self.red if is_white else self.white
+        turns = []
+        self.variant._extend_captures(sq, self.kings >> sq & 1, is_white, enemy, (self.white | self.red) ^ bit,
+                                      (sq,), 0, turns)
+        result = 0
+        for move in turns:
+            result |= 1 << move.path[1]
+        return result
+
+    """Mask of squares the piece on sq can move to without capturing"""
+    def moves_from(self, sq):
+        result = 0
+        for to_sq in self.variant._quiet_targets(sq, self.kings >> sq & 1, bool(self.white & (1 << sq)),
+                                                 self.empty()):
+            result |= 1 << to_sq
+        return result
+
+    """
+    Move the piece on from_sq to to_sq along their diagonal, removing the piece it passes over if there is one
+    Returns the captured square index or None
+    """
+    def move(self, from_sq, to_sq):
+        from_bit = 1 << from_sq
+        to_bit = 1 << to_sq
+        from_row, from_col = self.variant.square_to_coord[from_sq]
+        to_row, to_col = self.variant.square_to_coord[to_sq]
+        d = DIRECTION_DELTAS.index((1 if to_row > from_row else -1, 1 if to_col > from_col else -1))
+        captured = None
+        for ray_sq, ray_bit in self.variant.rays[from_sq][d]:
+            if ray_sq == to_sq:
+                break
+            if (self.white | self.red) & ray_bit:
+                captured = ray_sq
+                clear = ~ray_bit
+                self.white &= clear
+                self.red &= clear
+                self.kings &= clear
+                break
+        if self.white & from_bit:
+            self.white ^= from_bit | to_bit
+        else:
+            self.red ^= from_bit | to_bit
+        if self.kings & from_bit:
+            self.kings ^= from_bit | to_bit
+        return captured
+
+    """Crown the piece on sq if it is a man standing on its promotion row; returns True if promoted"""
+    def promote(self, sq):
+        bit = 1 << sq
+        if self.kings & bit:
+            return False
+        variant = self.variant
+        if (self.white & bit and variant.white_promotion & bit) or (self.red & bit and variant.red_promotion & bit):
+            self.kings |= bit
+            return True
+        return False
+
+
+# ----- Variants ----- #
+ENGLISH = Variant('english', 8, 3, shifts=True)
+# International draughts: 10x10, four rows of men, flying kings, men capture backward and the longest capture is forced
+INTERNATIONAL = Variant('international', 10, 4, flying_kings=True, men_capture_backward=True, max_capture=True,
+                        draw_plies=50)
+# Brazilian draughts: the international rules on the 8x8 board
+BRAZILIAN = Variant('brazilian', 8, 3, flying_kings=True, men_capture_backward=True, max_capture=True)
+
+VARIANTS = {variant.name: variant for variant in (ENGLISH, INTERNATIONAL, BRAZILIAN)}
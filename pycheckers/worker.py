@@ -0,0 +1,119 @@
+'''
+Background Search
+    Runs Engine searches on a worker thread so the caller (e.g. the GUI loop) never blocks
+    SearchWorker owns an Engine and hands out one SearchJob per search
+    Callbacks run on the worker thread; the GUI uses them only to post pygame events
+'''
+import threading
+from time import monotonic
+
+
+'''
+    SearchJob Class:
+        Handle for one background search
+        The position is copied when the job is created, so the game can change while it runs
+        result holds the SearchResult once done() is True (or None if it was cancelled first)
+'''
+class SearchJob:
+    def __init__(self, worker, game_state, time_limit=None, max_depth=None, on_progress=None, on_done=None):
+        bitboard = game_state.bitboard
+        self.is_white = game_state.turn == 'white'
+        own, enemy = (bitboard.white, bitboard.red) if self.is_white else (bitboard.red, bitboard.white)
+        self.position = (own, enemy, bitboard.kings, self.is_white, game_state.moves_since_last_capture)
+        self.history = tuple(game_state.position_history())
+        self.game_state = game_state
+        self.worker = worker
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.result = None
+        self.progress = None  # latest snapshot passed to on_progress
+        self.cancelled = False
+        self._stop = threading.Event()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='pycheckers-search', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            # One search per engine at a time; a cancelled job releases the lock within a few thousand nodes
+            with self.worker.lock:
+                if not self._stop.is_set():
+                    self.result = self.worker.engine.search_position(
+                        *self.position, time_limit=self.time_limit, max_depth=self.max_depth,
+                        on_progress=self._progress, stop=self._stop, history=self.history)
+        finally:
+            self._done.set()
+            if self.on_done is not None:
+                self.on_done(self)
+            self.worker._finished(self)
+
+    def _progress(self, result):
+        self.progress = result
+        if self.on_progress is not None:
+            self.on_progress(self, result)
+
+    """Ask the search to stop; done() becomes True shortly afterwards"""
+    def cancel(self):
+        self.cancelled = True
+        self._stop.set()
+
+    def done(self):
+        return self._done.is_set()
+
+    """Block until the search finishes; returns False if timeout ran out first"""
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+'''
+    SearchWorker Class:
+        Owns the engine shared by successive searches (so its transposition table carries over)
+        submit() cancels whatever is still running and starts a new job
+        jobs holds every job whose thread has not finished yet, cancelled ones included, so shutdown() can wait for all
+'''
+class SearchWorker:
+    def __init__(self, engine):
+        self.engine = engine
+        self.lock = threading.Lock()
+        self.current = None
+        self.jobs = []
+        self._jobs_lock = threading.Lock()
+
+    def submit(self, game_state, time_limit=None, max_depth=None, on_progress=None, on_done=None):
+        self.cancel()
+        job = SearchJob(self, game_state, time_limit, max_depth, on_progress, on_done)
+        with self._jobs_lock:
+            self.jobs.append(job)
+        self.current = job.start()
+        return job
+
+    """Called on a job's thread once it has finished, on_done callback included"""
+    def _finished(self, job):
+        with self._jobs_lock:
+            if job in self.jobs:
+                self.jobs.remove(job)
+
+    def cancel(self):
+        if self.current is not None:
+            self.current.cancel()
+            self.current = None
+
+    '''
+        shutdown() Method:
+            Cancel every job still alive (including ones cancelled earlier that have not stopped yet) and wait
+            until their threads, on_done callbacks included, have finished; timeout bounds the whole wait
+            Returns False if some thread was still running when the timeout ran out
+    '''
+    def shutdown(self, timeout=None):
+        self.cancel()
+        with self._jobs_lock:
+            jobs = list(self.jobs)
+        deadline = None if timeout is None else monotonic() + timeout
+        for job in jobs:
+            job.cancel()
+            job._thread.join(None if deadline is None else max(0.0, deadline - monotonic()))
+        return not any(job._thread.is_alive() for job in jobs)
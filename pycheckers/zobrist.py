@@ -0,0 +1,63 @@
+'''
+Zobrist Hashing
+    64-bit position keys for the bitboard layout
+    Keys come from a fixed seed, so a position hashes the same in every process and every run
+'''
+import random
+
+from .bitboard import iter_squares
+
+# Piece kinds used to index the key table
+WHITE_MAN_KEY, WHITE_KING_KEY, RED_MAN_KEY, RED_KING_KEY = 0, 1, 2, 3
+
+# Squares with keys: enough for the 10x10 board (see pycheckers.variants)
+MAX_SQUARES = 50
+
+_rng = random.Random(0x5EED_C4EC)
+_keys = [[_rng.getrandbits(64) for sq in range(32)] for kind in range(4)]
+# XORed in when red is to move
+SIDE_KEY = _rng.getrandbits(64)
+# Keys for squares past 32 are drawn afterwards, so the 8x8 keys (and opening books hashed with them) never change
+for _kind_keys in _keys:
+    _kind_keys.extend(_rng.getrandbits(64) for sq in range(32, MAX_SQUARES))
+PIECE_KEYS = tuple(tuple(kind_keys) for kind_keys in _keys)
+del _rng, _keys, _kind_keys
+
+
+"""Key for one piece: its side, whether it is a king, and its square"""
+def piece_key(is_white, king, sq):
+    if is_white:
+        return PIECE_KEYS[WHITE_KING_KEY if king else WHITE_MAN_KEY][sq]
+    return PIECE_KEYS[RED_KING_KEY if king else RED_MAN_KEY][sq]
+
+"""Full hash of a position from its masks"""
+def hash_position(white, red, kings, white_to_move):
+    h = 0 if white_to_move else SIDE_KEY
+    for sq in iter_squares(white & ~kings):
+        h ^= PIECE_KEYS[WHITE_MAN_KEY][sq]
+    for sq in iter_squares(white & kings):
+        h ^= PIECE_KEYS[WHITE_KING_KEY][sq]
+    for sq in iter_squares(red & ~kings):
+        h ^= PIECE_KEYS[RED_MAN_KEY][sq]
+    for sq in iter_squares(red & kings):
+        h ^= PIECE_KEYS[RED_KING_KEY][sq]
+    return h
+
+'''
+    hash_move() Function:
+        Returns the new hash after the side to move plays move
+        Only the moved piece, the captured pieces and the side key change, so this is O(captures)
+        kings is the kings mask *before* the move
+'''
+def hash_move(h, move, kings, is_white, promotes):
+    from_sq = move.path[0]
+    to_sq = move.path[-1]
+    man_key, king_key = (WHITE_MAN_KEY, WHITE_KING_KEY) if is_white else (RED_MAN_KEY, RED_KING_KEY)
+    was_king = kings >> from_sq & 1
+    h ^= PIECE_KEYS[king_key if was_king else man_key][from_sq]
+    h ^= PIECE_KEYS[king_key if was_king or promotes else man_key][to_sq]
+    if move.captured:
+        enemy_man, enemy_king = (RED_MAN_KEY, RED_KING_KEY) if is_white else (WHITE_MAN_KEY, WHITE_KING_KEY)
+        for sq in iter_squares(move.captured):
+            h ^= PIECE_KEYS[enemy_king if kings >> sq & 1 else enemy_man][sq]
+    return h ^ SIDE_KEY
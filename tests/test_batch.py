@@ -0,0 +1,58 @@
+'''
+Batch rules (pycheckers.batch) against the scalar GameState and engine code on positions from random playouts
+'''
+import random
+
+import numpy as np
+import pytest
+
+from pycheckers import batch
+from pycheckers.bitboard import COORD_TO_SQUARE, SQUARE_TO_COORD
+from pycheckers.engine import evaluate
+from pycheckers.rules import GameState, create_board, set_checkers
+
+
+@pytest.fixture(scope='module')
+def game_states():
+    rng = random.Random(3)
+    game_states = []
+    for game in range(40):
+        board = create_board(0, 0, 80)
+        set_checkers(board, 80)
+        game_state = GameState(board)
+        for ply in range(rng.randrange(80)):
+            turns = game_state.legal_turns()
+            if not turns:
+                break
+            game_state.play_turn(rng.choice(turns))
+        game_states.append(game_state)
+    return game_states
+
+
+def test_legal_move_masks(game_states):
+    masks = batch.legal_move_masks(batch.PositionBatch.from_game_states(game_states))
+    for i, game_state in enumerate(game_states):
+        occupied = game_state.bitboard.white | game_state.bitboard.red
+        for sq in range(32):
+            expected = 0
+            if occupied >> sq & 1:
+                for coord in game_state.legal_moves(SQUARE_TO_COORD[sq]):
+                    expected |= 1 << COORD_TO_SQUARE[coord]
+            assert int(masks[i, sq]) == expected, (i, sq)
+
+
+def test_capture_flags_and_counts(game_states):
+    positions = batch.PositionBatch.from_game_states(game_states)
+    assert np.array_equal(batch.capture_flags(positions), [game_state.must_capture for game_state in game_states])
+    counts = batch.piece_counts(positions)
+    for i, game_state in enumerate(game_states):
+        assert {side: int(counts[side][i]) for side in counts} == game_state.piece_counts
+
+
+def test_evaluate(game_states):
+    scores = batch.evaluate(batch.PositionBatch.from_game_states(game_states))
+    for i, game_state in enumerate(game_states):
+        bitboard = game_state.bitboard
+        is_white = game_state.turn == 'white'
+        own, enemy = (bitboard.white, bitboard.red) if is_white else (bitboard.red, bitboard.white)
+        assert int(scores[i]) == evaluate(own, enemy, bitboard.kings, is_white)
@@ -0,0 +1,76 @@
+'''
+Opening book import (pycheckers.book): only finished games count towards the weights, each from its own start
+'''
+from pycheckers.book import OpeningBook, main, read_game_lines
+from pycheckers.fen import START_FEN, STANDARD_START_FEN, parse_fen
+from pycheckers.zobrist import hash_position
+
+GAMES = """22-18 11-15 1-0
+23-19 9-14 *
+
+24-20 10-15
+21-17 9-13 1/2-1/2
+"""
+
+ENDGAME_FEN = "W:WK14,K15:B6,7"
+PDN = f"""[Event "standard opening, no FEN"]
+[Result "0-1"]
+1. 11-15 23-19 2. 8-11 22-17 0-1
+
+[Event "unfinished"]
+1. 9-13 22-18 *
+
+[Event "kings against men"]
+[FEN "{ENDGAME_FEN}"]
+1. 15-11 7x16 2. 14-10 1-0
+"""
+
+
+"""Book moves for a FEN position as sorted (from, to, weight) in square numbers"""
+def book_moves(path, fen):
+    book = OpeningBook(path)
+    try:
+        entries = book.entries(hash_position(*parse_fen(fen)))
+    finally:
+        book.close()
+    return sorted((from_sq + 1, to_sq + 1, weight) for from_sq, to_sq, captured, weight in entries)
+
+
+def test_read_game_lines(tmp_path):
+    path = tmp_path / 'games.txt'
+    path.write_text(GAMES)
+    assert list(read_game_lines(path)) == [
+        (['22-18', '11-15'], 'white'),
+        (['23-19', '9-14'], None),
+        (['24-20', '10-15'], None),
+        (['21-17', '9-13'], 'draw'),
+    ]
+
+
+def test_unfinished_games_are_skipped(tmp_path, capsys):
+    games = tmp_path / 'games.txt'
+    games.write_text(GAMES)
+    out = tmp_path / 'book.bin'
+    assert main(['--out', str(out), '--import', str(games)]) == 0
+    assert "skipped game 2: no result" in capsys.readouterr().out
+
+    own, enemy, kings, is_white = parse_fen(START_FEN)
+    book = OpeningBook(out)
+    try:
+        entries = book.entries(hash_position(own, enemy, kings, is_white))
+    finally:
+        book.close()
+    # 22-18 won (2 points) and 21-17 drew (1 point); the unfinished 23-19 and 24-20 are not in the book
+    assert sorted((from_sq + 1, to_sq + 1, weight) for from_sq, to_sq, captured, weight in entries) == \
+        [(21, 17, 1), (22, 18, 2)]
+
+
+def test_pdn_games_start_from_their_fen(tmp_path, capsys):
+    games = tmp_path / 'games.pdn'
+    games.write_text(PDN)
+    out = tmp_path / 'book.bin'
+    assert main(['--out', str(out), '--pdn', str(games)]) == 0
+    assert "skipped game 2: no result" in capsys.readouterr().out
+    # Black (GameState's red) won the untagged game, so its first move earns 2 points
+    assert book_moves(out, STANDARD_START_FEN) == [(11, 15, 2)]
+    assert book_moves(out, ENDGAME_FEN) == [(15, 11, 2)]
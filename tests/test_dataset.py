@@ -0,0 +1,106 @@
+'''
+Training data export (pycheckers.dataset): shards round-trip through .npy, and every record matches the game it came from
+'''
+import os
+
+import numpy as np
+import pytest
+
+from pycheckers.batch import DRAW, RED_WINS, WHITE_WINS
+from pycheckers.dataset import (HEADER_SIZE, RECORD, ShardWriter, export_shard, load_shard, main, run_export,
+                                shard_path)
+from pycheckers.pdn import find_move
+from pycheckers.rules import GameState, create_board, set_checkers
+from pycheckers.simulate import game_seed, play_game
+
+
+def numbered(start, stop):
+    records = np.zeros(stop - start, dtype=RECORD)
+    records['seed'] = np.arange(start, stop)
+    records['ply'] = np.arange(start, stop) % 7
+    return records
+
+"""Record count in a shard's header, and the count its length allows"""
+def counts(path):
+    return len(load_shard(path)), (os.path.getsize(path) - HEADER_SIZE) // RECORD.itemsize
+
+
+def test_shard_round_trip(tmp_path):
+    path = str(tmp_path / 'shard.npy')
+    # A small chunk, so appends cross window boundaries
+    with ShardWriter(path, chunk=4) as writer:
+        writer.append(numbered(0, 3))
+        writer.append(numbered(3, 10))
+    assert counts(path) == (10, 10)
+    # Reopening carries on after the last record
+    with ShardWriter(path, chunk=4) as writer:
+        assert writer.count == 10
+        writer.append(numbered(10, 15))
+    assert counts(path) == (15, 15)
+    assert np.array_equal(load_shard(path), numbered(0, 15))
+    assert np.array_equal(np.load(path), numbered(0, 15))
+
+
+def test_an_unclosed_shard_still_loads(tmp_path):
+    path = str(tmp_path / 'shard.npy')
+    writer = ShardWriter(path, chunk=4)
+    writer.append(numbered(0, 6))
+    writer.window.flush()
+    # The header was last written when the second window was mapped, over a file grown to hold it
+    assert counts(path) == (4, 8)
+    assert np.array_equal(load_shard(path), numbered(0, 4))
+    writer.close()
+    assert counts(path) == (6, 6)
+
+
+def test_other_files_are_not_shards(tmp_path):
+    path = tmp_path / 'other.npy'
+    np.save(path, np.zeros(3))
+    with pytest.raises(ValueError, match="not a training data shard"):
+        ShardWriter(str(path))
+
+
+def test_records_match_a_replayed_game(tmp_path):
+    path = str(tmp_path / 'shard.npy')
+    assert export_shard(path, range(3), base_seed=5)[1] == 3
+    records = load_shard(path)
+    start = 0
+    for index in range(3):
+        result = play_game(index, game_seed(5, index))
+        game = records[start:start + result.plies]
+        start += result.plies
+        assert (game['seed'] == result.seed).all()
+        assert (game['result'] == {'white': WHITE_WINS, 'red': RED_WINS, 'draw': DRAW}[result.winner]).all()
+
+        board = create_board(0, 0, 80)
+        set_checkers(board, 80)
+        game_state = GameState(board)
+        for ply, (record, text) in enumerate(zip(game, result.moves)):
+            bitboard = game_state.bitboard
+            assert (record['white'], record['red'], record['kings']) == (bitboard.white, bitboard.red, bitboard.kings)
+            assert record['ply'] == ply and record['quiet'] == game_state.moves_since_last_capture
+            assert bool(record['white_to_move']) == (game_state.turn == 'white')
+            ends = {}
+            for move in game_state.legal_turns():
+                ends[move.start] = ends.get(move.start, 0) | 1 << move.end
+            assert {sq: int(mask) for sq, mask in enumerate(record['moves']) if mask} == ends
+            expected = 0 if result.winner == 'draw' else 1 if result.winner == game_state.turn else -1
+            assert record['value'] == expected
+            game_state.play_turn(find_move(game_state.legal_turns(), text))
+    assert start == len(records)
+
+
+def test_the_same_seed_is_not_exported_twice(tmp_path, capsys):
+    prefix = str(tmp_path / 'data')
+    assert sum(games for path, games, positions in run_export(prefix, 4, shards=2, jobs=1, base_seed=1)) == 4
+    before = [len(load_shard(shard_path(prefix, shard))) for shard in range(2)]
+    with pytest.raises(ValueError, match="already holds game 0 of seed 1"):
+        next(run_export(prefix, 4, shards=2, jobs=1, base_seed=1))
+    with pytest.raises(SystemExit):
+        main([prefix, '--games', '4', '--shards', '2', '--jobs', '1', '--seed', '1'])
+    assert "use another --seed" in capsys.readouterr().err
+    assert [len(load_shard(shard_path(prefix, shard))) for shard in range(2)] == before
+    # A new seed adds its games after the old ones
+    assert sum(games for path, games, positions in run_export(prefix, 4, shards=2, jobs=1, base_seed=2)) == 4
+    seeds = set(load_shard(shard_path(prefix, 0))['seed'].tolist())
+    assert seeds == {game_seed(1, 0), game_seed(1, 2), game_seed(2, 0), game_seed(2, 2)}
@@ -0,0 +1,101 @@
+'''
+Search engine (pycheckers.engine): legal moves, forced wins found at the right distance, and the transposition table
+'''
+import random
+
+import pytest
+
+from pycheckers.bitboard import apply_turn, generate_turns
+from pycheckers.engine import EXACT, LOWER, MATE, MATE_BOUND, TB_WIN, Engine, TranspositionTable
+from pycheckers.perft import sample_positions
+from pycheckers.tablebase import Tablebase, _all_signatures, build, position_at, table_size
+
+
+@pytest.fixture(scope='module')
+def tablebase(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('tablebases')
+    build(str(directory), 2, jobs=1, out=lambda line: None)
+    tablebase = Tablebase(str(directory))
+    yield tablebase
+    tablebase.close()
+
+"""White-to-move two-piece wins with a choice of quiet moves, as (white, red, kings, distance in plies)"""
+def quiet_wins(tablebase):
+    for signature in _all_signatures(2):
+        for index in range(table_size(signature)):
+            position = position_at(signature, index)
+            if position is None:
+                continue
+            moves = generate_turns(*position, True)
+            if len(moves) < 2 or moves[0].captured:
+                continue
+            distance = tablebase.probe(*position, True)
+            if distance and distance > 2:
+                yield position + (distance,)
+
+
+def test_chosen_moves_are_legal():
+    engine = Engine(time_limit=float('inf'), max_depth=3)
+    for own, enemy, kings, is_white in random.Random(5).sample(sample_positions(400), 40):
+        result = engine.search_position(own, enemy, kings, is_white)
+        assert result.move in generate_turns(own, enemy, kings, is_white)
+
+
+def test_capturing_the_last_piece_is_mate_in_one():
+    # White kings on 1 and 2 can both take the last red man, on 6
+    engine = Engine(time_limit=float('inf'), max_depth=4)
+    result = engine.search_position(0b11, 1 << 5, 0b11, True)
+    assert result.move.captured == 1 << 5
+    assert result.score == MATE - 1
+
+
+def test_forced_wins_are_found_within_their_distance(tablebase):
+    engine = Engine(time_limit=float('inf'))
+    checked = 0
+    for white, red, kings, distance in quiet_wins(tablebase):
+        if distance > 9:
+            continue
+        engine.reset()
+        result = engine.search_position(white, red, kings, True, max_depth=distance)
+        # The table counts a stuck opponent's last ply too, so the mate may come a ply sooner
+        assert MATE_BOUND <= result.score and MATE - result.score <= distance
+        checked += 1
+        if checked == 30:
+            break
+    assert checked
+
+
+def test_tablebase_win_is_scored_by_distance(tablebase):
+    engine = Engine(time_limit=float('inf'), max_depth=6, tablebase=tablebase)
+    checked = 0
+    for white, red, kings, distance in quiet_wins(tablebase):
+        # Distance of every reply to the opponent's loss, after each move
+        replies = {}
+        for move in generate_turns(white, red, kings, True):
+            own, enemy, child_kings, promoted = apply_turn(white, red, kings, True, move)
+            replies[move] = tablebase.probe(enemy, own, child_kings, False, 1)
+        engine.reset()
+        result = engine.search_position(white, red, kings, True)
+        assert result.score == TB_WIN - distance
+        # The quickest conversion, not just any winning move
+        assert replies[result.move] == max(reply for reply in replies.values() if reply is not None and reply < 0)
+        checked += 1
+        if checked == 50:
+            break
+    assert checked
+
+
+def test_transposition_table_keeps_the_deeper_entry():
+    tt = TranspositionTable(1)
+    key = 0x1234_5678_9ABC_DEF0
+    other = key + tt.size  # same bucket
+    tt.store(key, 6, EXACT, -321, 3)
+    assert tt.probe(key) == (6, EXACT, -321, 3)
+    # A shallower result for another position goes to the always-replace slot
+    tt.store(other, 2, LOWER, 50, -1)
+    assert tt.probe(key) == (6, EXACT, -321, 3)
+    assert tt.probe(other) == (2, LOWER, 50, -1)
+    # In a later search the old deep entry gives way
+    tt.new_search()
+    tt.store(other + tt.size, 1, EXACT, 7, 0)
+    assert tt.probe(key) is None
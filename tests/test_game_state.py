@@ -0,0 +1,78 @@
+'''
+GameState make/unmake: taking every turn back and replaying it must restore the same positions and hashes
+'''
+import random
+
+import pytest
+
+from pycheckers.rules import GameState, create_board, set_checkers
+from pycheckers.variants import ENGLISH, VARIANTS
+from pycheckers.zobrist import hash_position
+
+
+def new_game(variant=ENGLISH):
+    board = create_board(0, 0, 80, size=variant.size)
+    set_checkers(board, 80, rows=variant.rows)
+    return GameState(board, variant=variant)
+
+def snapshot(game_state):
+    bitboard = game_state.bitboard
+    return (bitboard.white, bitboard.red, bitboard.kings, game_state.turn, game_state.moves_since_last_capture,
+            game_state.hash)
+
+"""Zobrist hash of the position recomputed from scratch"""
+def full_hash(game_state):
+    bitboard = game_state.bitboard
+    return hash_position(bitboard.white, bitboard.red, bitboard.kings, game_state.turn == 'white')
+
+"""Play up to plies random turns; returns the snapshot before each turn and after the last one"""
+def play_random(game_state, rng, plies=120):
+    history = [snapshot(game_state)]
+    for ply in range(plies):
+        turns = game_state.legal_turns()
+        if not turns:
+            break
+        game_state.play_turn(rng.choice(turns))
+        assert game_state.hash == full_hash(game_state)
+        history.append(snapshot(game_state))
+    return history
+
+
+@pytest.mark.parametrize('name', sorted(VARIANTS))
+@pytest.mark.parametrize('seed', range(5))
+def test_undo_redo_round_trip(name, seed):
+    game_state = new_game(VARIANTS[name])
+    history = play_random(game_state, random.Random(seed))
+
+    for expected in reversed(history[:-1]):
+        assert game_state.unmake_move()
+        assert snapshot(game_state) == expected
+        assert game_state.hash == full_hash(game_state)
+    assert not game_state.unmake_move()
+    assert game_state.repetitions == {history[0][-1]: 1}
+
+    for expected in history[1:]:
+        assert game_state.redo_move()
+        assert snapshot(game_state) == expected
+    assert not game_state.redo_move()
+    assert game_state.hash_history == [entry[-1] for entry in history]
+
+
+def test_unmake_restores_the_pieces():
+    game_state = new_game()
+    start = [[tile.hasChecker is not None for tile in row] for row in game_state.board]
+    play_random(game_state, random.Random(7), plies=40)
+    while game_state.unmake_move():
+        pass
+    assert [[tile.hasChecker is not None for tile in row] for row in game_state.board] == start
+    assert len(game_state.pieces) == 24
+    assert game_state.piece_counts == {'white': 12, 'red': 12}
+
+
+def test_a_new_move_clears_redo():
+    game_state = new_game()
+    play_random(game_state, random.Random(1), plies=4)
+    assert game_state.unmake_move()
+    game_state.play_turn(game_state.legal_turns()[-1])
+    assert not game_state.redo_move()
+
@@ -0,0 +1,53 @@
+'''
+PDN export (pycheckers.pdn): a recorded game replays to the same position
+'''
+import random
+
+import pytest
+
+from pycheckers.fen import START_FEN, STANDARD_START_FEN, parse_fen
+from pycheckers.pdn import format_game, game_state_from_fen, read_games, record_game, replay, validate_game
+
+# The Old Fourteenth opening, as printed in standard English draughts books: no tags, Black moves first
+OLD_FOURTEENTH = '''
+1. 11-15 23-19 2. 8-11 22-17 3. 4-8 17-13 4. 15-18 24-20
+5. 11-15 28-24 6. 8-11 26-23 7. 9-14 31-26 *
+'''
+
+
+def test_record_game_replays():
+    game_state = game_state_from_fen(START_FEN)
+    rng = random.Random(4)
+    for ply in range(60):
+        if game_state.check_game_over():
+            break
+        game_state.play_turn(rng.choice(game_state.legal_turns()))
+    game = record_game(game_state, result='*')
+    assert validate_game(game)[1] is None
+    replayed = replay(game)
+    assert replayed.hash == game_state.hash
+    assert replayed.turn == game_state.turn
+
+
+def test_record_game_rejects_an_illegal_undo_record():
+    game_state = game_state_from_fen(START_FEN)
+    game_state.play_turn(game_state.legal_turns()[0])
+    game_state.undo_stack[0].to_sq = 0
+    with pytest.raises(ValueError, match="not a legal turn"):
+        record_game(game_state)
+
+
+def test_a_game_without_tags_starts_from_the_standard_opening():
+    game = next(read_games(OLD_FOURTEENTH.splitlines()))
+    assert game.fen == STANDARD_START_FEN
+    assert validate_game(game) == (14, None)
+    game_state = replay(game)
+    assert game_state.turn == 'red' and len(game_state.undo_stack) == 14
+
+
+def test_recorded_games_keep_their_fen_tag():
+    game_state = game_state_from_fen(START_FEN)
+    game_state.play_turn(game_state.legal_turns()[0])
+    game = next(read_games(format_game(record_game(game_state, result='*')).splitlines()))
+    assert parse_fen(game.tags['FEN']) == parse_fen(START_FEN)
+    assert validate_game(game) == (1, None)
@@ -0,0 +1,52 @@
+'''
+Move generation against perft counts (pycheckers.perft), kept to depth 5 so the suite stays quick
+'''
+import pytest
+
+from pycheckers.fen import START_FEN
+from pycheckers.perft import (REFERENCE_POSITIONS, VARIANT_REFERENCES, divide, perft, relative_position,
+                              start_position, variant_perft)
+from pycheckers.variants import ENGLISH, VARIANTS, Variant
+
+MAX_DEPTH = 5
+
+
+def _position(fen):
+    return start_position() if fen == START_FEN else relative_position(fen)
+
+
+@pytest.mark.parametrize('name, fen, expected', REFERENCE_POSITIONS, ids=[name for name, *_ in REFERENCE_POSITIONS])
+def test_reference_positions(name, fen, expected):
+    position = _position(fen)
+    for depth in range(1, min(MAX_DEPTH, len(expected)) + 1):
+        assert perft(*position, depth) == expected[depth - 1], f"{name} at depth {depth}"
+
+
+def test_divide_adds_up():
+    position = start_position()
+    counts = divide(*position, 4)
+    assert len(counts) == 7
+    assert sum(nodes for notation, nodes in counts) == perft(*position, 4)
+
+@pytest.mark.parametrize('name', sorted(VARIANT_REFERENCES))
+def test_variant_start_position(name):
+    variant = VARIANTS[name]
+    white, red, kings = variant.start_position()
+    for depth in range(1, MAX_DEPTH + 1):
+        assert variant_perft(variant, white, red, kings, True, depth) == VARIANT_REFERENCES[name][depth - 1]
+
+
+def test_english_variant_uses_the_shift_generator():
+    white, red, kings = ENGLISH.start_position()
+    expected = REFERENCE_POSITIONS[0][2]
+    for depth in range(1, MAX_DEPTH + 1):
+        assert variant_perft(ENGLISH, white, red, kings, True, depth) == expected[depth - 1]
+
+
+# English rules built from the Variant tables instead of the shifts must give the same counts
+@pytest.mark.parametrize('name, fen, expected', REFERENCE_POSITIONS, ids=[name for name, *_ in REFERENCE_POSITIONS])
+def test_table_generator_matches_shifts(name, fen, expected):
+    tables = Variant('english-tables', 8, 3)
+    position = _position(fen)
+    for depth in range(1, min(MAX_DEPTH, len(expected)) + 1):
+        assert variant_perft(tables, *position, depth) == expected[depth - 1], f"{name} at depth {depth}"
@@ -0,0 +1,54 @@
+'''
+Frame profiler (pycheckers.profiler): rules calls are only counted for the game it watches
+'''
+import pytest
+
+from pycheckers.fen import START_FEN
+from pycheckers.pdn import game_state_from_fen
+from pycheckers.profiler import RULES_CALLS, FrameProfiler
+
+
+def test_counts_only_the_watched_game():
+    watched = game_state_from_fen(START_FEN)
+    other = game_state_from_fen(START_FEN)
+    profiler = FrameProfiler()
+    profiler.watch(watched)
+    profiler.enable()
+    profiler.begin_frame()
+    watched.play_turn(watched.legal_turns()[0])
+    other.play_turn(other.legal_turns()[0])
+    profiler.end_frame()
+    assert profiler.frames[-1]['calls'] == {'legal_turns': 1, 'play_turn': 1, 'move_piece': 1, 'end_turn': 1}
+    assert not any(name in vars(other) for name in RULES_CALLS)
+
+    profiler.disable()
+    assert not any(name in vars(watched) for name in RULES_CALLS)
+
+
+def test_watch_moves_the_counters():
+    first = game_state_from_fen(START_FEN)
+    second = game_state_from_fen(START_FEN)
+    profiler = FrameProfiler()
+    profiler.watch(first)
+    profiler.enable()
+    profiler.enable()
+    profiler.watch(second)
+    assert not any(name in vars(first) for name in RULES_CALLS)
+    second.legal_turns()
+    assert profiler.calls['legal_turns'] == 1
+    profiler.disable()
+
+
+def test_one_profiler_per_game():
+    game_state = game_state_from_fen(START_FEN)
+    first, second = FrameProfiler(), FrameProfiler()
+    first.watch(game_state)
+    second.watch(game_state)
+    first.enable()
+    with pytest.raises(ValueError):
+        second.enable()
+    assert not second.enabled
+    first.disable()
+    second.enable()
+    second.disable()
+    assert not any(name in vars(game_state) for name in RULES_CALLS)
@@ -0,0 +1,159 @@
+'''
+Game server (pycheckers.server) requests over a real socket on a free port
+'''
+import asyncio
+import json
+
+from pycheckers.server import Connection, GameServer
+
+
+async def _session(messages):
+    server = await GameServer().start(port=0)
+    reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+    replies = []
+    try:
+        for message in messages:
+            writer.write((json.dumps(message) + '\n').encode())
+            await writer.drain()
+            replies.append(json.loads(await reader.readline()))
+    finally:
+        writer.close()
+        await server.close()
+    return replies
+
+def session(*messages):
+    return asyncio.run(_session(messages))
+
+'''
+    Client Class:
+        A test connection; request() waits for the reply that carries its id,
+        and any diffs pushed before it are kept in pushed
+'''
+class Client:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.pushed = []
+        self.next_id = 0
+
+    @classmethod
+    async def connect(cls, server):
+        return cls(*await asyncio.open_connection('127.0.0.1', server.port))
+
+    async def request(self, **message):
+        self.next_id += 1
+        message['id'] = self.next_id
+        self.writer.write((json.dumps(message) + '\n').encode())
+        await self.writer.drain()
+        while True:
+            reply = json.loads(await self.reader.readline())
+            if reply.get('id') == self.next_id:
+                return reply
+            self.pushed.append(reply)
+
+    async def receive(self):
+        return json.loads(await asyncio.wait_for(self.reader.readline(), 5))
+
+'''
+    RecordingWriter Class:
+        Stands in for a connection's stream writer (and its transport), keeping every line written
+'''
+class RecordingWriter:
+    def __init__(self):
+        self.lines = []
+        self.aborted = False
+        self.transport = self
+
+    def write(self, line):
+        self.lines.append(line)
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        pass
+
+    def abort(self):
+        self.aborted = True
+
+"""A client that has stopped reading: drain() never returns, as when the socket buffer stays full"""
+class StalledWriter(RecordingWriter):
+    async def drain(self):
+        await asyncio.Event().wait()
+
+
+def test_rejected_new_game_keeps_its_id():
+    bad, good = session({'op': 'new', 'side': 'blue'}, {'op': 'new', 'side': 'white'})
+    assert bad == {'type': 'error', 'error': "bad side 'blue'"}
+    assert good['game'] == 1
+
+
+def test_bad_game_id_is_a_client_error():
+    [reply] = session({'op': 'state', 'game': [1], 'id': 3})
+    assert reply == {'type': 'error', 'error': "no game [1]", 'id': 3}
+
+
+def test_internal_errors_are_not_sent(monkeypatch):
+    async def op_broken(server, conn, request):
+        return {}['missing']
+    monkeypatch.setitem(GameServer.HANDLERS, 'broken', op_broken)
+    [reply] = session({'op': 'broken'})
+    assert reply == {'type': 'error', 'error': 'internal error'}
+
+
+def test_bool_is_not_a_game_id():
+    new, reply = session({'op': 'new'}, {'op': 'state', 'game': True})
+    assert new['game'] == 1
+    assert reply == {'type': 'error', 'error': "no game True"}
+
+
+def test_moves_reach_players_and_spectators():
+    async def run():
+        server = await GameServer().start(port=0)
+        white, red, watcher = [await Client.connect(server) for _ in range(3)]
+        try:
+            game = (await white.request(op='new', side='white'))['game']
+            assert (await red.request(op='join', game=game))['seats'] == {'white': True, 'red': True}
+            state = await watcher.request(op='join', game=game, side='watch')
+
+            # Only the side to move may play, and only a legal turn
+            assert (await red.request(op='move', game=game, move=state['legal'][0]))['error'] == \
+                "not your turn (white to move)"
+            assert (await white.request(op='move', game=game, move='1-5'))['type'] == 'error'
+
+            diff = await white.request(op='move', game=game, move=state['legal'][0])
+            assert diff['type'] == 'diff' and diff['turn'] == 'red' and diff['ply'] == 1
+            assert len(diff['squares']) == 2
+            # Everyone else gets the same diff, without the mover's request id
+            del diff['id']
+            assert await watcher.receive() == diff
+            assert await red.receive() == diff
+            reply = await red.request(op='move', game=game, move=diff['legal'][0])
+            assert reply['ply'] == 2 and (await watcher.receive())['move'] == reply['move']
+        finally:
+            for client in (white, red, watcher):
+                client.writer.close()
+            await server.close()
+    asyncio.run(run())
+
+
+def test_a_client_that_stops_reading_is_dropped():
+    async def run():
+        server = GameServer(max_queue=2)
+        player = Connection(None, RecordingWriter(), 1000)
+        slow = Connection(None, StalledWriter(), server.max_queue)
+        await server.handle_line(player, b'{"op": "new", "side": "both"}')
+        await server.handle_line(slow, b'{"op": "join", "game": 1, "side": "watch"}')
+        game = server.games[1]
+        for ply in range(6):
+            move = game.game_state.legal_turns()[0].notation()
+            await server.handle_line(player, json.dumps({'op': 'move', 'game': 1, 'move': move}).encode())
+            await asyncio.sleep(0)
+        # The writer is stuck after the join reply and the queue holds two diffs, so the third cuts it off
+        assert slow.closed and slow.writer.aborted
+        assert len(slow.writer.lines) == 1 and slow.queue.qsize() == 2
+        # The game and its players carry on
+        assert not player.closed and len(game.game_state.undo_stack) == 6
+        assert len(player.writer.lines) == 7
+        player.close()
+    asyncio.run(run())
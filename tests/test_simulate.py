@@ -0,0 +1,24 @@
+'''
+Self-play (pycheckers.simulate): a run is reproducible from its seed, whatever the number of worker processes
+'''
+import pytest
+
+from pycheckers.simulate import game_seed, play_game, run_games
+
+
+"""Results in game order, without the timings"""
+def outcomes(results):
+    return sorted(result[:-1] for result in results)
+
+
+@pytest.mark.parametrize('white, red', [('random', 'random'), ('ai', 'random')])
+def test_results_do_not_depend_on_jobs(white, red):
+    serial = outcomes(run_games(6, 11, jobs=1, white=white, red=red, max_depth=2))
+    assert [result[0] for result in serial] == list(range(6))
+    assert serial == outcomes(run_games(6, 11, jobs=2, white=white, red=red, max_depth=2))
+
+
+def test_a_game_replays_from_its_seed():
+    result = play_game(3, game_seed(11, 3), white='ai', max_depth=2)
+    assert result[:-1] == play_game(3, game_seed(11, 3), white='ai', max_depth=2)[:-1]
+    assert result.plies == len(result.moves) and result.winner in ('white', 'red', 'draw')
@@ -0,0 +1,100 @@
+'''
+Endgame tables (pycheckers.tablebase) against a forward search written independently of the retrograde solver
+The tables up to three pieces are built once into a temporary directory
+'''
+import random
+from functools import lru_cache
+
+import pytest
+
+from pycheckers.bitboard import apply_turn, generate_turns
+from pycheckers.tablebase import BUDGET, Tablebase, _all_signatures, build, flip, position_at, table_size
+
+WIN, DRAW, LOSS = 1, 0, -1
+
+
+@pytest.fixture(scope='module')
+def tablebase(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('tablebases')
+    build(str(directory), 3, out=lambda line: None)
+    tablebase = Tablebase(str(directory))
+    yield tablebase
+    tablebase.close()
+
+
+'''
+    outcome() Function:
+        Result for the side to move with plies left before the 40-move draw, by searching forwards
+        A capture starts the count again (the table for the smaller position is played with the full budget)
+'''
+@lru_cache(maxsize=None)
+def outcome(own, enemy, kings, is_white, plies):
+    moves = generate_turns(own, enemy, kings, is_white)
+    if not moves:
+        return LOSS if plies > 0 else DRAW
+    if plies == 0:
+        return DRAW
+    results = []
+    for move in moves:
+        child_own, child_enemy, child_kings, promoted = apply_turn(own, enemy, kings, is_white, move)
+        if not child_enemy:
+            return WIN
+        budget = BUDGET if move.captured else plies - 1
+        results.append(-outcome(child_enemy, child_own, child_kings, not is_white, budget))
+    return max(results)
+
+def sign(value):
+    return (value > 0) - (value < 0)
+
+
+def test_every_two_piece_position(tablebase):
+    checked = 0
+    for signature in _all_signatures(2):
+        for index in range(table_size(signature)):
+            position = position_at(signature, index)
+            if position is None:
+                continue
+            white, red, kings = position
+            for quiet in (0, BUDGET - 6, BUDGET - 1):
+                assert sign(tablebase.probe(white, red, kings, True, quiet)) == \
+                    outcome(white, red, kings, True, BUDGET - quiet), (signature, index, quiet)
+            # With two pieces any capture ends the game, so the distance is exact: not decided a ply sooner
+            distance = abs(tablebase.probe(white, red, kings, True))
+            if distance > 1:
+                assert outcome(white, red, kings, True, distance - 1) == DRAW, (signature, index)
+            checked += 1
+    assert checked
+
+
+def test_three_piece_sample(tablebase):
+    rng = random.Random(1)
+    signatures = [signature for signature in _all_signatures(3) if sum(signature) == 3]
+    checked = 0
+    while checked < 300:
+        signature = rng.choice(signatures)
+        position = position_at(signature, rng.randrange(table_size(signature)))
+        if position is None:
+            continue
+        white, red, kings = position
+        # Few plies left keeps the search small; the answer must still agree, distance included
+        quiet = BUDGET - rng.randrange(1, 7)
+        assert sign(tablebase.probe(white, red, kings, True, quiet)) == \
+            outcome(white, red, kings, True, BUDGET - quiet), (signature, position, quiet)
+        checked += 1
+
+
+# Red to move is looked up by turning the board around; the search plays it directly
+def test_red_to_move(tablebase):
+    rng = random.Random(2)
+    signatures = list(_all_signatures(3))
+    checked = 0
+    while checked < 300:
+        signature = rng.choice(signatures)
+        position = position_at(signature, rng.randrange(table_size(signature)))
+        if position is None:
+            continue
+        red, white, kings = flip(position[0]), flip(position[1]), flip(position[2])
+        quiet = BUDGET - rng.randrange(1, 7)
+        assert sign(tablebase.probe(red, white, kings, False, quiet)) == \
+            outcome(red, white, kings, False, BUDGET - quiet), (signature, position, quiet)
+        checked += 1
@@ -0,0 +1,59 @@
+'''
+Event tracing (pycheckers.trace): level filtering, sampling, the ring buffer and the file flusher
+'''
+import json
+
+from pycheckers.trace import DEBUG, INFO, OFF, WARNING, Tracer, parse_sample
+
+
+def test_records_below_the_level_are_dropped():
+    tracer = Tracer(level='info')
+    assert tracer.debug('search', depth=1) is None
+    assert tracer.info('move', to=18).fields == {'to': 18}
+    assert tracer.warning('slow_frame') is not None
+    assert [record.level for record in tracer.records()] == [INFO, WARNING]
+    assert not tracer.enabled(DEBUG) and tracer.enabled(INFO)
+
+
+def test_off_drops_everything_and_spans_run_untimed():
+    tracer = Tracer()
+    assert tracer.level == OFF
+    with tracer.span('frame', level=WARNING):
+        pass
+    tracer.warning('slow_frame')
+    assert tracer.records() == []
+
+
+def test_sampling_keeps_one_record_in_n_per_event():
+    tracer = Tracer(level=DEBUG, sample=parse_sample(['hop=3']))
+    kept = [tracer.debug('hop', n=n) for n in range(7)]
+    tracer.debug('move')
+    # The first of every three is kept; other events are not sampled
+    assert [record.fields['n'] for record in tracer.records('hop')] == [0, 3, 6]
+    assert sum(record is None for record in kept) == 4
+    assert len(tracer.records('move')) == 1
+    # New sampling settings start counting again
+    tracer.configure(sample={'hop': 2})
+    tracer.debug('hop', n=7)
+    assert tracer.records('hop')[-1].fields == {'n': 7}
+
+
+def test_ring_buffer_drops_the_oldest_records():
+    tracer = Tracer(level=DEBUG, capacity=4)
+    for n in range(10):
+        tracer.debug('tick', n=n)
+    assert [record.fields['n'] for record in tracer.records()] == [6, 7, 8, 9]
+    # Shrinking keeps the newest records
+    tracer.configure(capacity=2)
+    assert [record.fields['n'] for record in tracer.records()] == [8, 9]
+
+
+def test_flusher_writes_json_lines(tmp_path):
+    path = tmp_path / 'trace.jsonl'
+    tracer = Tracer(level=INFO)
+    tracer.configure(path=str(path))
+    tracer.info('move', **{'from': 22, 'to': 18})
+    tracer.debug('hop')
+    tracer.close()
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [(line['level'], line['event'], line['from'], line['to']) for line in lines] == [('INFO', 'move', 22, 18)]
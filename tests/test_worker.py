@@ -0,0 +1,58 @@
+'''
+Background search (pycheckers.worker): cancelling or shutting down stops the thread, and nothing reports afterwards
+'''
+import threading
+import time
+
+from pycheckers.engine import Engine
+from pycheckers.rules import GameState, create_board, set_checkers
+from pycheckers.worker import SearchWorker
+
+
+def new_game():
+    board = create_board(0, 0, 80)
+    set_checkers(board, 80)
+    return GameState(board)
+
+"""Submit an unbounded search and wait until it reports its first iteration; returns (job, list of finished jobs)"""
+def start_long_search(worker):
+    finished = []
+    started = threading.Event()
+    job = worker.submit(new_game(), time_limit=float('inf'), on_progress=lambda job, result: started.set(),
+                        on_done=finished.append)
+    assert started.wait(10)
+    return job, finished
+
+
+def test_cancel_stops_the_search_thread():
+    worker = SearchWorker(Engine())
+    job, finished = start_long_search(worker)
+    job.cancel()
+    assert job.wait(10)
+    job._thread.join(10)
+    assert not job._thread.is_alive()
+    assert job.cancelled and finished == [job]
+    assert worker.jobs == []
+
+
+def test_submit_cancels_the_previous_search():
+    worker = SearchWorker(Engine())
+    old, old_finished = start_long_search(worker)
+    new = worker.submit(new_game(), max_depth=2)
+    assert new.wait(10) and old.wait(10)
+    # The old job finishes flagged as cancelled, so a caller matching against worker.current drops it
+    assert old.cancelled and not new.cancelled
+    assert worker.current is new and new.result is not None
+    assert old_finished == [old]
+
+
+def test_shutdown_waits_for_every_thread():
+    worker = SearchWorker(Engine())
+    job, finished = start_long_search(worker)
+    assert worker.shutdown(timeout=10)
+    assert not job._thread.is_alive()
+    assert finished == [job] and worker.jobs == []
+    # Nothing turns up once shutdown() has returned
+    reported = list(finished)
+    time.sleep(0.2)
+    assert finished == reported